@@ -0,0 +1,104 @@
+"""Partition messages by month on timestamp
+
+Revision ID: a7e3c5f9b1d4
+Revises: f1d6b8c4e2a7
+Create Date: 2026-10-17 14:30:00.000000
+
+"""
+
+import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7e3c5f9b1d4"
+down_revision: Union[str, None] = "f1d6b8c4e2a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months created past the current one; the retention job keeps extending this
+MONTHS_AHEAD = 2
+
+INDEXES = (
+    "CREATE INDEX ix_messages_user_id_chat_id ON messages (user_id, chat_id)",
+    "CREATE INDEX ix_messages_chat_id_message_id ON messages (chat_id, message_id)",
+    "CREATE INDEX ix_messages_text_hash_spam ON messages (text_hash) WHERE spam",
+)
+INDEX_NAMES = ("ix_messages_user_id_chat_id", "ix_messages_chat_id_message_id", "ix_messages_text_hash_spam")
+
+DEFAULT_PARTITION = "messages_default"
+
+
+# Copies of the app.infrastructure.db.partitions helpers as of this revision
+def month_start(value: datetime.date) -> datetime.date:
+    return datetime.date(value.year, value.month, 1)
+
+
+def add_months(month: datetime.date, count: int) -> datetime.date:
+    index = month.year * 12 + month.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def create_partition_sql(month: datetime.date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS messages_y{month.year:04d}m{month.month:02d} PARTITION OF messages "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def upgrade() -> None:
+    # Only PostgreSQL supports declarative partitioning; other databases keep the plain table.
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    # The primary key of a partitioned table must include the partition key,
+    # so the table is rebuilt and the rows copied over in one transaction.
+    op.execute("ALTER TABLE messages RENAME TO messages_unpartitioned")
+    op.execute("ALTER TABLE messages_unpartitioned RENAME CONSTRAINT messages_pkey TO messages_unpartitioned_pkey")
+    for name in INDEX_NAMES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    op.execute(
+        "CREATE TABLE messages (LIKE messages_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        'PARTITION BY RANGE ("timestamp")'
+    )
+    op.execute('ALTER TABLE messages ADD CONSTRAINT messages_pkey PRIMARY KEY (id, "timestamp")')
+    op.execute("ALTER SEQUENCE messages_id_seq OWNED BY messages.id")
+
+    oldest = op.get_bind().execute(sa.text('SELECT min("timestamp") FROM messages_unpartitioned')).scalar()
+    month = month_start(oldest or datetime.date.today())
+    last = add_months(month_start(datetime.date.today()), MONTHS_AHEAD)
+    while month <= last:
+        op.execute(create_partition_sql(month))
+        month = add_months(month, 1)
+    op.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF messages DEFAULT")
+
+    op.execute("INSERT INTO messages SELECT * FROM messages_unpartitioned")
+    op.execute("DROP TABLE messages_unpartitioned")
+
+    # Built after the copy; each creates a matching index on every partition
+    for statement in INDEXES:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE messages RENAME TO messages_partitioned")
+    op.execute("ALTER TABLE messages_partitioned RENAME CONSTRAINT messages_pkey TO messages_partitioned_pkey")
+    for name in INDEX_NAMES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    op.execute("CREATE TABLE messages (LIKE messages_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    op.execute("ALTER TABLE messages ADD CONSTRAINT messages_pkey PRIMARY KEY (id)")
+    op.execute("ALTER SEQUENCE messages_id_seq OWNED BY messages.id")
+    op.execute("INSERT INTO messages SELECT * FROM messages_partitioned")
+    # Drops the attached partitions too; archived (detached) ones are left alone
+    op.execute("DROP TABLE messages_partitioned")
+
+    for statement in INDEXES:
+        op.execute(statement)
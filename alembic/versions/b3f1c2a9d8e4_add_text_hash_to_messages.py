@@ -0,0 +1,72 @@
+"""Add normalized text_hash to messages with a partial index for spam lookups
+
+Revision ID: b3f1c2a9d8e4
+Revises: 7063911b6e60
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b3f1c2a9d8e4"
+down_revision: Union[str, None] = "7063911b6e60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 10000
+
+messages = sa.table(
+    "messages",
+    sa.column("id", sa.Integer),
+    sa.column("message", sa.String),
+    sa.column("text_hash", sa.String),
+)
+
+
+def text_hash(message: str) -> str:
+    """Hash of the case- and whitespace-normalized text, as app.domain.models.text_hash computed it."""
+    normalized = " ".join(message.casefold().split())
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column("messages", sa.Column("text_hash", sa.String(length=64), nullable=True))
+
+    # Backfill in id order so each batch is a short index range scan
+    conn = op.get_bind()
+    set_hash = (
+        messages.update()
+        .where(messages.c.id == sa.bindparam("row_id"))
+        .values(text_hash=sa.bindparam("row_hash"))
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(messages.c.id, messages.c.message)
+            .where(messages.c.id > last_id, messages.c.message.isnot(None))
+            .order_by(messages.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        conn.execute(set_hash, [{"row_id": row.id, "row_hash": text_hash(row.message)} for row in rows])
+        last_id = rows[-1].id
+
+    op.create_index(
+        "ix_messages_text_hash_spam",
+        "messages",
+        ["text_hash"],
+        postgresql_where=sa.text("spam"),
+        sqlite_where=sa.text("spam"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_messages_text_hash_spam", table_name="messages")
+    op.drop_column("messages", "text_hash")
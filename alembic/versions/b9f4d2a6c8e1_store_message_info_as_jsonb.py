@@ -0,0 +1,32 @@
+"""Store messages.message_info as JSONB
+
+Revision ID: b9f4d2a6c8e1
+Revises: a7e3c5f9b1d4
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b9f4d2a6c8e1"
+down_revision: Union[str, None] = "a7e3c5f9b1d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SQLite stores JSON as text either way
+    if op.get_context().dialect.name != "postgresql":
+        return
+    # Rewrites every partition; existing rows keep their full message dumps
+    op.execute("ALTER TABLE messages ALTER COLUMN message_info TYPE JSONB USING message_info::jsonb")
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+    op.execute("ALTER TABLE messages ALTER COLUMN message_info TYPE JSON USING message_info::json")
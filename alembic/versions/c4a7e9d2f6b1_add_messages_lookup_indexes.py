@@ -0,0 +1,36 @@
+"""Add composite indexes for messages lookups by user and by chat message
+
+Revision ID: c4a7e9d2f6b1
+Revises: b3f1c2a9d8e4
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a7e9d2f6b1"
+down_revision: Union[str, None] = "b3f1c2a9d8e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_messages_user_id_chat_id": ["user_id", "chat_id"],
+    "ix_messages_chat_id_message_id": ["chat_id", "message_id"],
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; it keeps messages writable during the build.
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(name, "messages", columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(name, table_name="messages", if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,38 @@
+"""Add scheduled_deletions table for delayed deletion of bot messages
+
+Revision ID: d8b2f4e6a1c3
+Revises: c4a7e9d2f6b1
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d8b2f4e6a1c3"
+down_revision: Union[str, None] = "c4a7e9d2f6b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scheduled_deletions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("chat_id", sa.BigInteger(), nullable=False),
+        sa.Column("message_id", sa.BigInteger(), nullable=False),
+        sa.Column("delete_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_scheduled_deletions_chat_id_message_id", "scheduled_deletions", ["chat_id", "message_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scheduled_deletions_chat_id_message_id", table_name="scheduled_deletions")
+    op.drop_table("scheduled_deletions")
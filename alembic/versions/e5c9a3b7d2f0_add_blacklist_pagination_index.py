@@ -0,0 +1,61 @@
+"""Add partial index on blocked users for keyset pagination of the blacklist
+
+Backfills users.created_at, the leading key, and makes it NOT NULL.
+
+Revision ID: e5c9a3b7d2f0
+Revises: d8b2f4e6a1c3
+Create Date: 2026-10-17 13:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5c9a3b7d2f0"
+down_revision: Union[str, None] = "d8b2f4e6a1c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+users = sa.table(
+    "users",
+    sa.column("created_at", sa.DateTime),
+    sa.column("modified_at", sa.DateTime),
+)
+
+
+def upgrade() -> None:
+    # created_at was added without a backfill; NULL keys would never match the
+    # keyset comparison and leave those users unreachable past the first page
+    op.execute(
+        users.update()
+        .where(users.c.created_at.is_(None))
+        .values(created_at=sa.func.coalesce(users.c.modified_at, sa.func.current_timestamp()))
+    )
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.alter_column("created_at", existing_type=sa.DateTime(), nullable=False)
+
+    # CONCURRENTLY cannot run inside a transaction; it keeps users writable during the build.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_blocked_created_at_id",
+            "users",
+            ["created_at", "id"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+            postgresql_where=sa.text("blocked"),
+            sqlite_where=sa.text("blocked"),
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_blocked_created_at_id", table_name="users", if_exists=True, postgresql_concurrently=True
+        )
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.alter_column("created_at", existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,49 @@
+"""Add trigram indexes on blocked users' names for fuzzy blacklist search
+
+Revision ID: f1d6b8c4e2a7
+Revises: e5c9a3b7d2f0
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f1d6b8c4e2a7"
+down_revision: Union[str, None] = "e5c9a3b7d2f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ("username", "first_name", "last_name")
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CONCURRENTLY cannot run inside a transaction; it keeps users writable during the build.
+    with op.get_context().autocommit_block():
+        for column in COLUMNS:
+            op.create_index(
+                f"ix_users_blocked_{column}_trgm",
+                "users",
+                [column],
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_where=sa.text("blocked"),
+                sqlite_where=sa.text("blocked"),
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for column in COLUMNS:
+            op.drop_index(
+                f"ix_users_blocked_{column}_trgm", table_name="users", if_exists=True, postgresql_concurrently=True
+            )
@@ -0,0 +1,94 @@
+"""Process-wide cache of bot administrator roles."""
+
+import asyncio
+from collections.abc import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.application.services.cache_invalidation import ADMIN_ROLES, invalidation_bus
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.domain.repositories import IAdminRepository
+from app.infrastructure.db.repositories import get_admin_repository
+
+logger = get_logger("admin_roles")
+
+
+class AdminRoleCache:
+    """Super admins from settings plus the active admins from the ``admins`` table.
+
+    The database part is loaded once, refreshed after ``/admin`` and ``/unadmin``
+    and periodically reconciled to pick up changes made outside this process.
+    Sibling worker processes reload it on the next check after ``/admin`` or
+    ``/unadmin`` ran in another process.
+    """
+
+    def __init__(self, super_admins: Iterable[int] | None = None) -> None:
+        self.super_admins = frozenset(super_admins if super_admins is not None else settings.admin.super_admins)
+        self._db_admin_ids: frozenset[int] = frozenset()
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        """Check if the database admins have been loaded."""
+        return self._loaded
+
+    @property
+    def admin_ids(self) -> frozenset[int]:
+        """IDs of all super admins and active database admins."""
+        return self.super_admins | self._db_admin_ids
+
+    def is_super_admin(self, user_id: int) -> bool:
+        """Check if user is a super admin."""
+        return user_id in self.super_admins
+
+    def is_db_admin(self, user_id: int) -> bool:
+        """Check if user is an active admin stored in the database."""
+        return user_id in self._db_admin_ids
+
+    def is_admin(self, user_id: int) -> bool:
+        """Check if user is a super admin or an active database admin."""
+        return user_id in self.super_admins or user_id in self._db_admin_ids
+
+    async def ensure_loaded(self, admin_repo: IAdminRepository) -> None:
+        """Load the database admins unless they are already loaded."""
+        if self._loaded:
+            return
+        async with self._lock:
+            if not self._loaded:
+                await self._reconcile(admin_repo)
+
+    async def reconcile(self, admin_repo: IAdminRepository) -> None:
+        """Replace the cached database admins with the current active admins."""
+        async with self._lock:
+            await self._reconcile(admin_repo)
+
+    def invalidate(self) -> None:
+        """Reload the database admins on the next ``ensure_loaded``."""
+        self._loaded = False
+
+    async def _reconcile(self, admin_repo: IAdminRepository) -> None:
+        ids = frozenset(admin.id for admin in await admin_repo.get_all_active())
+        if ids != self._db_admin_ids:
+            logger.info("Admin roles reconciled", admins=len(ids), super_admins=len(self.super_admins))
+        self._db_admin_ids = ids
+        self._loaded = True
+
+
+async def run_reconcile_loop(
+    cache: AdminRoleCache, session_pool: async_sessionmaker[AsyncSession], interval: float
+) -> None:
+    """Reconcile the cache with the database every ``interval`` seconds."""
+    while True:
+        try:
+            async with session_pool() as session:
+                await cache.reconcile(get_admin_repository(session))
+        except Exception as e:
+            logger.error("Admin roles reconcile failed", error=str(e), exc_info=True)
+        await asyncio.sleep(interval)
+
+
+# Global cache instance
+admin_roles = AdminRoleCache()
+invalidation_bus.subscribe(ADMIN_ROLES, lambda _: admin_roles.invalidate())
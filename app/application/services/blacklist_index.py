@@ -0,0 +1,113 @@
+"""Process-wide in-memory index of blacklisted user IDs."""
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.application.services.cache_invalidation import BLACKLIST, Invalidation, invalidation_bus
+from app.core.logging import get_logger
+from app.domain.repositories import IUserRepository
+from app.infrastructure.db.repositories import get_user_repository
+
+logger = get_logger("blacklist_index")
+
+
+class BlacklistIndex:
+    """Set of blocked user IDs kept in sync with the database.
+
+    The index is loaded once, updated in place whenever a user is blocked or
+    unblocked, and periodically reconciled with the ``users`` table to pick up
+    changes made outside this process. Block changes are also published on the
+    invalidation bus so sibling worker processes apply them right away.
+    """
+
+    def __init__(self) -> None:
+        self._ids: set[int] = set()
+        self._loaded = False
+        # Changes applied while a reconcile is in flight, replayed over its snapshot
+        self._pending: dict[int, bool] | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        """Check if the index has been populated from the database."""
+        return self._loaded
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, user_id: int) -> None:
+        """Mark user as blocked."""
+        self._set(user_id, True)
+        invalidation_bus.publish(BLACKLIST, user_id, True)
+
+    def discard(self, user_id: int) -> None:
+        """Mark user as not blocked."""
+        self._set(user_id, False)
+        invalidation_bus.publish(BLACKLIST, user_id, False)
+
+    def apply_invalidation(self, invalidation: Invalidation) -> None:
+        """Apply a block change made by another process."""
+        assert invalidation.key is not None
+        self._set(invalidation.key, bool(invalidation.value))
+
+    def _set(self, user_id: int, blocked: bool) -> None:
+        if blocked:
+            self._ids.add(user_id)
+        else:
+            self._ids.discard(user_id)
+        if self._pending is not None:
+            self._pending[user_id] = blocked
+
+    async def ensure_loaded(self, user_repo: IUserRepository) -> None:
+        """Load the index from the database unless it is already populated."""
+        if self._loaded:
+            return
+        async with self._lock:
+            if not self._loaded:
+                await self._reconcile(user_repo)
+
+    async def reconcile(self, user_repo: IUserRepository) -> None:
+        """Replace the index with the current set of blocked users from the database."""
+        async with self._lock:
+            await self._reconcile(user_repo)
+
+    async def _reconcile(self, user_repo: IUserRepository) -> None:
+        self._pending = {}
+        try:
+            ids = await user_repo.get_blocked_user_ids()
+            for user_id, blocked in self._pending.items():
+                if blocked:
+                    ids.add(user_id)
+                else:
+                    ids.discard(user_id)
+        finally:
+            pending, self._pending = self._pending, None
+
+        added = len(ids - self._ids)
+        removed = len(self._ids - ids)
+        self._ids = ids
+        self._loaded = True
+        if added or removed:
+            logger.info("Blacklist index reconciled", size=len(ids), added=added, removed=removed, pending=len(pending))
+
+
+async def run_reconcile_loop(
+    index: BlacklistIndex, session_pool: async_sessionmaker[AsyncSession], interval: float
+) -> None:
+    """Reconcile the index with the database every ``interval`` seconds."""
+    while True:
+        try:
+            async with session_pool() as session:
+                await index.reconcile(get_user_repository(session))
+        except Exception as e:
+            logger.error("Blacklist reconcile failed", error=str(e), exc_info=True)
+        await asyncio.sleep(interval)
+
+
+# Global index instance
+blacklist_index = BlacklistIndex()
+invalidation_bus.subscribe(BLACKLIST, blacklist_index.apply_invalidation)
@@ -0,0 +1,86 @@
+"""Cross-process invalidation of the process-wide caches."""
+
+import asyncio
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from app.core.logging import get_logger
+
+logger = get_logger("cache_invalidation")
+
+# Caches kept in sync between worker processes
+BLACKLIST = "blacklist"
+ADMIN_ROLES = "admin_roles"
+CHATS = "chats"
+
+
+@dataclass(frozen=True)
+class Invalidation:
+    """A change another process made to one of its caches."""
+
+    cache: str
+    key: int | None = None
+    value: Any = None
+
+
+class InvalidationQueue(Protocol):
+    """The part of ``multiprocessing.Queue`` the bus relies on."""
+
+    def put(self, obj: Any) -> None: ...
+
+    def get(self) -> Any: ...
+
+
+class InvalidationBus:
+    """Fans cache changes out to the other worker processes.
+
+    Each process owns one inbox queue. ``publish`` puts the change into the
+    inboxes of all peers; ``listen`` applies changes arriving in this process's
+    inbox through the handler subscribed for the cache. Without peers, as in a
+    single-process bot, publishing does nothing.
+    """
+
+    def __init__(self) -> None:
+        self._peers: list[InvalidationQueue] = []
+        self._handlers: dict[str, Callable[[Invalidation], None]] = {}
+
+    @property
+    def is_connected(self) -> bool:
+        """Check if changes are sent to other processes."""
+        return bool(self._peers)
+
+    def subscribe(self, cache: str, handler: Callable[[Invalidation], None]) -> None:
+        """Apply changes to ``cache`` received from peers with ``handler``."""
+        self._handlers[cache] = handler
+
+    def connect(self, peers: Sequence[InvalidationQueue]) -> None:
+        """Send changes published from now on to the ``peers`` inboxes."""
+        self._peers = list(peers)
+
+    def publish(self, cache: str, key: int | None = None, value: Any = None) -> None:
+        """Tell the other processes that ``cache`` changed."""
+        invalidation = Invalidation(cache, key, value)
+        for peer in self._peers:
+            peer.put(invalidation)
+
+    def apply(self, invalidation: Invalidation) -> None:
+        """Apply a change received from another process."""
+        handler = self._handlers.get(invalidation.cache)
+        if handler is None:
+            logger.warning("No handler for cache invalidation", cache=invalidation.cache)
+            return
+        handler(invalidation)
+
+    async def listen(self, inbox: InvalidationQueue) -> None:
+        """Apply changes from ``inbox`` until a ``None`` sentinel arrives."""
+        loop = asyncio.get_running_loop()
+        while (invalidation := await loop.run_in_executor(None, inbox.get)) is not None:
+            try:
+                self.apply(invalidation)
+            except Exception as e:
+                logger.error("Cache invalidation failed", cache=invalidation.cache, error=str(e), exc_info=True)
+
+
+# Global bus instance
+invalidation_bus = InvalidationBus()
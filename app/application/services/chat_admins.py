@@ -0,0 +1,130 @@
+"""TTL cache of chat administrator IDs."""
+
+import asyncio
+import time
+
+from aiogram import Bot
+from aiogram.enums import ChatMemberStatus
+from aiogram.types import ChatMemberUpdated
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.infrastructure.cache import Cache, cache_backend
+
+logger = get_logger("chat_admins")
+
+ADMIN_STATUSES = frozenset({ChatMemberStatus.ADMINISTRATOR, ChatMemberStatus.CREATOR})
+
+
+class ChatAdminCache:
+    """Per-chat cache of administrator IDs with TTL expiry.
+
+    Concurrent lookups for the same chat share a single ``getChatAdministrators``
+    call. Entries are dropped when a ``chat_member`` / ``my_chat_member`` update
+    changes someone's admin status.
+
+    With a ``shared`` cache, local misses are looked up there before calling
+    Telegram, so replicas share each chat's admin list.
+    """
+
+    def __init__(self, ttl: float, shared: Cache | None = None) -> None:
+        self.ttl = ttl
+        self.shared = shared
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[int, tuple[float, frozenset[int]]] = {}
+        self._inflight: dict[int, asyncio.Task[frozenset[int]]] = {}
+        self._generations: dict[int, int] = {}
+        # Chats whose shared entry may predate an admin change seen here
+        self._shared_stale: set[int] = set()
+        self._shared_deletes: set[asyncio.Task[None]] = set()
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    async def get_admin_ids(self, bot: Bot, chat_id: int) -> frozenset[int]:
+        """Get IDs of chat administrators, fetching them from Telegram when stale."""
+        entry = self._entries.get(chat_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        task = self._inflight.get(chat_id)
+        if task is None:
+            task = asyncio.create_task(self._fetch(bot, chat_id))
+            self._inflight[chat_id] = task
+            task.add_done_callback(lambda done: self._forget(chat_id, done))
+        return await asyncio.shield(task)
+
+    def invalidate(self, chat_id: int) -> None:
+        """Drop the cached admin set for a chat."""
+        self._entries.pop(chat_id, None)
+        # A fetch already in flight may predate the change, so it must not be reused or stored
+        self._inflight.pop(chat_id, None)
+        self._generations[chat_id] = self._generations.get(chat_id, 0) + 1
+        if self.shared is not None:
+            self._shared_stale.add(chat_id)
+            task = asyncio.get_running_loop().create_task(self._delete_shared(chat_id))
+            self._shared_deletes.add(task)
+            task.add_done_callback(self._shared_deletes.discard)
+
+    def handle_member_update(self, update: ChatMemberUpdated) -> None:
+        """Invalidate the chat's entry if the update changes admin status."""
+        old_status = update.old_chat_member.status
+        new_status = update.new_chat_member.status
+        if old_status != new_status and (old_status in ADMIN_STATUSES or new_status in ADMIN_STATUSES):
+            self.invalidate(update.chat.id)
+
+    async def _fetch(self, bot: Bot, chat_id: int) -> frozenset[int]:
+        generation = self._generations.get(chat_id, 0)
+        admin_ids = await self._get_shared(chat_id)
+        if admin_ids is None:
+            chat_admins = await bot.get_chat_administrators(chat_id)
+            admin_ids = frozenset(admin.user.id for admin in chat_admins)
+            if self._generations.get(chat_id, 0) == generation:
+                await self._set_shared(chat_id, admin_ids)
+        if self._generations.get(chat_id, 0) == generation:
+            self._entries[chat_id] = (time.monotonic() + self.ttl, admin_ids)
+        return admin_ids
+
+    async def _get_shared(self, chat_id: int) -> frozenset[int] | None:
+        if self.shared is None or chat_id in self._shared_stale:
+            return None
+        try:
+            admin_ids = await self.shared.get(chat_id)
+        except Exception as e:
+            logger.warning("Shared chat admins lookup failed", chat_id=chat_id, error=str(e))
+            return None
+        return frozenset(admin_ids) if admin_ids is not None else None
+
+    async def _set_shared(self, chat_id: int, admin_ids: frozenset[int]) -> None:
+        if self.shared is None:
+            return
+        try:
+            await self.shared.set(chat_id, sorted(admin_ids), self.ttl)
+        except Exception as e:
+            logger.warning("Shared chat admins update failed", chat_id=chat_id, error=str(e))
+            return
+        self._shared_stale.discard(chat_id)
+
+    async def _delete_shared(self, chat_id: int) -> None:
+        assert self.shared is not None
+        try:
+            await self.shared.delete(chat_id)
+        except Exception as e:
+            logger.warning("Shared chat admins invalidation failed", chat_id=chat_id, error=str(e))
+
+    def _forget(self, chat_id: int, task: asyncio.Task[frozenset[int]]) -> None:
+        if self._inflight.get(chat_id) is task:
+            del self._inflight[chat_id]
+
+
+# Global cache instance
+chat_admin_cache = ChatAdminCache(
+    ttl=settings.cache.chat_admins_ttl,
+    shared=Cache(cache_backend, "chat_admins", prefix=settings.cache.key_prefix),
+)
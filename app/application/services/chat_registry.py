@@ -0,0 +1,104 @@
+"""In-memory registry of managed chats."""
+
+import asyncio
+from dataclasses import dataclass
+
+from app.application.services.cache_invalidation import CHATS, Invalidation, invalidation_bus
+from app.core.logging import get_logger
+from app.infrastructure.db.repositories import ChatRepository
+
+logger = get_logger("chat_registry")
+
+
+@dataclass(frozen=True)
+class ManagedChat:
+    """Chat metadata mirrored from the ``chats`` table."""
+
+    id: int
+    title: str | None
+    is_forum: bool
+
+
+class ChatRegistry:
+    """Process-wide view of managed chats.
+
+    Loaded once from the database; afterwards a chat row is written only when
+    the chat is new or its title / forum flag changed. Such changes are published
+    on the invalidation bus for sibling worker processes.
+    """
+
+    def __init__(self) -> None:
+        self._chats: dict[int, ManagedChat] = {}
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        """Check if the registry has been populated from the database."""
+        return self._loaded
+
+    def __contains__(self, chat_id: object) -> bool:
+        return chat_id in self._chats
+
+    def __len__(self) -> int:
+        return len(self._chats)
+
+    def get(self, chat_id: int) -> ManagedChat | None:
+        """Get a managed chat by ID."""
+        return self._chats.get(chat_id)
+
+    def chat_ids(self) -> list[int]:
+        """Get IDs of all managed chats."""
+        return list(self._chats)
+
+    async def load(self, chat_repo: ChatRepository) -> None:
+        """Replace the registry contents with the chats stored in the database."""
+        async with self._lock:
+            chats = await chat_repo.get_all()
+            self._chats = {chat.id: ManagedChat(chat.id, chat.title, chat.is_forum) for chat in chats}
+            self._loaded = True
+        logger.info("Chat registry loaded", chats=len(self._chats))
+
+    async def ensure_loaded(self, chat_repo: ChatRepository) -> None:
+        """Load the registry unless it is already populated."""
+        if not self._loaded:
+            await self.load(chat_repo)
+
+    async def merge(
+        self,
+        chat_repo: ChatRepository,
+        chat_id: int,
+        title: str | None = None,
+        is_forum: bool | None = None,
+    ) -> None:
+        """Record chat metadata, writing to the database only if something changed."""
+        await self.ensure_loaded(chat_repo)
+
+        current = self._chats.get(chat_id)
+        updated = ManagedChat(
+            id=chat_id,
+            title=title if title is not None else (current.title if current else None),
+            is_forum=is_forum if is_forum is not None else (current.is_forum if current else False),
+        )
+        if updated == current:
+            return
+
+        await chat_repo.merge_chat(id_tg_chat=chat_id, title=title, is_forum=is_forum)
+        self._chats[chat_id] = updated
+        invalidation_bus.publish(CHATS, chat_id, (updated.title, updated.is_forum))
+
+    def apply_invalidation(self, invalidation: Invalidation) -> None:
+        """Record a chat another process added or changed.
+
+        An unloaded registry ignores it, the database already has the row.
+        """
+        if not self._loaded:
+            return
+        assert invalidation.key is not None
+        title, is_forum = invalidation.value
+        self._chats[invalidation.key] = ManagedChat(invalidation.key, title, is_forum)
+
+
+# Global registry instance
+chat_registry = ChatRegistry()
+invalidation_bus.subscribe(CHATS, chat_registry.apply_invalidation)
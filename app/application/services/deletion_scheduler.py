@@ -0,0 +1,136 @@
+"""Delayed deletion of bot messages."""
+
+import asyncio
+import contextlib
+import datetime
+import heapq
+from collections import defaultdict
+from collections.abc import Callable
+
+from aiogram import Bot
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.logging import get_logger
+from app.domain.entities import ScheduledDeletionEntity
+from app.infrastructure.db.repositories import get_scheduled_deletion_repository
+from app.infrastructure.telegram.api_scheduler import api_scheduler
+
+logger = get_logger("deletion_scheduler")
+
+
+class DeletionScheduler:
+    """Deletes bot messages after a delay without keeping handlers alive.
+
+    Entries sit on an in-memory timer heap and are written to
+    ``scheduled_deletions`` in batches, so pending deletions survive a restart.
+    Due messages are removed per chat with ``deleteMessages``.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[ScheduledDeletionEntity] = []
+        self._unsaved: list[ScheduledDeletionEntity] = []
+        self._wakeup: asyncio.Event | None = None
+        self._worker: asyncio.Task[None] | None = None
+        self._bot: Bot | None = None
+        self._session_pool: async_sessionmaker[AsyncSession] | None = None
+
+    @property
+    def pending(self) -> int:
+        """Number of deletions not yet carried out."""
+        return len(self._heap)
+
+    def schedule(self, chat_id: int, message_id: int, delay: float) -> None:
+        """Delete the message ``delay`` seconds from now."""
+        entry = ScheduledDeletionEntity(
+            delete_at=datetime.datetime.now() + datetime.timedelta(seconds=delay),
+            chat_id=chat_id,
+            message_id=message_id,
+        )
+        heapq.heappush(self._heap, entry)
+        self._unsaved.append(entry)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(
+        self,
+        bot: Bot,
+        session_pool: async_sessionmaker[AsyncSession],
+        owns_chat: Callable[[int], bool] | None = None,
+    ) -> None:
+        """Load persisted deletions and start the timer.
+
+        With ``owns_chat`` only deletions in chats it accepts are restored, so
+        that every sharded worker process restores its own chats.
+        """
+        self._bot = bot
+        self._session_pool = session_pool
+        async with session_pool() as session:
+            stored = await get_scheduled_deletion_repository(session).get_all()
+        if owns_chat is not None:
+            stored = [entry for entry in stored if owns_chat(entry.chat_id)]
+        for entry in stored:
+            heapq.heappush(self._heap, entry)
+        self._wakeup = asyncio.Event()
+        self._worker = asyncio.create_task(self._run())
+        logger.info("Deletion scheduler started", restored=len(stored))
+
+    async def stop(self) -> None:
+        """Stop the timer, persisting deletions that were not saved yet."""
+        if self._worker is not None:
+            self._worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._worker
+            self._worker = None
+        await self._save()
+        logger.info("Deletion scheduler stopped", pending=self.pending)
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            self._wakeup.clear()
+            try:
+                await self._save()
+                await self._delete_due()
+            except Exception as e:
+                logger.error("Scheduled deletion failed", error=str(e), exc_info=True)
+
+            timeout = None
+            if self._heap:
+                timeout = max(0.0, (self._heap[0].delete_at - datetime.datetime.now()).total_seconds())
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+
+    async def _save(self) -> None:
+        if not self._unsaved or self._session_pool is None:
+            return
+        batch, self._unsaved = self._unsaved, []
+        try:
+            async with self._session_pool() as session:
+                await get_scheduled_deletion_repository(session).add_many(batch)
+        except Exception:
+            self._unsaved = batch + self._unsaved
+            raise
+
+    async def _delete_due(self) -> None:
+        now = datetime.datetime.now()
+        due: dict[int, list[int]] = defaultdict(list)
+        while self._heap and self._heap[0].delete_at <= now:
+            entry = heapq.heappop(self._heap)
+            due[entry.chat_id].append(entry.message_id)
+        if not due:
+            return
+
+        assert self._bot is not None
+        await asyncio.gather(
+            *(api_scheduler.delete_messages(self._bot, chat_id, message_ids) for chat_id, message_ids in due.items())
+        )
+
+        assert self._session_pool is not None
+        async with self._session_pool() as session:
+            repo = get_scheduled_deletion_repository(session)
+            for chat_id, message_ids in due.items():
+                await repo.remove(chat_id, message_ids)
+
+
+# Global scheduler instance
+deletion_scheduler = DeletionScheduler()
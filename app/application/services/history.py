@@ -1,6 +1,12 @@
+import datetime
+from collections import OrderedDict
+from typing import Any
+
 from aiogram import types
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.application.services.chat_registry import chat_registry
+from app.core.config import settings
 from app.infrastructure.db.repositories import (
     get_chat_repository,
     get_message_repository,
@@ -9,35 +15,96 @@ from app.infrastructure.db.repositories import (
 
 
 async def save_message(db: AsyncSession, message: types.Message) -> None:
-    chat_id = message.chat.id
-    user_id = message.from_user.id
-    message_id = message.message_id
-    message_text = message.text or message.caption
-    message_info = message.model_dump(exclude_none=True)
-
     message_repo = get_message_repository(db)
-    await message_repo.add_message(chat_id, user_id, message_id, message_text, message_info)
+    await message_repo.add_messages([build_message_row(message)])
+
+
+_FILE_ID: Any = {"file_unique_id"}
+
+# Fields of a message kept in compact ``message_info``
+COMPACT_MESSAGE_INFO: Any = {
+    "entities": True,
+    "caption_entities": True,
+    "photo": {"__all__": _FILE_ID},
+    **dict.fromkeys(
+        ("animation", "audio", "document", "sticker", "video", "video_note", "voice"),
+        _FILE_ID,
+    ),
+    "forward_origin": {
+        "type": True,
+        "date": True,
+        "sender_user": {"id"},
+        "sender_user_name": True,
+        "sender_chat": {"id"},
+        "chat": {"id"},
+        "message_id": True,
+    },
+    "reply_to_message": {"message_id": True, "from_user": {"id"}},
+}
+
+
+def dump_message_info(message: types.Message, projection: str | None = None) -> str:
+    """Serialize ``message_info`` straight to JSON text.
+
+    ``compact`` keeps only :data:`COMPACT_MESSAGE_INFO`, ``full`` the whole message.
+    """
+    projection = projection if projection is not None else settings.history.message_info
+    include = COMPACT_MESSAGE_INFO if projection == "compact" else None
+    return message.model_dump_json(include=include, exclude_none=True)
+
+
+def build_message_row(message: types.Message) -> dict[str, Any]:
+    """Build a ``messages`` row for batched insertion."""
+    return {
+        "chat_id": message.chat.id,
+        "user_id": message.from_user.id,
+        "message_id": message.message_id,
+        "message": message.text or message.caption,
+        "message_info": dump_message_info(message),
+        "timestamp": datetime.datetime.now(),
+    }
+
+
+class ProfileCache:
+    """LRU of the last profile written per user, used to skip no-op upserts."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._profiles: OrderedDict[int, tuple[str | None, str | None, str | None]] = OrderedDict()
+
+    def is_current(self, user_id: int, profile: tuple[str | None, str | None, str | None]) -> bool:
+        """Check if this exact profile was already written for the user."""
+        if self._profiles.get(user_id) != profile:
+            return False
+        self._profiles.move_to_end(user_id)
+        return True
+
+    def remember(self, user_id: int, profile: tuple[str | None, str | None, str | None]) -> None:
+        """Record the profile as written."""
+        self._profiles[user_id] = profile
+        self._profiles.move_to_end(user_id)
+        if len(self._profiles) > self.maxsize:
+            self._profiles.popitem(last=False)
+
+
+recent_profiles = ProfileCache(maxsize=settings.cache.user_profiles_size)
 
 
 async def merge_user(db: AsyncSession, user: types.User) -> None:
+    profile = (user.username, user.first_name, user.last_name)
+    if recent_profiles.is_current(user.id, profile):
+        return
+
     user_repo = get_user_repository(db)
-    from app.domain.entities import UserEntity
-
-    user_entity = UserEntity(
-        id=user.id,
-        username=user.username,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        is_verified=False,
-        is_blocked=False,
-    )
-    await user_repo.save(user_entity)
+    await user_repo.upsert_profile(user.id, *profile)
+    recent_profiles.remember(user.id, profile)
 
 
 async def merge_chat(db: AsyncSession, chat: types.Chat) -> None:
     chat_repo = get_chat_repository(db)
-    await chat_repo.merge_chat(
-        id_tg_chat=chat.id,
+    await chat_registry.merge(
+        chat_repo,
+        chat_id=chat.id,
         title=chat.title,
         is_forum=chat.is_forum,
     )
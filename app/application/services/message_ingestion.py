@@ -0,0 +1,121 @@
+"""Write-behind buffer for message history."""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.logging import get_logger
+from app.infrastructure.db.repositories import get_message_repository
+
+logger = get_logger("message_ingestion")
+
+
+@dataclass
+class IngestionStats:
+    """Counters describing the ingestion pipeline."""
+
+    enqueued: int = 0
+    written: int = 0
+    failed: int = 0
+    batches: int = 0
+    largest_batch: int = 0
+    last_flush_seconds: float = 0.0
+
+
+class MessageIngestor:
+    """Buffers message rows on a bounded queue and writes them in batches.
+
+    A batch is flushed once it reaches ``batch_size`` rows or its oldest row has
+    waited ``flush_interval`` seconds. When the queue is full, ``submit`` waits
+    for room, applying backpressure instead of dropping history.
+    """
+
+    def __init__(
+        self,
+        session_pool: async_sessionmaker[AsyncSession],
+        buffer_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self.session_pool = session_pool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stats = IngestionStats()
+        # ``None`` is the shutdown sentinel
+        self._queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(maxsize=buffer_size)
+        self._worker: asyncio.Task[None] | None = None
+
+    @property
+    def pending(self) -> int:
+        """Number of rows waiting to be written."""
+        return self._queue.qsize()
+
+    async def submit(self, row: dict[str, Any]) -> None:
+        """Queue a message row for writing."""
+        await self._queue.put(row)
+        self.stats.enqueued += 1
+
+    def start(self) -> None:
+        """Start the background writer."""
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background writer and flush everything still queued."""
+        if self._worker is not None:
+            await self._queue.put(None)
+            await self._worker
+            self._worker = None
+        else:
+            # Never started: write whatever was submitted directly
+            rows = []
+            while not self._queue.empty():
+                row = self._queue.get_nowait()
+                if row is not None:
+                    rows.append(row)
+            for start in range(0, len(rows), self.batch_size):
+                await self._write(rows[start : start + self.batch_size])
+        logger.info("Message ingestion stopped", **vars(self.stats))
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                if not self._queue.empty():
+                    row = self._queue.get_nowait()
+                else:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        row = await asyncio.wait_for(self._queue.get(), timeout)
+                    except TimeoutError:
+                        break
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+            await self._write(batch)
+
+    async def _write(self, batch: list[dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        try:
+            async with self.session_pool() as session:
+                await get_message_repository(session).add_messages(batch)
+        except Exception as e:
+            self.stats.failed += len(batch)
+            logger.error("Failed to write message batch", size=len(batch), error=str(e), exc_info=True)
+            return
+
+        self.stats.written += len(batch)
+        self.stats.batches += 1
+        self.stats.largest_batch = max(self.stats.largest_batch, len(batch))
+        self.stats.last_flush_seconds = time.perf_counter() - started
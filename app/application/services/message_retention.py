@@ -0,0 +1,50 @@
+"""Retention of stored message history."""
+
+import asyncio
+import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import HistorySettings
+from app.core.logging import get_logger
+from app.infrastructure.db.partitions import MessagePartitions
+
+logger = get_logger("message_retention")
+
+
+async def apply_retention(
+    partitions: MessagePartitions,
+    now: datetime.datetime,
+    retention_days: int,
+    months_ahead: int,
+    archive: bool = False,
+) -> list[str]:
+    """Create upcoming monthly partitions and expire messages past the retention period.
+
+    Returns the names of the partitions that were removed.
+    """
+    await partitions.ensure_months(now.date(), months_ahead + 1)
+    if retention_days <= 0:
+        return []
+
+    expired = await partitions.expire_before(now - datetime.timedelta(days=retention_days), archive=archive)
+    if expired:
+        logger.info("Expired message partitions", partitions=expired, archived=archive)
+    return expired
+
+
+async def run_retention_loop(session_pool: async_sessionmaker[AsyncSession], history: HistorySettings) -> None:
+    """Apply message retention every ``history.retention_interval`` seconds."""
+    while True:
+        try:
+            async with session_pool() as session:
+                await apply_retention(
+                    MessagePartitions(session),
+                    datetime.datetime.now(),
+                    retention_days=history.retention_days,
+                    months_ahead=history.partitions_ahead,
+                    archive=history.retention_archive,
+                )
+        except Exception as e:
+            logger.error("Message retention failed", error=str(e), exc_info=True)
+        await asyncio.sleep(history.retention_interval)
@@ -1,13 +1,17 @@
 import asyncio
+import functools
 
 from aiogram import Bot
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.application.services.blacklist_index import blacklist_index
+from app.application.services.chat_registry import chat_registry
 from app.infrastructure.db.repositories import (
     ChatRepository,
     MessageRepository,
     UserRepository,
 )
+from app.infrastructure.telegram.api_scheduler import api_scheduler
 from app.presentation.telegram.logger import logger
 
 
@@ -16,32 +20,26 @@ async def add_to_blacklist(
     bot: Bot,
     id_tg: int,
     revoke_messages: bool | None = None,
-) -> None:
+) -> dict[int, int]:
+    """Blacklist a user and ban them in every managed chat.
+
+    With ``revoke_messages`` the user's stored messages are loaded once and
+    deleted per chat in bulk. Returns the number of deleted messages per chat.
+    """
     user_repo = UserRepository(db)
     chat_repo = ChatRepository(db)
     message_repo = MessageRepository(db)
     await user_repo.add_to_blacklist(id_tg)
+    blacklist_index.add(id_tg)
+
+    message_ids = await message_repo.get_user_message_ids(id_tg) if revoke_messages else {}
+    deleted: dict[int, int] = {}
 
     async def ban_user(chat_id: int) -> None:
         try:
-            try:
-                await bot.ban_chat_member(chat_id, id_tg, revoke_messages=revoke_messages)
-            except Exception as err:
-                logger.warning(f"Failed to ban user {id_tg} in chat {chat_id}.\nError: {err}")
-
-            if revoke_messages:
-                user_messages = await message_repo.get_user_messages(id_tg)
-                for message in user_messages:
-                    try:
-                        await bot.delete_message(
-                            chat_id=message.chat_id,
-                            message_id=message.message_id,
-                        )
-                    except Exception as err:
-                        logger.warning(
-                            f"Failed to delete message {message.message_id} in chat {chat_id}.\nError: {err}"
-                        )
-
+            await api_scheduler.call(
+                chat_id, functools.partial(bot.ban_chat_member, chat_id, id_tg, revoke_messages=revoke_messages)
+            )
         except Exception as err:
             logger.warning(
                 f"Failed to ban user {id_tg} in chat {chat_id}.\n"
@@ -49,8 +47,13 @@ async def add_to_blacklist(
                 f"Error: {err}"
             )
 
-    tasks = [ban_user(chat.id) for chat in await chat_repo.get_chats()]
+        if chat_id in message_ids:
+            deleted[chat_id] = await api_scheduler.delete_messages(bot, chat_id, message_ids[chat_id])
+
+    await chat_registry.ensure_loaded(chat_repo)
+    tasks = [ban_user(chat_id) for chat_id in chat_registry.chat_ids()]
     await asyncio.gather(*tasks)
+    return deleted
 
 
 async def remove_from_blacklist(db: AsyncSession, bot: Bot, id_tg: int) -> None:
@@ -58,12 +61,14 @@ async def remove_from_blacklist(db: AsyncSession, bot: Bot, id_tg: int) -> None:
     chat_repo = ChatRepository(db)
 
     await user_repo.remove_from_blacklist(id_tg)
+    blacklist_index.discard(id_tg)
 
     async def unban_user(chat_id: int) -> None:
         try:
-            await bot.unban_chat_member(chat_id, id_tg)
+            await api_scheduler.call(chat_id, functools.partial(bot.unban_chat_member, chat_id, id_tg))
         except Exception as err:
             logger.warning(f"Failed to unban user {id_tg} in chat {chat_id}.\nError: {err}")
 
-    tasks = [unban_user(chat.id) for chat in await chat_repo.get_chats()]
+    await chat_registry.ensure_loaded(chat_repo)
+    tasks = [unban_user(chat_id) for chat_id in chat_registry.chat_ids()]
     await asyncio.gather(*tasks)
@@ -1,5 +1,9 @@
 """Moderation domain service."""
 
+import asyncio
+import functools
+from collections.abc import Awaitable, Callable
+
 from aiogram import Bot
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.types import ChatPermissions
@@ -8,6 +12,7 @@ from app.core.logging import BotLogger
 from app.domain.exceptions import TelegramApiException
 from app.domain.repositories import IChatRepository, IMessageRepository
 from app.domain.value_objects import ModerationAction, MuteDuration
+from app.infrastructure.telegram.api_scheduler import ApiScheduler, api_scheduler
 
 
 class ModerationService:
@@ -18,10 +23,12 @@ class ModerationService:
         bot: Bot,
         chat_repository: IChatRepository,
         message_repository: IMessageRepository,
+        scheduler: ApiScheduler | None = None,
     ) -> None:
         self.bot = bot
         self.chat_repository = chat_repository
         self.message_repository = message_repository
+        self.scheduler = scheduler if scheduler is not None else api_scheduler
         self.logger = BotLogger("moderation_service")
 
     async def mute_user(
@@ -179,10 +186,14 @@ class ModerationService:
         user_id: int,
         reason: str | None = None,
     ) -> None:
-        """Ban user in all chats."""
+        """Ban user in all chats.
+
+        Every chat is attempted; the first failure is raised afterwards.
+        """
         chats = await self.chat_repository.get_all()
-        for chat in chats:
-            await self.ban_user(admin_id, user_id, chat.id, reason)
+        await self._fan_out(
+            [(chat.id, functools.partial(self.ban_user, admin_id, user_id, chat.id, reason)) for chat in chats]
+        )
 
     async def unban_user_globally(
         self,
@@ -190,10 +201,24 @@ class ModerationService:
         user_id: int,
         reason: str | None = None,
     ) -> None:
-        """Unban user in all chats."""
+        """Unban user in all chats.
+
+        Every chat is attempted; the first failure is raised afterwards.
+        """
         chats = await self.chat_repository.get_all()
-        for chat in chats:
-            await self.unban_user(admin_id, user_id, chat.id, reason)
+        await self._fan_out(
+            [(chat.id, functools.partial(self.unban_user, admin_id, user_id, chat.id, reason)) for chat in chats]
+        )
+
+    async def _fan_out(self, calls: list[tuple[int, Callable[[], Awaitable[None]]]]) -> None:
+        """Run per-chat calls through the rate-limited scheduler."""
+        results = await asyncio.gather(
+            *(self.scheduler.call(chat_id, request) for chat_id, request in calls),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
 
     async def delete_message(
         self,
@@ -1,6 +1,7 @@
 from aiogram import types
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.domain.models import text_hash
 from app.infrastructure.db.repositories import get_message_repository
 
 
@@ -13,4 +14,14 @@ async def detect_spam(db: AsyncSession, message: types.Message) -> bool:
     if not await message_repo.is_first_message(chat_id=message.chat.id, user_id=message.from_user.id):
         return False
 
-    return bool(await message_repo.is_similar_spam_message(text))
+    return await message_repo.has_spam_with_hash(text_hash(text))
+
+
+async def is_known_spam(db: AsyncSession, message: types.Message) -> bool:
+    """Check message text against messages already labelled as spam."""
+    text = message.text or message.caption
+    if not text:
+        return False
+
+    message_repo = get_message_repository(db)
+    return await message_repo.has_spam_with_hash(text_hash(text))
@@ -1,5 +1,8 @@
 """User domain service."""
 
+import datetime
+
+from app.application.services.blacklist_index import BlacklistIndex, blacklist_index
 from app.core.logging import BotLogger
 from app.domain.entities import UserEntity
 from app.domain.exceptions import UserNotFoundException
@@ -9,8 +12,9 @@ from app.domain.repositories import IUserRepository
 class UserService:
     """User domain service."""
 
-    def __init__(self, user_repository: IUserRepository) -> None:
+    def __init__(self, user_repository: IUserRepository, blacklist: BlacklistIndex | None = None) -> None:
         self.user_repository = user_repository
+        self.blacklist = blacklist if blacklist is not None else blacklist_index
         self.logger = BotLogger("user_service")
 
     async def get_user_by_id(self, user_id: int) -> UserEntity:
@@ -65,6 +69,7 @@ class UserService:
             user.block()
 
         user = await self.user_repository.save(user)
+        self.blacklist.add(user_id)
         self.logger.log_user_action(user_id, "user_blocked")
         return user
 
@@ -78,6 +83,7 @@ class UserService:
 
         user.unblock()
         user = await self.user_repository.save(user)
+        self.blacklist.discard(user_id)
         self.logger.log_user_action(user_id, "user_unblocked")
         return user
 
@@ -85,6 +91,25 @@ class UserService:
         """Get all blocked users."""
         return await self.user_repository.get_blocked_users()
 
+    async def count_blocked_users(self, query: str = "") -> int:
+        """Count blocked users, from the in-memory blacklist index when it is loaded.
+
+        Counting search matches always goes to the repository.
+        """
+        if not query and self.blacklist.is_loaded:
+            return len(self.blacklist)
+        return await self.user_repository.count_blocked_users(query)
+
+    async def get_blocked_users_page(
+        self,
+        limit: int,
+        cursor: tuple[datetime.datetime, int] | None = None,
+        backward: bool = False,
+        query: str = "",
+    ) -> list[UserEntity]:
+        """Get one page of blocked users ordered by ``(created_at, id)``, optionally matching ``query``."""
+        return await self.user_repository.get_blocked_users_page(limit, cursor, backward, query)
+
     async def find_blocked_user(self, identifier: str) -> UserEntity | None:
         """Find blocked user by username or user_id."""
         return await self.user_repository.find_blocked_user(identifier)
@@ -1,6 +1,7 @@
 """Application configuration using Pydantic settings."""
 
-from typing import Any
+from pathlib import Path
+from typing import Any, Literal
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -41,6 +42,16 @@ class TelegramSettings(BaseSettings):
     webhook_url: str | None = Field(default=None, description="Webhook URL for production")
     webhook_secret: str | None = Field(default=None, description="Webhook secret token")
     use_webhook: bool = Field(default=False, description="Use webhook instead of polling")
+    webhook_path: str = Field(default="/webhook", description="Path the webhook server listens on")
+    webhook_host: str = Field(default="127.0.0.1", description="Interface the webhook server binds to")
+    webhook_port: int = Field(default=8081, description="Port the webhook server binds to")
+    webhook_max_connections: int = Field(default=40, description="Max simultaneous webhook connections from Telegram")
+    webhook_handle_in_background: bool = Field(
+        default=True, description="Acknowledge webhook requests before the handlers finish"
+    )
+    workers: int = Field(
+        default=1, ge=1, description="Processes handling updates; above 1 an ingress process shards updates by chat"
+    )
 
     model_config = SettingsConfigDict(
         env_prefix="BOT_",
@@ -91,6 +102,9 @@ class LoggingSettings(BaseSettings):
     file_path: str | None = Field(default="logs/bot.log", description="Log file path")
     max_bytes: int = Field(default=10485760, description="Max log file size in bytes (10MB)")
     backup_count: int = Field(default=5, description="Number of backup log files")
+    queue_size: int = Field(
+        default=10000, ge=1, description="Most log records waiting to be written before new ones are dropped"
+    )
 
     model_config = SettingsConfigDict(
         env_prefix="LOG_",
@@ -101,6 +115,146 @@ class LoggingSettings(BaseSettings):
     )
 
 
+class CacheSettings(BaseSettings):
+    """In-process cache configuration."""
+
+    blacklist_reconcile_interval: int = Field(
+        default=300, description="Seconds between full blacklist index reconciles with the database"
+    )
+    admin_roles_reconcile_interval: int = Field(
+        default=300, description="Seconds between bot admin role reconciles with the database"
+    )
+    chat_admins_ttl: int = Field(default=300, description="Seconds to cache chat administrator lists")
+    user_profiles_size: int = Field(default=10000, description="Max recently seen user profiles kept in memory")
+    backend: Literal["memory", "redis"] = Field(
+        default="memory", description="Shared cache backend: in-process, or Redis shared by all replicas"
+    )
+    redis_url: str = Field(default="redis://localhost:6379/0", description="Redis URL for the redis cache backend")
+    key_prefix: str = Field(default="moderator-bot", description="Prefix of shared cache keys")
+    memory_size: int = Field(default=100000, description="Max entries of the in-process cache backend")
+
+    model_config = SettingsConfigDict(
+        env_prefix="CACHE_",
+        case_sensitive=False,
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+
+class HistorySettings(BaseSettings):
+    """Message history ingestion configuration."""
+
+    buffer_size: int = Field(default=10000, description="Max messages waiting to be written to the database")
+    batch_size: int = Field(default=500, description="Max messages written per INSERT")
+    flush_interval: float = Field(default=1.0, description="Max seconds a message waits in the buffer")
+    message_info: Literal["compact", "full"] = Field(
+        default="compact",
+        description="Stored message_info: entities, media ids, forward origin and reply ids, or the full message",
+    )
+    retention_days: int = Field(default=0, description="Days of messages to keep; 0 keeps everything")
+    retention_archive: bool = Field(
+        default=False, description="Keep expired monthly partitions as messages_archive_* tables instead of dropping"
+    )
+    retention_interval: int = Field(default=3600, description="Seconds between retention runs")
+    partitions_ahead: int = Field(default=2, description="Future monthly partitions of messages kept created")
+
+    model_config = SettingsConfigDict(
+        env_prefix="HISTORY_",
+        case_sensitive=False,
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+
+class RateLimitSettings(BaseSettings):
+    """Outbound Telegram Bot API rate limits."""
+
+    global_per_second: float = Field(default=30, description="Bot API calls per second across all chats")
+    group_per_minute: float = Field(default=20, description="Bot API calls per minute in one group chat")
+    private_per_second: float = Field(default=1, description="Bot API calls per second in one private chat")
+    max_retries: int = Field(default=3, description="Times a call is re-queued after a 429 retry_after")
+
+    model_config = SettingsConfigDict(
+        env_prefix="RATE_LIMIT_",
+        case_sensitive=False,
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+
+class MetricsSettings(BaseSettings):
+    """Metrics endpoint configuration."""
+
+    enabled: bool = Field(default=False, description="Serve metrics on /metrics")
+    host: str = Field(default="127.0.0.1", description="Interface the metrics server binds to")
+    port: int = Field(default=9100, description="Metrics port; sharded worker N listens on port + N")
+
+    model_config = SettingsConfigDict(
+        env_prefix="METRICS_",
+        case_sensitive=False,
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+
+class TracingSettings(BaseSettings):
+    """Per-update tracing configuration."""
+
+    enabled: bool = Field(default=False, description="Trace updates and log the span tree of slow ones")
+    slow_update_threshold: float = Field(default=1.0, description="Seconds after which an update is logged as slow")
+
+    model_config = SettingsConfigDict(
+        env_prefix="TRACING_",
+        case_sensitive=False,
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+
+class QueryBudgetSettings(BaseSettings):
+    """Runtime query budget guard configuration."""
+
+    enabled: bool = Field(default=False, description="Count queries per update and check them against budgets")
+    enforce: bool = Field(default=False, description="Fail updates over budget instead of logging a warning")
+
+    model_config = SettingsConfigDict(
+        env_prefix="QUERY_BUDGET_",
+        case_sensitive=False,
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+
+class CaptureSettings(BaseSettings):
+    """Recording of incoming updates for replay."""
+
+    enabled: bool = Field(default=False, description="Append incoming updates to a compressed JSONL capture")
+    path: Path = Field(default=Path("captures/updates.jsonl.gz"), description="Capture file being written")
+    max_bytes: int = Field(
+        default=100 * 1024 * 1024, ge=1, description="Uncompressed bytes after which the capture file is rotated"
+    )
+    backup_count: int = Field(default=10, ge=0, description="Rotated capture files to keep")
+    anonymize: bool = Field(default=True, description="Replace user and chat IDs and names with pseudonyms")
+    anonymize_key: str = Field(default="", description="Key of the ID pseudonyms; empty picks a random one per run")
+    queue_size: int = Field(
+        default=10000, ge=1, description="Most updates waiting to be written before new ones are dropped"
+    )
+
+    model_config = SettingsConfigDict(
+        env_prefix="CAPTURE_",
+        case_sensitive=False,
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+
 class AppSettings(BaseSettings):
     """Main application settings."""
 
@@ -112,6 +266,13 @@ class AppSettings(BaseSettings):
     telegram: TelegramSettings = Field(default_factory=TelegramSettings)
     admin: AdminSettings = Field(default_factory=AdminSettings)
     logging: LoggingSettings = Field(default_factory=LoggingSettings)
+    cache: CacheSettings = Field(default_factory=CacheSettings)
+    history: HistorySettings = Field(default_factory=HistorySettings)
+    rate_limit: RateLimitSettings = Field(default_factory=RateLimitSettings)
+    metrics: MetricsSettings = Field(default_factory=MetricsSettings)
+    tracing: TracingSettings = Field(default_factory=TracingSettings)
+    query_budget: QueryBudgetSettings = Field(default_factory=QueryBudgetSettings)
+    capture: CaptureSettings = Field(default_factory=CaptureSettings)
 
     model_config = SettingsConfigDict(
         env_file=".env",
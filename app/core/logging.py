@@ -1,7 +1,9 @@
 """Structured logging configuration."""
 
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
 from pathlib import Path
 from typing import Any
@@ -10,6 +12,7 @@ import structlog
 from structlog.types import EventDict, Processor
 
 from app.core.config import settings
+from app.core.metrics import log_records_dropped
 
 
 def add_severity_level(_logger: Any, _method_name: str, event_dict: EventDict) -> EventDict:
@@ -23,6 +26,42 @@ def add_timestamp(_logger: Any, _method_name: str, event_dict: EventDict) -> Eve
     return event_dict
 
 
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records when the queue is full instead of blocking the caller."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped.inc()
+
+
+class BackgroundQueueListener(logging.handlers.QueueListener):
+    """Queue listener that can be stopped more than once, e.g. explicitly and again on exit."""
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            super().stop()
+
+
+def enqueue_handlers(logger: logging.Logger, queue_size: int) -> BackgroundQueueListener:
+    """Move the handlers of ``logger`` behind a bounded queue served by a background thread.
+
+    Logging calls then only put the record on the queue; the handlers' formatting
+    and file I/O, rotation included, run on the listener thread. Records are
+    flushed on exit.
+    """
+    handlers = list(logger.handlers)
+    for handler in handlers:
+        logger.removeHandler(handler)
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=queue_size)
+    logger.addHandler(DroppingQueueHandler(log_queue))
+    listener = BackgroundQueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
 def setup_logging() -> None:
     """Setup structured logging with both console and file output."""
 
@@ -50,6 +89,9 @@ def setup_logging() -> None:
         root_logger = logging.getLogger()
         root_logger.addHandler(file_handler)
 
+    # Keep log I/O off the event loop thread
+    enqueue_handlers(logging.getLogger(), settings.logging.queue_size)
+
     # Configure processors based on environment
     processors: list[Processor] = [
         structlog.stdlib.filter_by_level,
@@ -0,0 +1,110 @@
+"""Counts of SQL statements and commits, checked against declared budgets.
+
+Handlers declare what they may cost with :func:`query_budget`. Counting happens
+inside :func:`count_queries`; the instrumented engine reports every statement
+and commit to the current count, and outside a count both reports do nothing.
+"""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+BUDGET_ATTRIBUTE = "__query_budget__"
+
+
+@dataclass
+class QueryCount:
+    """Statements and commits run so far; ``handler`` is the share of the handler."""
+
+    statements: int = 0
+    commits: int = 0
+    handler: "QueryCount | None" = None
+
+    def __sub__(self, other: "QueryCount") -> "QueryCount":
+        return QueryCount(self.statements - other.statements, self.commits - other.commits)
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    """Most statements and commits a handler or middleware chain may cost."""
+
+    statements: int
+    commits: int = 0
+
+    def exceeded_by(self, count: QueryCount) -> bool:
+        """Check whether ``count`` goes over the budget."""
+        return count.statements > self.statements or count.commits > self.commits
+
+
+class QueryBudgetExceededError(AssertionError):
+    """Raised when code runs more queries than its budget allows."""
+
+    def __init__(self, name: str, count: QueryCount, budget: QueryBudget) -> None:
+        self.name = name
+        self.count = count
+        self.budget = budget
+        super().__init__(
+            f"{name} ran {count.statements} statements and {count.commits} commits, "
+            f"budget is {budget.statements} statements and {budget.commits} commits"
+        )
+
+
+def query_budget(statements: int, commits: int = 0) -> Callable[[F], F]:
+    """Declare the query budget of a handler; apply below the router decorator."""
+
+    def decorator(callback: F) -> F:
+        setattr(callback, BUDGET_ATTRIBUTE, QueryBudget(statements, commits))
+        return callback
+
+    return decorator
+
+
+def budget_of(callback: Callable[..., Any]) -> QueryBudget | None:
+    """Budget declared for ``callback``, if any."""
+    return getattr(callback, BUDGET_ATTRIBUTE, None)
+
+
+_count: ContextVar[QueryCount | None] = ContextVar("query_count", default=None)
+
+
+def current_count() -> QueryCount | None:
+    """Count of the enclosing :func:`count_queries` block."""
+    return _count.get()
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCount]:
+    """Count the statements and commits run in the ``with`` block."""
+    count = QueryCount()
+    token = _count.set(count)
+    try:
+        yield count
+    finally:
+        _count.reset(token)
+
+
+@contextmanager
+def assert_query_budget(budget: QueryBudget, name: str = "block") -> Iterator[QueryCount]:
+    """Count the ``with`` block and raise :class:`QueryBudgetExceededError` if it goes over ``budget``."""
+    with count_queries() as count:
+        yield count
+    if budget.exceeded_by(count):
+        raise QueryBudgetExceededError(name, count, budget)
+
+
+def record_statement() -> None:
+    """Add a statement to the current count."""
+    count = _count.get()
+    if count is not None:
+        count.statements += 1
+
+
+def record_commit() -> None:
+    """Add a commit to the current count."""
+    count = _count.get()
+    if count is not None:
+        count.commits += 1
@@ -0,0 +1,108 @@
+"""Per-update span trees kept in a context variable.
+
+A trace is started for each update by the tracing middleware. Code running
+inside it opens child spans with :func:`span` or records finished ones with
+:func:`record_span`; outside a trace both do nothing.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+# Spans beyond this per trace are counted but not kept, e.g. for bulk jobs
+MAX_SPANS = 500
+
+
+@dataclass
+class Span:
+    """Timed step of an update; ``detail`` carries e.g. the SQL statement."""
+
+    name: str
+    start: float
+    end: float | None = None
+    detail: str | None = None
+    children: list["Span"] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        """Seconds the span took, or has taken so far."""
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def render(self, depth: int = 0) -> list[str]:
+        """Indented lines of this span and its children, with durations in ms."""
+        line = f"{'  ' * depth}{self.name} {self.duration * 1000:.1f}ms"
+        if self.detail:
+            line += f" {self.detail}"
+        lines = [line]
+        for child in self.children:
+            lines.extend(child.render(depth + 1))
+        return lines
+
+
+@dataclass
+class Trace:
+    """Span tree of one update."""
+
+    root: Span
+    spans: int = 1
+    dropped: int = 0
+
+    def attach(self, parent: Span, child: Span) -> bool:
+        """Add ``child`` under ``parent`` unless the trace is full."""
+        if self.spans >= MAX_SPANS:
+            self.dropped += 1
+            return False
+        parent.children.append(child)
+        self.spans += 1
+        return True
+
+
+_trace: ContextVar[Trace | None] = ContextVar("trace", default=None)
+_current: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def start_trace(name: str) -> Iterator[Trace]:
+    """Trace the ``with`` block as the root span ``name``."""
+    trace = Trace(Span(name, time.perf_counter()))
+    trace_token = _trace.set(trace)
+    span_token = _current.set(trace.root)
+    try:
+        yield trace
+    finally:
+        trace.root.end = time.perf_counter()
+        _current.reset(span_token)
+        _trace.reset(trace_token)
+
+
+@contextmanager
+def span(name: str, detail: str | None = None) -> Iterator[Span | None]:
+    """Record the ``with`` block as a child of the current span."""
+    trace, parent = _trace.get(), _current.get()
+    if trace is None or parent is None:
+        yield None
+        return
+    child = Span(name, time.perf_counter(), detail=detail)
+    if not trace.attach(parent, child):
+        yield None
+        return
+    token = _current.set(child)
+    try:
+        yield child
+    finally:
+        child.end = time.perf_counter()
+        _current.reset(token)
+
+
+def is_tracing() -> bool:
+    """Whether spans recorded now are kept, so callers can skip building their details."""
+    return _current.get() is not None
+
+
+def record_span(name: str, start: float, end: float, detail: str | None = None) -> None:
+    """Add an already finished span, timed with ``time.perf_counter``, under the current span."""
+    trace, parent = _trace.get(), _current.get()
+    if trace is not None and parent is not None:
+        trace.attach(parent, Span(name, start, end, detail))
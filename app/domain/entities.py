@@ -127,3 +127,12 @@ class ChatLinkEntity:
     def update_priority(self, priority: int) -> None:
         """Update link priority."""
         self.priority = priority
+
+
+@dataclass(frozen=True, order=True)
+class ScheduledDeletionEntity:
+    """Bot message due to be deleted at ``delete_at``."""
+
+    delete_at: datetime
+    chat_id: int
+    message_id: int
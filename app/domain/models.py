@@ -1,10 +1,13 @@
 import datetime
+import hashlib
 from typing import Any
 
-from sqlalchemy import JSON, BigInteger, Boolean, DateTime, Integer, String
+from sqlalchemy import BigInteger, Boolean, DateTime, Index, Integer, String, text
+from sqlalchemy.engine.default import DefaultExecutionContext
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.infrastructure.db.base import Base
+from app.infrastructure.db.types import JSONDocument
 
 
 class Admin(Base):
@@ -96,6 +99,28 @@ class Chat(Base):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # keyset pagination of the blacklist
+        Index(
+            "ix_users_blocked_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("blocked"),
+            sqlite_where=text("blocked"),
+        ),
+        # fuzzy blacklist search (ILIKE '%query%'), trigram GIN indexes on Postgres
+        *(
+            Index(
+                f"ix_users_blocked_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_where=text("blocked"),
+                sqlite_where=text("blocked"),
+            )
+            for column in ("username", "first_name", "last_name")
+        ),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
     username: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -199,17 +224,40 @@ class ChatLink(Base):
         self.link = link
 
 
+def text_hash(message: str | None) -> str | None:
+    """Hash of the case- and whitespace-normalized message text, used for spam matching."""
+    if not message:
+        return None
+    normalized = " ".join(message.casefold().split())
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def _default_text_hash(context: DefaultExecutionContext) -> str | None:
+    parameters: dict[str, Any] = context.get_current_parameters()  # type: ignore[no-untyped-call]
+    return text_hash(parameters.get("message"))
+
+
 class Message(Base):
+    # On PostgreSQL the table is range-partitioned by month on timestamp with
+    # primary key (id, timestamp), see app/infrastructure/db/partitions.py
     __tablename__ = "messages"
+    __table_args__ = (
+        # user history: counts, first-message check, revocation and deletion
+        Index("ix_messages_user_id_chat_id", "user_id", "chat_id"),
+        # a single message, e.g. when labelling spam
+        Index("ix_messages_chat_id_message_id", "chat_id", "message_id"),
+        Index("ix_messages_text_hash_spam", "text_hash", postgresql_where=text("spam"), sqlite_where=text("spam")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     chat_id: Mapped[int] = mapped_column(BigInteger)
     user_id: Mapped[int] = mapped_column(BigInteger)
     message_id: Mapped[int] = mapped_column(BigInteger)
     message: Mapped[str | None] = mapped_column(String, nullable=True)
-    message_info: Mapped[dict[str, Any]] = mapped_column(JSON)
+    message_info: Mapped[dict[str, Any]] = mapped_column(JSONDocument)
     timestamp: Mapped[datetime.datetime] = mapped_column(DateTime, default=datetime.datetime.now)
     spam: Mapped[bool] = mapped_column(Boolean, default=False)
+    text_hash: Mapped[str | None] = mapped_column(String(64), nullable=True, default=_default_text_hash)
 
     def __init__(
         self,
@@ -239,3 +287,18 @@ class Message(Base):
     def is_spam(self) -> bool:
         """Check if message is marked as spam"""
         return self.spam
+
+
+class ScheduledDeletion(Base):
+    __tablename__ = "scheduled_deletions"
+    __table_args__ = (Index("ix_scheduled_deletions_chat_id_message_id", "chat_id", "message_id"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    chat_id: Mapped[int] = mapped_column(BigInteger)
+    message_id: Mapped[int] = mapped_column(BigInteger)
+    delete_at: Mapped[datetime.datetime] = mapped_column(DateTime)
+
+    def __init__(self, chat_id: int, message_id: int, delete_at: datetime.datetime) -> None:
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.delete_at = delete_at
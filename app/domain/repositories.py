@@ -1,6 +1,7 @@
 """Repository interfaces (ports) for the domain layer."""
 
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import Any
 
 from app.domain.entities import (
@@ -8,6 +9,7 @@ from app.domain.entities import (
     ChatEntity,
     ChatLinkEntity,
     MessageEntity,
+    ScheduledDeletionEntity,
     UserEntity,
 )
 
@@ -25,11 +27,38 @@ class IUserRepository(ABC):
         """Save user."""
         pass
 
+    @abstractmethod
+    async def upsert_profile(
+        self, user_id: int, username: str | None, first_name: str | None, last_name: str | None
+    ) -> None:
+        """Insert user or update profile fields if they changed."""
+        pass
+
     @abstractmethod
     async def get_blocked_users(self) -> list[UserEntity]:
         """Get all blocked users."""
         pass
 
+    @abstractmethod
+    async def count_blocked_users(self, query: str = "") -> int:
+        """Count blocked users, optionally only those matching ``query``."""
+        pass
+
+    @abstractmethod
+    async def get_blocked_users_page(
+        self, limit: int, cursor: tuple[datetime, int] | None = None, backward: bool = False, query: str = ""
+    ) -> list[UserEntity]:
+        """Get blocked users ordered by ``(created_at, id)`` after (or before) ``cursor``.
+
+        A non-empty ``query`` keeps users whose username, first or last name contains it.
+        """
+        pass
+
+    @abstractmethod
+    async def get_blocked_user_ids(self) -> set[int]:
+        """Get IDs of all blocked users."""
+        pass
+
     @abstractmethod
     async def find_blocked_user(self, identifier: str) -> UserEntity | None:
         """Find blocked user by username (without @) or user_id."""
@@ -107,6 +136,11 @@ class IMessageRepository(ABC):
         """Get messages by user."""
         pass
 
+    @abstractmethod
+    async def get_user_message_ids(self, user_id: int) -> dict[int, list[int]]:
+        """Get IDs of the user's messages grouped by chat."""
+        pass
+
     @abstractmethod
     async def get_spam_messages(self, limit: int | None = None) -> list[MessageEntity]:
         """Get spam messages."""
@@ -124,16 +158,31 @@ class IMessageRepository(ABC):
         """Add message (legacy method)."""
         pass
 
+    @abstractmethod
+    async def add_messages(self, messages: list[dict[str, Any]]) -> None:
+        """Insert a batch of message rows."""
+        pass
+
     @abstractmethod
     async def is_first_message(self, chat_id: int, user_id: int) -> bool:
         """Check if this is the user's first message in chat."""
         pass
 
+    @abstractmethod
+    async def label_spam(self, chat_id: int, message_id: int) -> None:
+        """Mark a message as spam."""
+        pass
+
     @abstractmethod
     async def is_similar_spam_message(self, message: str) -> bool:
         """Check if similar spam message exists."""
         pass
 
+    @abstractmethod
+    async def has_spam_with_hash(self, message_hash: str | None) -> bool:
+        """Check if a spam message with this normalized text hash exists."""
+        pass
+
 
 class IChatLinkRepository(ABC):
     """Chat link repository interface."""
@@ -152,3 +201,22 @@ class IChatLinkRepository(ABC):
     async def delete(self, link_id: int) -> None:
         """Delete chat link."""
         pass
+
+
+class IScheduledDeletionRepository(ABC):
+    """Scheduled message deletion repository interface."""
+
+    @abstractmethod
+    async def add_many(self, deletions: list[ScheduledDeletionEntity]) -> None:
+        """Persist scheduled deletions."""
+        pass
+
+    @abstractmethod
+    async def get_all(self) -> list[ScheduledDeletionEntity]:
+        """Get all pending deletions."""
+        pass
+
+    @abstractmethod
+    async def remove(self, chat_id: int, message_ids: list[int]) -> None:
+        """Remove deletions that have been carried out."""
+        pass
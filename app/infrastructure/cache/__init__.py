@@ -0,0 +1,20 @@
+"""Cache backends shared by the process-wide caches."""
+
+from app.core.config import CacheSettings, settings
+
+from .base import Cache as Cache
+from .base import CacheBackend as CacheBackend
+from .base import CacheStats as CacheStats
+from .memory import MemoryCacheBackend as MemoryCacheBackend
+from .redis_backend import RedisCacheBackend as RedisCacheBackend
+
+
+def create_cache_backend(cache_settings: CacheSettings) -> CacheBackend:
+    """Backend selected by ``CACHE_BACKEND``."""
+    if cache_settings.backend == "redis":
+        return RedisCacheBackend.from_url(cache_settings.redis_url)
+    return MemoryCacheBackend(maxsize=cache_settings.memory_size)
+
+
+# Global backend shared by the process-wide caches
+cache_backend = create_cache_backend(settings.cache)
@@ -0,0 +1,89 @@
+"""Cache backend interface and namespaced view."""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters of a cache namespace."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CacheBackend(ABC):
+    """Key-value store for JSON-serializable values with optional expiry.
+
+    Keys are full strings; :class:`Cache` builds them from a namespace.
+    ``ttl`` is in seconds, ``None`` keeps the value until it is evicted.
+    """
+
+    @abstractmethod
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Get the values stored under ``keys``; missing and expired keys are left out."""
+
+    @abstractmethod
+    async def set_many(self, items: Mapping[str, Any], ttl: float | None = None) -> None:
+        """Store all ``items``."""
+
+    @abstractmethod
+    async def delete_many(self, keys: list[str]) -> None:
+        """Remove ``keys``."""
+
+    async def close(self) -> None:  # noqa: B027
+        """Release connections held by the backend."""
+
+
+class Cache:
+    """Namespaced view of a backend with its own default TTL and stats.
+
+    Keys are stored as ``<prefix>:<namespace>:<key>``, so caches of different
+    kinds, and bots sharing one Redis, never collide.
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str, ttl: float | None = None, prefix: str = "") -> None:
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._key_prefix = f"{prefix}:{namespace}:" if prefix else f"{namespace}:"
+
+    def key(self, key: object) -> str:
+        """Full backend key for ``key``."""
+        return f"{self._key_prefix}{key}"
+
+    async def get(self, key: object) -> Any | None:
+        """Get a cached value, or ``None`` on a miss."""
+        return (await self.get_many([key])).get(key)
+
+    async def get_many(self, keys: Iterable[object]) -> dict[Any, Any]:
+        """Get cached values keyed by the given keys; misses are left out."""
+        keys = list(keys)
+        found = await self.backend.get_many([self.key(key) for key in keys])
+        values = {key: found[self.key(key)] for key in keys if self.key(key) in found}
+        self.stats.hits += len(values)
+        self.stats.misses += len(keys) - len(values)
+        return values
+
+    async def set(self, key: object, value: Any, ttl: float | None = None) -> None:
+        """Cache a value for ``ttl`` seconds, or the namespace default."""
+        await self.set_many({key: value}, ttl)
+
+    async def set_many(self, items: Mapping[Any, Any], ttl: float | None = None) -> None:
+        """Cache several values with the same TTL."""
+        if items:
+            await self.backend.set_many({self.key(key): value for key, value in items.items()}, ttl or self.ttl)
+
+    async def delete(self, *keys: object) -> None:
+        """Drop cached values."""
+        if keys:
+            await self.backend.delete_many([self.key(key) for key in keys])
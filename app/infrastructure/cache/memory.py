@@ -0,0 +1,51 @@
+"""In-process LRU cache backend."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any
+
+from app.infrastructure.cache.base import CacheBackend
+
+
+class MemoryCacheBackend(CacheBackend):
+    """LRU dictionary with per-entry expiry, private to the process.
+
+    Values are kept as given, without serializing, so callers must not mutate
+    them. Once ``maxsize`` entries are stored the least recently used is evicted.
+    """
+
+    def __init__(self, maxsize: int = 100_000) -> None:
+        self.maxsize = maxsize
+        # key -> (monotonic expiry time or None, value)
+        self._entries: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        now = time.monotonic()
+        found = {}
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= now:
+                del self._entries[key]
+                continue
+            self._entries.move_to_end(key)
+            found[key] = value
+        return found
+
+    async def set_many(self, items: Mapping[str, Any], ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        for key, value in items.items():
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def delete_many(self, keys: list[str]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
@@ -0,0 +1,73 @@
+"""Cache backend speaking the Redis protocol."""
+
+import json
+from collections.abc import Mapping
+from typing import Any, Protocol
+
+from app.infrastructure.cache.base import CacheBackend
+
+
+class RedisPipeline(Protocol):
+    """The part of ``redis.asyncio.client.Pipeline`` the backend uses."""
+
+    async def __aenter__(self) -> "RedisPipeline": ...
+
+    async def __aexit__(self, *args: object) -> None: ...
+
+    def set(self, name: str, value: str, px: int | None = None) -> Any: ...
+
+    async def execute(self) -> list[Any]: ...
+
+
+class RedisClient(Protocol):
+    """The part of ``redis.asyncio.Redis`` the backend uses."""
+
+    async def mget(self, keys: list[str]) -> list[bytes | str | None]: ...
+
+    def pipeline(self, transaction: bool = True) -> RedisPipeline: ...
+
+    async def delete(self, *names: str) -> int: ...
+
+    async def aclose(self) -> None: ...
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache shared by every bot replica through Redis or a compatible server.
+
+    Values are stored as JSON, so tuples and sets come back as lists. Bulk
+    reads are one ``MGET``; bulk writes are one pipelined round trip.
+    """
+
+    def __init__(self, client: RedisClient) -> None:
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        """Connect lazily to the server at ``url``; needs the ``redis`` extra."""
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise RuntimeError(
+                "CACHE_BACKEND=redis requires the redis package: pip install 'moderator-bot[redis]'"
+            ) from e
+        return cls(Redis.from_url(url))
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        if not keys:
+            return {}
+        values = await self.client.mget(keys)
+        return {key: json.loads(value) for key, value in zip(keys, values, strict=True) if value is not None}
+
+    async def set_many(self, items: Mapping[str, Any], ttl: float | None = None) -> None:
+        px = max(1, int(ttl * 1000)) if ttl is not None else None
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, json.dumps(value, separators=(",", ":")), px=px)
+            await pipe.execute()
+
+    async def delete_many(self, keys: list[str]) -> None:
+        if keys:
+            await self.client.delete(*keys)
+
+    async def close(self) -> None:
+        await self.client.aclose()
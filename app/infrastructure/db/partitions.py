@@ -0,0 +1,161 @@
+"""Monthly range partitions of the ``messages`` table.
+
+On PostgreSQL ``messages`` is partitioned by ``RANGE (timestamp)`` with one
+partition per calendar month plus a default partition. Other databases keep a
+plain table, where expiring falls back to deleting old rows.
+"""
+
+import datetime
+import re
+
+from sqlalchemy import TableClause, and_, column, delete, exists, insert, or_, select, table
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+
+from app.core.logging import get_logger
+from app.domain.models import Message
+
+logger = get_logger("partitions")
+
+PARENT_TABLE = "messages"
+DEFAULT_PARTITION = "messages_default"
+_PARTITION_NAME = re.compile(r"^messages_y(\d{4})m(\d{2})$")
+
+
+def month_start(value: datetime.date) -> datetime.date:
+    """First day of the month containing ``value``."""
+    return datetime.date(value.year, value.month, 1)
+
+
+def add_months(month: datetime.date, count: int) -> datetime.date:
+    """First day of the month ``count`` months after ``month``."""
+    index = month.year * 12 + month.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime.date) -> str:
+    return f"messages_y{month.year:04d}m{month.month:02d}"
+
+
+def archive_name(month: datetime.date) -> str:
+    return f"messages_archive_y{month.year:04d}m{month.month:02d}"
+
+
+def create_partition_sql(month: datetime.date) -> str:
+    """DDL creating the partition for ``month`` if it does not exist yet."""
+    month = month_start(month)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def partition_table(name: str) -> TableClause:
+    """The ``messages`` columns under the name of one of its partitions."""
+    return table(name, *(column(message_column.name) for message_column in Message.__table__.columns))
+
+
+class MessagePartitions:
+    """Creates upcoming and expires old partitions of ``messages``."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    @property
+    def is_partitioned(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    async def months(self) -> list[datetime.date]:
+        """Months that currently have an attached partition, oldest first."""
+        if not self.is_partitioned:
+            return []
+        result = await self.db.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.relname = :parent"
+            ),
+            {"parent": PARENT_TABLE},
+        )
+        months = []
+        for name in result.scalars():
+            match = _PARTITION_NAME.match(name)
+            if match:
+                months.append(datetime.date(int(match[1]), int(match[2]), 1))
+        return sorted(months)
+
+    async def ensure_months(self, first: datetime.date, count: int) -> None:
+        """Create partitions for ``count`` months starting at ``first``.
+
+        Rows of a month that already landed in the default partition, e.g. after
+        downtime longer than the months created ahead, are moved into the new
+        partition. A month that still cannot be created is logged and skipped.
+        """
+        if not self.is_partitioned:
+            return
+        existing = set(await self.months())
+        for offset in range(count):
+            month = add_months(month_start(first), offset)
+            if month in existing:
+                continue
+            try:
+                await self._create_partition(month)
+                await self.db.commit()
+            except SQLAlchemyError as e:
+                await self.db.rollback()
+                logger.error("Failed to create message partition", partition=partition_name(month), error=str(e))
+
+    async def _create_partition(self, month: datetime.date) -> None:
+        default = partition_table(DEFAULT_PARTITION)
+        in_month = and_(
+            default.c.timestamp >= datetime.datetime.combine(month, datetime.time()),
+            default.c.timestamp < datetime.datetime.combine(add_months(month, 1), datetime.time()),
+        )
+        if not await self.db.scalar(select(exists().where(in_month))):
+            await self.db.execute(text(create_partition_sql(month)))
+            return
+
+        # Creating the partition would fail the default partition's implicit
+        # constraint, so detach it, move the month's rows over and re-attach it
+        await self.db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+        await self.db.execute(text(create_partition_sql(month)))
+        target = partition_table(partition_name(month))
+        await self.db.execute(insert(target).from_select(list(default.c.keys()), select(default).where(in_month)))
+        await self.db.execute(delete(default).where(in_month))
+        await self.db.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+        logger.info("Moved messages out of the default partition", partition=partition_name(month))
+
+    async def expire_before(self, cutoff: datetime.datetime, archive: bool = False) -> list[str]:
+        """Remove messages older than ``cutoff``.
+
+        Whole monthly partitions that end on or before ``cutoff`` are detached
+        and dropped, or kept as ``messages_archive_*`` tables with ``archive``.
+        A partially expired month is left for a later run. Old rows and rows
+        without a timestamp in the default partition are deleted, since no
+        partition ever takes them over. Without partitioning the old rows are
+        deleted instead. Returns the names of removed partitions.
+        """
+        if not self.is_partitioned:
+            await self.db.execute(delete(Message).where(Message.timestamp < cutoff))
+            await self.db.commit()
+            return []
+
+        expired = []
+        for month in await self.months():
+            if datetime.datetime.combine(add_months(month, 1), datetime.time()) > cutoff:
+                break
+            name = partition_name(month)
+            await self.db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+            if archive:
+                await self.db.execute(text(f"ALTER TABLE {name} RENAME TO {archive_name(month)}"))
+            else:
+                await self.db.execute(text(f"DROP TABLE {name}"))
+            await self.db.commit()
+            expired.append(name)
+
+        default = partition_table(DEFAULT_PARTITION)
+        await self.db.execute(delete(default).where(or_(default.c.timestamp < cutoff, default.c.timestamp.is_(None))))
+        await self.db.commit()
+        return expired
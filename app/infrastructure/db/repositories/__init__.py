@@ -6,5 +6,7 @@ from .chat_link import ChatLinkRepository as ChatLinkRepository
 from .chat_link import get_chat_link_repository as get_chat_link_repository
 from .message import MessageRepository as MessageRepository
 from .message import get_message_repository as get_message_repository
+from .scheduled_deletion import ScheduledDeletionRepository as ScheduledDeletionRepository
+from .scheduled_deletion import get_scheduled_deletion_repository as get_scheduled_deletion_repository
 from .user import UserRepository as UserRepository
 from .user import get_user_repository as get_user_repository
@@ -1,9 +1,11 @@
+from typing import Any
+
 from sqlalchemy import delete, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.expression import and_
 
 from app.domain.entities import MessageEntity
-from app.domain.models import Message
+from app.domain.models import Message, text_hash
 from app.domain.repositories import IMessageRepository
 
 
@@ -27,6 +29,7 @@ class MessageRepository(IMessageRepository):
         if existing:
             # Update existing
             existing.message = message.content
+            existing.text_hash = text_hash(message.content)
             existing.message_info = message.metadata or {}
             existing.spam = message.is_spam
         else:
@@ -65,6 +68,13 @@ class MessageRepository(IMessageRepository):
         )
         await self.db.commit()
 
+    async def add_messages(self, messages: list[dict[str, Any]]) -> None:
+        """Insert a batch of message rows in a single statement."""
+        if not messages:
+            return
+        await self.db.execute(insert(Message), messages)
+        await self.db.commit()
+
     async def label_spam(self, chat_id: int, message_id: int) -> None:
         query = (
             update(Message).where(and_(Message.chat_id == chat_id, Message.message_id == message_id)).values(spam=True)
@@ -82,6 +92,19 @@ class MessageRepository(IMessageRepository):
         messages = result.scalars().all()
         return [self._model_to_entity(msg) for msg in messages]
 
+    async def get_user_message_ids(self, user_id: int) -> dict[int, list[int]]:
+        """Get IDs of the user's messages grouped by chat, without loading message bodies."""
+        result = await self.db.execute(
+            select(Message.chat_id, Message.message_id)
+            .where(Message.user_id == user_id)
+            .distinct()
+            .order_by(Message.chat_id, Message.message_id)
+        )
+        message_ids: dict[int, list[int]] = {}
+        for chat_id, message_id in result.all():
+            message_ids.setdefault(chat_id, []).append(message_id)
+        return message_ids
+
     async def get_spam_messages(self, limit: int | None = None) -> list[MessageEntity]:
         """Get spam messages."""
         query = select(Message).where(Message.spam)
@@ -134,10 +157,15 @@ class MessageRepository(IMessageRepository):
         return count is not None and count > 0
 
     async def is_similar_spam_message(self, message: str) -> bool:
-        query = select(func.count()).where(Message.message == message, Message.spam)
+        return await self.has_spam_with_hash(text_hash(message))
+
+    async def has_spam_with_hash(self, message_hash: str | None) -> bool:
+        """Check if any spam message has this normalized text hash."""
+        if message_hash is None:
+            return False
+        query = select(Message.id).where(Message.text_hash == message_hash, Message.spam).limit(1)
         result = await self.db.execute(query)
-        count = result.scalar()
-        return count is not None and count > 0
+        return result.scalar() is not None
 
 
 def get_message_repository(db: AsyncSession) -> IMessageRepository:
@@ -0,0 +1,43 @@
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities import ScheduledDeletionEntity
+from app.domain.models import ScheduledDeletion
+from app.domain.repositories import IScheduledDeletionRepository
+
+
+class ScheduledDeletionRepository(IScheduledDeletionRepository):
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add_many(self, deletions: list[ScheduledDeletionEntity]) -> None:
+        """Persist scheduled deletions in a single statement."""
+        if not deletions:
+            return
+        rows = [
+            {"chat_id": item.chat_id, "message_id": item.message_id, "delete_at": item.delete_at} for item in deletions
+        ]
+        await self.db.execute(insert(ScheduledDeletion), rows)
+        await self.db.commit()
+
+    async def get_all(self) -> list[ScheduledDeletionEntity]:
+        """Get all pending deletions."""
+        result = await self.db.execute(select(ScheduledDeletion))
+        return [self._model_to_entity(model) for model in result.scalars().all()]
+
+    async def remove(self, chat_id: int, message_ids: list[int]) -> None:
+        """Remove deletions that have been carried out."""
+        await self.db.execute(
+            delete(ScheduledDeletion).where(
+                ScheduledDeletion.chat_id == chat_id, ScheduledDeletion.message_id.in_(message_ids)
+            )
+        )
+        await self.db.commit()
+
+    def _model_to_entity(self, model: ScheduledDeletion) -> ScheduledDeletionEntity:
+        """Convert database model to domain entity."""
+        return ScheduledDeletionEntity(delete_at=model.delete_at, chat_id=model.chat_id, message_id=model.message_id)
+
+
+def get_scheduled_deletion_repository(db: AsyncSession) -> IScheduledDeletionRepository:
+    return ScheduledDeletionRepository(db)
@@ -1,4 +1,7 @@
-from sqlalchemy import insert, select, update
+import datetime
+
+from sqlalchemy import ColumnElement, func, insert, or_, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities import UserEntity
@@ -45,11 +48,87 @@ class UserRepository(IUserRepository):
         await self.db.refresh(user_model)
         return self._model_to_entity(user_model)
 
+    async def upsert_profile(
+        self,
+        user_id: int,
+        username: str | None,
+        first_name: str | None,
+        last_name: str | None,
+    ) -> None:
+        """Insert user or update profile fields, writing only when they changed.
+
+        Existing ``verify``/``blocked`` flags are never touched.
+        """
+        dialect_insert = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        stmt = dialect_insert(User).values(
+            id=user_id,
+            username=username,
+            first_name=first_name,
+            last_name=last_name,
+            verify=False,
+            blocked=False,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[User.id],
+            set_={
+                "username": stmt.excluded.username,
+                "first_name": stmt.excluded.first_name,
+                "last_name": stmt.excluded.last_name,
+                "modified_at": datetime.datetime.now(),
+            },
+            where=or_(
+                User.username.is_distinct_from(stmt.excluded.username),
+                User.first_name.is_distinct_from(stmt.excluded.first_name),
+                User.last_name.is_distinct_from(stmt.excluded.last_name),
+            ),
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
+
     async def get_blocked_users(self) -> list[UserEntity]:
         result = await self.db.execute(select(User).filter(User.blocked))
         user_models = result.scalars().all()
         return [self._model_to_entity(user_model) for user_model in user_models]
 
+    async def count_blocked_users(self, query: str = "") -> int:
+        stmt = select(func.count()).select_from(User).filter(User.blocked)
+        if query:
+            stmt = stmt.filter(self._matches(query))
+        result = await self.db.execute(stmt)
+        return result.scalar_one()
+
+    async def get_blocked_users_page(
+        self,
+        limit: int,
+        cursor: tuple[datetime.datetime, int] | None = None,
+        backward: bool = False,
+        query: str = "",
+    ) -> list[UserEntity]:
+        """Get one page of blocked users by keyset on ``(created_at, id)``.
+
+        ``cursor`` is the key of the last row of the previous page, or of the
+        first row of the next page when paging ``backward``. A non-empty
+        ``query`` is matched as a substring of username, first or last name.
+        """
+        key = tuple_(User.created_at, User.id)
+        stmt = select(User).filter(User.blocked)
+        if query:
+            stmt = stmt.filter(self._matches(query))
+        if cursor is not None:
+            stmt = stmt.filter(key < tuple_(*cursor) if backward else key > tuple_(*cursor))
+        if backward:
+            stmt = stmt.order_by(User.created_at.desc(), User.id.desc())
+        else:
+            stmt = stmt.order_by(User.created_at, User.id)
+
+        result = await self.db.execute(stmt.limit(limit))
+        users = [self._model_to_entity(user_model) for user_model in result.scalars().all()]
+        return users[::-1] if backward else users
+
+    async def get_blocked_user_ids(self) -> set[int]:
+        result = await self.db.execute(select(User.id).filter(User.blocked))
+        return set(result.scalars().all())
+
     async def find_blocked_user(self, identifier: str) -> UserEntity | None:
         """Find blocked user by username (without @) or user_id."""
         # Remove @ prefix if present
@@ -67,6 +146,20 @@ class UserRepository(IUserRepository):
         user_model = result.scalars().first()
         return self._model_to_entity(user_model) if user_model else None
 
+    @staticmethod
+    def _matches(query: str) -> ColumnElement[bool]:
+        """Case-insensitive substring match on the user's names.
+
+        On Postgres each ILIKE is served by a trigram GIN index; SQLite scans.
+        """
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"%{escaped}%"
+        return or_(
+            User.username.ilike(pattern, escape="\\"),
+            User.first_name.ilike(pattern, escape="\\"),
+            User.last_name.ilike(pattern, escape="\\"),
+        )
+
     async def _get_user_model(self, user_id: int) -> User | None:
         result = await self.db.execute(select(User).filter(User.id == user_id))
         return result.scalars().first()
@@ -1,10 +1,18 @@
+import time
 from pathlib import Path
+from typing import Any
 
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExceptionContext
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 from sqlalchemy.sql import text
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import db_pool_wait_seconds, db_queries, db_query_seconds
+from app.core.query_budget import record_commit, record_statement
+from app.core.tracing import is_tracing, record_span
 
 logger = get_logger("database")
 
@@ -13,14 +21,74 @@ engine: AsyncEngine | None = None
 sessionmaker: async_sessionmaker[AsyncSession] | None = None
 
 
+# Characters of a SQL statement kept in a trace span
+SPAN_STATEMENT_LENGTH = 300
+
+# Statement kinds reported as metric labels; anything else counts as OTHER
+STATEMENT_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "BEGIN", "COMMIT", "ROLLBACK"})
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Connection pool recording how long checkouts wait for a connection."""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait_seconds.observe(time.perf_counter() - start)
+
+
+def statement_operation(statement: str) -> str:
+    """Metric label for a SQL statement: its leading keyword."""
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in STATEMENT_OPERATIONS else "OTHER"
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Record the count and duration of statements executed through ``engine``.
+
+    Inside a traced update every statement also becomes a span, and inside a
+    query count statements and commits are added to the update's count.
+    """
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn: Connection, *_: Any) -> None:
+        record_statement()
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def commit(_conn: Connection) -> None:
+        record_commit()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn: Connection, _cursor: Any, statement: str, *_: Any) -> None:
+        end = time.perf_counter()
+        start = conn.info["query_start"].pop()
+        operation = statement_operation(statement)
+        db_queries.inc(operation=operation)
+        db_query_seconds.observe(end - start, operation=operation)
+        # Most updates are not traced; skip normalizing the statement for them
+        if is_tracing():
+            record_span(f"sql:{operation}", start, end, " ".join(statement.split())[:SPAN_STATEMENT_LENGTH])
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(context: ExceptionContext) -> None:
+        if context.connection is not None and context.connection.info.get("query_start"):
+            context.connection.info["query_start"].pop()
+
+
 def create_engine() -> AsyncEngine:
     """Create database engine."""
-    return create_async_engine(
+    async_engine = create_async_engine(
         settings.database.url,
         echo=settings.debug,
+        poolclass=TimedQueuePool,
         pool_pre_ping=True,
         pool_recycle=3600,  # Recycle connections after 1 hour
     )
+    instrument_engine(async_engine)
+    return async_engine
 
 
 def create_session_maker() -> async_sessionmaker[AsyncSession]:
@@ -42,6 +110,37 @@ def create_session_maker() -> async_sessionmaker[AsyncSession]:
     return sessionmaker
 
 
+class LazySession:
+    """Stands in for an ``AsyncSession`` that is only created on first use.
+
+    Attribute access is forwarded to the real session, so repositories and
+    services can take a ``LazySession`` wherever they expect an ``AsyncSession``.
+    """
+
+    def __init__(self, session_pool: async_sessionmaker[AsyncSession]) -> None:
+        self._session_pool = session_pool
+        self._session: AsyncSession | None = None
+
+    @property
+    def is_opened(self) -> bool:
+        """Check if the underlying session has been created.
+
+        Not ``is_active``, which is forwarded and asks whether a transaction is in progress.
+        """
+        return self._session is not None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._session_pool()
+        return getattr(self._session, name)
+
+    async def close(self) -> None:
+        """Close the underlying session, returning its connection to the pool."""
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+
+
 async def close_db() -> None:
     """Close database connections."""
     global engine
@@ -0,0 +1,36 @@
+"""Custom column types."""
+
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine.interfaces import Dialect
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+
+class JSONDocument(TypeDecorator[Any]):
+    """JSON column (JSONB on PostgreSQL) that also accepts pre-serialized JSON text.
+
+    A ``str`` bound to the column is taken as an already encoded document and
+    written as is, so hot paths can serialize once with pydantic instead of
+    building a dict for the driver to encode again. Reads return parsed JSON.
+    """
+
+    impl = JSON
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect: Dialect) -> TypeEngine[Any]:
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(JSON())
+
+    def bind_processor(self, dialect: Dialect) -> Callable[[Any], Any] | None:
+        serialize = super().bind_processor(dialect)
+
+        def process(value: Any) -> Any:
+            if isinstance(value, str) or serialize is None:
+                return value
+            return serialize(value)
+
+        return process
@@ -0,0 +1,150 @@
+"""Rate-limited scheduling of outbound Telegram Bot API calls."""
+
+import asyncio
+import functools
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger("api_scheduler")
+
+T = TypeVar("T")
+
+# Per-chat buckets idle for this long are forgotten
+IDLE_BUCKET_SECONDS = 600.0
+MAX_IDLE_BUCKETS = 10000
+
+# deleteMessages accepts at most 100 message IDs per call
+DELETE_BATCH_SIZE = 100
+
+
+class RateBucket:
+    """Token bucket expressed as a schedule (GCRA).
+
+    ``capacity`` calls may go out back to back; after that calls are spaced
+    ``1 / rate`` seconds apart. Reserving is synchronous, so reservations made
+    from concurrent tasks are served in the order they were made.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.interval = 1.0 / rate
+        self.tolerance = (capacity - 1) * self.interval
+        self._tat = 0.0  # theoretical arrival time of the next call
+
+    def earliest(self, now: float) -> float:
+        """Earliest time a call may be sent."""
+        return max(now, self._tat - self.tolerance)
+
+    def reserve(self, at: float) -> None:
+        """Consume a token for a call sent at ``at``."""
+        self._tat = max(self._tat, at) + self.interval
+
+    def pause_until(self, until: float) -> None:
+        """Block the bucket until ``until``, e.g. after a 429."""
+        self._tat = max(self._tat, until + self.tolerance)
+
+    def is_idle(self, now: float) -> bool:
+        return self._tat + IDLE_BUCKET_SECONDS < now
+
+
+class ApiScheduler:
+    """Paces Bot API calls with a global bucket plus one bucket per chat.
+
+    Callers await :meth:`call` and get the API result back. A call rejected with
+    ``retry_after`` is re-queued after the requested delay (which also pauses its
+    chat, or every chat for calls without one) up to ``max_retries`` times.
+    """
+
+    def __init__(
+        self,
+        global_per_second: float = 30,
+        group_per_minute: float = 20,
+        private_per_second: float = 1,
+        max_retries: int = 3,
+    ) -> None:
+        self.group_per_minute = group_per_minute
+        self.private_per_second = private_per_second
+        self.max_retries = max_retries
+        self.retries = 0
+        self._global = RateBucket(global_per_second, capacity=global_per_second)
+        self._chats: dict[int, RateBucket] = {}
+
+    async def call(self, chat_id: int | None, request: Callable[[], Awaitable[T]]) -> T:
+        """Send ``request()`` once the rate limits allow it and return its result.
+
+        ``request`` is a factory because a re-queued call needs a fresh coroutine.
+        """
+        not_before = 0.0
+        attempt = 0
+        while True:
+            await self._wait_for_slot(chat_id, not_before)
+            try:
+                return await request()
+            except TelegramRetryAfter as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                self.retries += 1
+                not_before = time.monotonic() + e.retry_after
+                bucket = self._chat_bucket(chat_id) if chat_id is not None else self._global
+                bucket.pause_until(not_before)
+                logger.warning("Telegram flood control, re-queuing call", chat_id=chat_id, retry_after=e.retry_after)
+
+    async def delete_messages(self, bot: Bot, chat_id: int, message_ids: list[int]) -> int:
+        """Delete messages in one chat with ``deleteMessages`` in chunks of 100.
+
+        A failed chunk is logged and skipped. Returns the number of IDs in chunks
+        Telegram accepted.
+        """
+        deleted = 0
+        for start in range(0, len(message_ids), DELETE_BATCH_SIZE):
+            batch = message_ids[start : start + DELETE_BATCH_SIZE]
+            try:
+                await self.call(chat_id, functools.partial(bot.delete_messages, chat_id, batch))
+            except Exception as e:
+                # Already deleted, too old or no rights left
+                logger.warning("Failed to delete messages", chat_id=chat_id, count=len(batch), error=str(e))
+            else:
+                deleted += len(batch)
+        return deleted
+
+    async def _wait_for_slot(self, chat_id: int | None, not_before: float) -> None:
+        now = time.monotonic()
+        at = max(now, not_before, self._global.earliest(now))
+        chat_bucket = self._chat_bucket(chat_id) if chat_id is not None else None
+        if chat_bucket is not None:
+            at = max(at, chat_bucket.earliest(now))
+            chat_bucket.reserve(at)
+        self._global.reserve(at)
+        if at > now:
+            await asyncio.sleep(at - now)
+
+    def _chat_bucket(self, chat_id: int) -> RateBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) >= MAX_IDLE_BUCKETS:
+                self._forget_idle(time.monotonic())
+            if chat_id > 0:
+                bucket = RateBucket(self.private_per_second, capacity=1)
+            else:
+                bucket = RateBucket(self.group_per_minute / 60, capacity=self.group_per_minute)
+            self._chats[chat_id] = bucket
+        return bucket
+
+    def _forget_idle(self, now: float) -> None:
+        self._chats = {chat_id: bucket for chat_id, bucket in self._chats.items() if not bucket.is_idle(now)}
+
+
+# Global scheduler instance
+api_scheduler = ApiScheduler(
+    global_per_second=settings.rate_limit.global_per_second,
+    group_per_minute=settings.rate_limit.group_per_minute,
+    private_per_second=settings.rate_limit.private_per_second,
+    max_retries=settings.rate_limit.max_retries,
+)
@@ -0,0 +1,212 @@
+"""Recording of incoming updates as rotated, gzip-compressed JSONL.
+
+Each line is ``{"received_at": <unix time>, "update": <Bot API update>}``, so
+a replay can reproduce the original pacing.
+"""
+
+import datetime
+import gzip
+import hashlib
+import hmac
+import json
+import queue
+import secrets
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from app.core.config import CaptureSettings
+from app.core.logging import get_logger
+from app.core.metrics import capture_updates_dropped
+
+logger = get_logger("capture")
+
+SUFFIX = ".jsonl.gz"
+
+# Supergroup and channel IDs are -100 followed by 10 digits; pseudonyms keep that shape
+CHANNEL_ID_OFFSET = 10**12
+CHANNEL_ID_DIGITS = 10**10
+# Objects with these keys are users or chats, whose IDs and names are pseudonymized
+USER_KEYS = frozenset({"is_bot"})
+CHAT_KEYS = frozenset({"type"})
+NAME_FIELDS = ("username", "first_name", "last_name", "title")
+
+
+def capture_path(path: Path, shard_index: int) -> Path:
+    """Capture file of one shard next to ``path``."""
+    return path.with_name(f"{path.name.removesuffix(SUFFIX)}.shard{shard_index}{SUFFIX}")
+
+
+class Anonymizer:
+    """Replaces user and chat IDs with stable pseudonyms, and names with placeholders.
+
+    The same ID always maps to the same pseudonym under one key, so replays keep
+    who wrote where. IDs in ``keep``, e.g. the super admins, are left as they are.
+    Message text is kept.
+    """
+
+    def __init__(self, key: bytes, keep: Iterable[int] = ()) -> None:
+        self.key = key
+        self.keep = frozenset(keep)
+
+    def pseudonym(self, value: int) -> int:
+        """Pseudonym of a user or chat ID with the same sign and kind."""
+        if value in self.keep:
+            return value
+        digest = hmac.new(self.key, str(value).encode(), hashlib.sha256).digest()
+        number = int.from_bytes(digest[:8], "big")
+        if value > 0:
+            return 1 + number % 10**10
+        if value <= -CHANNEL_ID_OFFSET:
+            return -(CHANNEL_ID_OFFSET + number % CHANNEL_ID_DIGITS)
+        return -(1 + number % 10**9)
+
+    def update(self, data: Any) -> Any:
+        """Anonymized copy of a Bot API object."""
+        if isinstance(data, list):
+            return [self.update(item) for item in data]
+        if not isinstance(data, dict):
+            return data
+        result = {key: self.update(value) for key, value in data.items()}
+        if isinstance(result.get("id"), int) and (USER_KEYS | CHAT_KEYS) & result.keys():
+            result["id"] = self.pseudonym(result["id"])
+            for name in NAME_FIELDS:
+                if name in result:
+                    result[name] = f"{name}{result['id']}"
+        for key in ("user_id", "chat_id"):
+            if isinstance(result.get(key), int):
+                result[key] = self.pseudonym(result[key])
+        return result
+
+
+class CaptureWriter:
+    """Appends updates to ``path``, rotating it after ``max_bytes`` uncompressed bytes.
+
+    Rotated files get a timestamp in their name, and only the newest
+    ``backup_count`` are kept. A file left by a previous run is rotated on open.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = 100 * 1024 * 1024,
+        backup_count: int = 10,
+        anonymizer: Anonymizer | None = None,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.anonymizer = anonymizer
+        self.written = 0
+        self._file: gzip.GzipFile | None = None
+        self._size = 0
+
+    @classmethod
+    def from_settings(cls, capture_settings: CaptureSettings, keep: Iterable[int] = ()) -> "CaptureWriter":
+        """Writer configured by ``CaptureSettings``."""
+        anonymizer = None
+        if capture_settings.anonymize:
+            key = capture_settings.anonymize_key.encode() or secrets.token_bytes(32)
+            anonymizer = Anonymizer(key, keep)
+        return cls(capture_settings.path, capture_settings.max_bytes, capture_settings.backup_count, anonymizer)
+
+    def write(self, update: dict[str, Any], received_at: float | None = None) -> None:
+        """Append one update, as dumped with ``by_alias=True``."""
+        if self.anonymizer is not None:
+            update = self.anonymizer.update(update)
+        line = json.dumps(
+            {"received_at": received_at if received_at is not None else time.time(), "update": update},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode()
+        if self._file is None:
+            self._open()
+        elif self._size + len(line) > self.max_bytes:
+            self.rotate()
+            self._open()
+        assert self._file is not None
+        self._file.write(line + b"\n")
+        self._size += len(line) + 1
+        self.written += 1
+
+    def rotate(self) -> None:
+        """Close the current file and move it aside, dropping the oldest backups."""
+        self.close()
+        if not self.path.exists():
+            return
+        stem = self.path.name.removesuffix(SUFFIX)
+        # Names sort in rotation order, which pruning and replays rely on
+        stamp = datetime.datetime.now(datetime.UTC)
+        target = self.path.with_name(f"{stem}-{stamp:%Y%m%dT%H%M%S%f}{SUFFIX}")
+        while target.exists():
+            stamp += datetime.timedelta(microseconds=1)
+            target = self.path.with_name(f"{stem}-{stamp:%Y%m%dT%H%M%S%f}{SUFFIX}")
+        self.path.rename(target)
+        backups = sorted(self.path.parent.glob(f"{stem}-*{SUFFIX}"))
+        for old in backups[: max(len(backups) - self.backup_count, 0)]:
+            old.unlink()
+
+    def close(self) -> None:
+        """Flush and close the current file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            self.rotate()
+        # Kept open across writes; low compression keeps the cost on the update path small
+        self._file = gzip.open(self.path, "wb", compresslevel=1)  # noqa: SIM115
+        self._size = 0
+        logger.info("Capturing updates", path=str(self.path), anonymized=self.anonymizer is not None)
+
+
+class CaptureQueue:
+    """Hands updates to a :class:`CaptureWriter` on a background thread.
+
+    ``put`` only puts the update on a bounded queue, dropping it when the queue
+    is full instead of blocking the caller; anonymizing, encoding, compression
+    and rotation run on the thread. ``close`` writes the queued updates first.
+    """
+
+    def __init__(self, writer: CaptureWriter, queue_size: int = 10000) -> None:
+        self.writer = writer
+        self._queue: queue.Queue[tuple[dict[str, Any], float] | None] = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="update-capture", daemon=True)
+        self._thread.start()
+
+    def put(self, update: dict[str, Any], received_at: float | None = None) -> None:
+        """Queue one update, as dumped with ``by_alias=True``."""
+        try:
+            self._queue.put_nowait((update, received_at if received_at is not None else time.time()))
+        except queue.Full:
+            capture_updates_dropped.inc()
+
+    def close(self) -> None:
+        """Write the queued updates, stop the thread and close the file; safe to call twice."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self.writer.close()
+
+    def _run(self) -> None:
+        while (item := self._queue.get()) is not None:
+            update, received_at = item
+            try:
+                self.writer.write(update, received_at)
+            except Exception as e:
+                logger.error("Failed to capture update", update_id=update.get("update_id"), error=str(e))
+
+
+def read_capture(paths: Iterable[Path]) -> Iterator[tuple[float, dict[str, Any]]]:
+    """Receive times and updates of capture files, gzip-compressed or plain, in file order."""
+    for path in paths:
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    entry = json.loads(line)
+                    yield entry["received_at"], entry["update"]
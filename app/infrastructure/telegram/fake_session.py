@@ -0,0 +1,85 @@
+"""Bot session answering API calls locally, for replays without Telegram."""
+
+import asyncio
+import datetime
+import itertools
+from collections import Counter
+from collections.abc import AsyncGenerator, Iterable
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import GetChatAdministrators, GetChatMember, GetMe, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import Chat, ChatMemberMember, ChatMemberOwner, Message, MessageId, User
+
+
+class FakeTelegramSession(BaseSession):
+    """Answers every Bot API method with a plausible result after ``latency`` seconds.
+
+    Sent messages get increasing IDs, every chat is administered by ``admin_ids``
+    and any other method succeeds. Calls are counted per method in ``requests``.
+    """
+
+    def __init__(self, latency: float = 0.0, admin_ids: Iterable[int] = ()) -> None:
+        super().__init__()
+        self.latency = latency
+        self.admin_ids = tuple(admin_ids)
+        self.requests: Counter[str] = Counter()
+        self._message_ids = itertools.count(1)
+
+    async def make_request(
+        self,
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+        timeout: int | None = None,  # noqa: ARG002
+    ) -> Any:
+        self.requests[method.__api_method__] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        result = self.respond(bot, method)
+        return result.as_(bot) if hasattr(result, "as_") else result
+
+    def respond(self, bot: Bot, method: TelegramMethod[Any]) -> Any:
+        """Result of ``method`` as Telegram would roughly return it."""
+        if isinstance(method, GetMe):
+            return User(id=bot.id, is_bot=True, first_name="Replay", username="replay_bot")
+        if isinstance(method, GetChatAdministrators):
+            return [
+                ChatMemberOwner(user=User(id=admin_id, is_bot=False, first_name="Admin"), is_anonymous=False)
+                for admin_id in self.admin_ids
+            ]
+        if isinstance(method, GetChatMember):
+            return ChatMemberMember(user=User(id=method.user_id, is_bot=False, first_name="Member"))
+        returning = method.__returning__
+        if returning is Message:
+            chat_id = getattr(method, "chat_id", 0)
+            return Message(
+                message_id=next(self._message_ids),
+                date=datetime.datetime.now(datetime.UTC),
+                chat=Chat(id=chat_id if isinstance(chat_id, int) else 0, type="supergroup"),
+                from_user=User(id=bot.id, is_bot=True, first_name="Replay"),
+                text=getattr(method, "text", None),
+            )
+        if returning is MessageId:
+            return MessageId(message_id=next(self._message_ids))
+        if returning is bool:
+            return True
+        if returning is int:
+            return 0
+        return None
+
+    async def stream_content(
+        self,
+        url: str,
+        headers: dict[str, Any] | None = None,  # noqa: ARG002
+        timeout: int = 30,  # noqa: ARG002
+        chunk_size: int = 65536,  # noqa: ARG002
+        raise_for_status: bool = True,  # noqa: ARG002
+    ) -> AsyncGenerator[bytes, None]:
+        raise NotImplementedError(f"Files cannot be downloaded in a replay: {url}")
+        # Never reached; the yield makes this an async generator like BaseSession.stream_content
+        yield b""  # type: ignore[unreachable]
+
+    async def close(self) -> None:
+        pass
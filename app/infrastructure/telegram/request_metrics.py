@@ -0,0 +1,35 @@
+"""Latency metrics and trace spans of outbound Bot API requests."""
+
+import time
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from app.core.metrics import telegram_api_errors, telegram_api_seconds
+from app.core.tracing import span
+
+
+class RequestMetricsMiddleware(BaseRequestMiddleware):
+    """Bot session middleware recording request latency and failures per API method.
+
+    Inside a traced update each request is also a span.
+    """
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        name = method.__api_method__
+        start = time.perf_counter()
+        try:
+            with span(f"api:{name}"):
+                return await make_request(bot, method)
+        except Exception:
+            telegram_api_errors.inc(method=name)
+            raise
+        finally:
+            telegram_api_seconds.observe(time.perf_counter() - start, method=name)
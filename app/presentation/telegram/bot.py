@@ -1,34 +1,127 @@
 import asyncio
+import multiprocessing
+import os
+import secrets
+import signal
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.utils.callback_answer import CallbackAnswerMiddleware
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.application.services import admin_roles as admin_roles_service
+from app.application.services import blacklist_index as blacklist_index_service
+from app.application.services.cache_invalidation import InvalidationQueue, invalidation_bus
+from app.application.services.chat_admins import chat_admin_cache
+from app.application.services.chat_registry import chat_registry
+from app.application.services.deletion_scheduler import deletion_scheduler
+from app.application.services.message_ingestion import MessageIngestor
+from app.application.services.message_retention import run_retention_loop
 from app.core.config import settings
 from app.core.container import setup_container
 from app.core.logging import get_logger, setup_logging
+from app.infrastructure.cache import cache_backend
+from app.infrastructure.db.repositories import get_chat_repository
 from app.infrastructure.db.session import close_db, create_session_maker, insert_chat_link
+from app.infrastructure.telegram.capture import CaptureQueue, CaptureWriter, capture_path
+from app.infrastructure.telegram.request_metrics import RequestMetricsMiddleware
 from app.presentation.telegram.handlers import router
+from app.presentation.telegram.metrics_server import serve_metrics
 from app.presentation.telegram.middlewares import (
     BlacklistMiddleware,
+    CaptureMiddleware,
     DependenciesMiddleware,
     HistoryMiddleware,
     ManagedChatsMiddleware,
+    QueryBudgetMiddleware,
+    TimedMiddleware,
+    TracingMiddleware,
+    guard_handler_budgets,
+    instrument_handlers,
 )
+from app.presentation.telegram.sharding import Shard, ShardWorker, UpdateQueue, UpdateRouter, poll_updates
+from app.presentation.telegram.webhook import run_webhook, run_webhook_ingress
 
 # Setup logging
 setup_logging()
 logger = get_logger("bot")
 
+# Long-running background jobs started on startup and cancelled on shutdown
+background_tasks: set[asyncio.Task[None]] = set()
 
-async def on_startup(bot: Bot) -> None:
-    """Bot startup handler."""
-    try:
+# Seconds a worker process gets to finish its updates after the ingress stops
+WORKER_SHUTDOWN_TIMEOUT = 30
+
+
+def get_allowed_updates(dp: Dispatcher) -> list[str]:
+    """Update types to request from Telegram."""
+    # Admin changes arrive as chat_member updates, which Telegram only sends when requested
+    return sorted({*dp.resolve_used_update_types(), "chat_member", "my_chat_member"})
+
+
+async def configure_update_source(bot: Bot, dispatcher: Dispatcher) -> None:
+    """Register the webhook with Telegram, or remove it for polling."""
+    if settings.telegram.use_webhook and settings.telegram.webhook_url:
+        await bot.set_webhook(
+            settings.telegram.webhook_url,
+            secret_token=settings.telegram.webhook_secret,
+            allowed_updates=get_allowed_updates(dispatcher),
+            max_connections=settings.telegram.webhook_max_connections,
+            drop_pending_updates=True,
+        )
+        logger.info("Webhook set", url=settings.telegram.webhook_url)
+    else:
         await bot.delete_webhook()
         logger.info("Webhook deleted")
 
-        await insert_chat_link()
-        logger.info("Chat links initialized")
+
+async def on_startup(bot: Bot, dispatcher: Dispatcher, shard: Shard | None = None) -> None:
+    """Bot startup handler.
+
+    A sharded worker leaves the update source and chat links to the ingress
+    process, restores only its own chats' deletions, and only the first worker
+    runs message retention.
+    """
+    try:
+        if shard is None:
+            await configure_update_source(bot, dispatcher)
+            await insert_chat_link()
+            logger.info("Chat links initialized")
+
+        async with create_session_maker()() as session:
+            await chat_registry.load(get_chat_repository(session))
+
+        await deletion_scheduler.start(bot, create_session_maker(), shard.owns_chat if shard else None)
+
+        background_tasks.add(
+            asyncio.create_task(
+                blacklist_index_service.run_reconcile_loop(
+                    blacklist_index_service.blacklist_index,
+                    create_session_maker(),
+                    settings.cache.blacklist_reconcile_interval,
+                )
+            )
+        )
+        logger.info("Blacklist index reconcile started")
+
+        background_tasks.add(
+            asyncio.create_task(
+                admin_roles_service.run_reconcile_loop(
+                    admin_roles_service.admin_roles,
+                    create_session_maker(),
+                    settings.cache.admin_roles_reconcile_interval,
+                )
+            )
+        )
+        logger.info("Admin roles reconcile started")
+
+        if shard is None or shard.index == 0:
+            background_tasks.add(asyncio.create_task(run_retention_loop(create_session_maker(), settings.history)))
+            logger.info("Message retention started", retention_days=settings.history.retention_days)
+
+        if settings.metrics.enabled:
+            port = settings.metrics.port + (shard.index if shard else 0)
+            background_tasks.add(asyncio.create_task(serve_metrics(settings.metrics.host, port)))
 
         logger.info("Bot startup completed")
     except Exception as e:
@@ -36,12 +129,49 @@ async def on_startup(bot: Bot) -> None:
         raise
 
 
-async def on_shutdown(bot: Bot) -> None:
+async def on_shutdown(
+    bot: Bot,
+    message_ingestor: MessageIngestor,
+    shard: Shard | None = None,
+    update_capture: CaptureQueue | None = None,
+) -> None:
     """Bot shutdown handler."""
     try:
-        await bot.delete_webhook()
-        await bot.close()
+        await message_ingestor.stop()
+        if update_capture is not None:
+            update_capture.close()
+            logger.info(
+                "Update capture closed", path=str(update_capture.writer.path), written=update_capture.writer.written
+            )
+
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        background_tasks.clear()
+
+        await deletion_scheduler.stop()
+
+        # Other webhook instances may still be serving behind the load balancer,
+        # and sharded workers leave the update source to the ingress process
+        if shard is None and not settings.telegram.use_webhook:
+            await bot.delete_webhook()
+            await bot.close()
         await close_db()
+        logger.info(
+            "Chat admin cache stats",
+            hits=chat_admin_cache.hits,
+            misses=chat_admin_cache.misses,
+            hit_ratio=round(chat_admin_cache.hit_ratio, 3),
+        )
+        if chat_admin_cache.shared is not None:
+            shared_stats = chat_admin_cache.shared.stats
+            logger.info(
+                "Shared chat admin cache stats",
+                hits=shared_stats.hits,
+                misses=shared_stats.misses,
+                hit_ratio=round(shared_stats.hit_ratio, 3),
+            )
+        await cache_backend.close()
         logger.info("Bot shutdown completed")
     except Exception as e:
         logger.error("Shutdown error", error=str(e), exc_info=True)
@@ -50,10 +180,54 @@ async def on_shutdown(bot: Bot) -> None:
 async def get_bot_and_dp() -> tuple[Bot, Dispatcher]:
     """Create bot and dispatcher instances."""
     bot = Bot(token=settings.telegram.token, default=DefaultBotProperties(parse_mode="HTML"))
+    bot.session.middleware(RequestMetricsMiddleware())
     dp = Dispatcher()
     return bot, dp
 
 
+def setup_dispatcher(
+    dp: Dispatcher, bot: Bot, session_maker: async_sessionmaker[AsyncSession], shard: Shard | None = None
+) -> None:
+    """Attach the message ingestor, middlewares, handlers and lifecycle events."""
+    # Buffer message history and write it in batches off the update path
+    message_ingestor = MessageIngestor(
+        session_maker,
+        buffer_size=settings.history.buffer_size,
+        batch_size=settings.history.batch_size,
+        flush_interval=settings.history.flush_interval,
+    )
+    message_ingestor.start()
+    dp["message_ingestor"] = message_ingestor
+
+    # Setup middlewares
+    if settings.tracing.enabled:
+        dp.update.middleware(TracingMiddleware(settings.tracing.slow_update_threshold))
+    if settings.query_budget.enabled:
+        dp.update.middleware(QueryBudgetMiddleware(enforce=settings.query_budget.enforce))
+    if settings.capture.enabled:
+        capture_writer = CaptureWriter.from_settings(settings.capture, keep=settings.admin.super_admins)
+        if shard is not None:
+            # Every worker writes its own capture file
+            capture_writer.path = capture_path(capture_writer.path, shard.index)
+        update_capture = CaptureQueue(capture_writer, settings.capture.queue_size)
+        dp["update_capture"] = update_capture
+        dp.update.middleware(CaptureMiddleware(update_capture))
+    dp.update.middleware(TimedMiddleware(DependenciesMiddleware(session_pool=session_maker, bot=bot)))
+    dp.update.middleware(TimedMiddleware(ManagedChatsMiddleware()))
+    dp.update.middleware(TimedMiddleware(HistoryMiddleware(message_ingestor)))
+    dp.message.middleware(TimedMiddleware(BlacklistMiddleware()))
+    dp.callback_query.middleware(CallbackAnswerMiddleware())
+    # Innermost, so handler timings exclude the middlewares above
+    instrument_handlers(dp)
+    if settings.query_budget.enabled:
+        guard_handler_budgets(dp, enforce=settings.query_budget.enforce)
+
+    # Register handlers and lifecycle events
+    dp.include_router(router)
+    dp.startup.register(on_startup)
+    dp.shutdown.register(on_shutdown)
+
+
 async def main() -> None:
     """Main bot entry point."""
     logger.info("Starting bot", environment=settings.environment)
@@ -67,21 +241,15 @@ async def main() -> None:
     # Setup dependency injection
     setup_container(session_maker, bot)
 
-    # Setup middlewares
-    dp.update.middleware(DependenciesMiddleware(session_pool=session_maker, bot=bot))
-    dp.update.middleware(ManagedChatsMiddleware())
-    dp.update.middleware(HistoryMiddleware())
-    dp.message.middleware(BlacklistMiddleware())
-    dp.callback_query.middleware(CallbackAnswerMiddleware())
-
     try:
-        # Register handlers and lifecycle events
-        dp.include_router(router)
-        dp.startup.register(on_startup)
-        dp.shutdown.register(on_shutdown)
+        setup_dispatcher(dp, bot, session_maker)
 
-        logger.info("Bot configured, starting polling")
-        await dp.start_polling(bot, skip_updates=True)
+        if settings.telegram.use_webhook:
+            logger.info("Bot configured, starting webhook server")
+            await run_webhook(dp, bot)
+        else:
+            logger.info("Bot configured, starting polling")
+            await dp.start_polling(bot, skip_updates=True, allowed_updates=get_allowed_updates(dp))
 
     except Exception as e:
         logger.error("Bot error", error=str(e), exc_info=True)
@@ -92,10 +260,100 @@ async def main() -> None:
         logger.info("Bot session closed")
 
 
+async def run_ingress(update_router: UpdateRouter) -> None:
+    """Receive updates and route them to the worker processes."""
+    bot, dp = await get_bot_and_dp()
+    # Only used to resolve the update types the handlers need
+    dp.include_router(router)
+    try:
+        await configure_update_source(bot, dp)
+        await insert_chat_link()
+        if settings.telegram.use_webhook:
+            logger.info("Starting sharded webhook ingress", workers=len(update_router.queues))
+            await run_webhook_ingress(update_router)
+        else:
+            logger.info("Starting sharded polling ingress", workers=len(update_router.queues))
+            await poll_updates(bot, update_router, get_allowed_updates(dp))
+    finally:
+        await bot.session.close()
+        await close_db()
+
+
+async def run_shard(
+    shard: Shard, updates: UpdateQueue, inbox: InvalidationQueue, peers: list[InvalidationQueue]
+) -> None:
+    """Handle one shard of the updates with the regular dispatcher."""
+    session_maker = create_session_maker()
+    bot, dp = await get_bot_and_dp()
+    setup_container(session_maker, bot)
+    setup_dispatcher(dp, bot, session_maker, shard)
+    dp["shard"] = shard
+
+    invalidation_bus.connect(peers)
+    listener = asyncio.create_task(invalidation_bus.listen(inbox))
+    workflow_data = {"dispatcher": dp, **dp.workflow_data}
+    await dp.emit_startup(bot=bot, **workflow_data)
+    logger.info("Worker started", shard=shard.index, workers=shard.count)
+    try:
+        await ShardWorker(dp, bot).run(updates)
+    finally:
+        await dp.emit_shutdown(bot=bot, **workflow_data)
+        inbox.put(None)
+        await listener
+        await bot.session.close()
+
+
+def run_worker(shard: Shard, updates: UpdateQueue, inbox: InvalidationQueue, peers: list[InvalidationQueue]) -> None:
+    """Worker process entry point."""
+    # Ctrl+C reaches the whole process group; workers stop once the ingress closes their queue
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(run_shard(shard, updates, inbox, peers))
+
+
+def run_sharded(workers: int) -> None:
+    """Run the ingress in this process and ``workers`` worker processes.
+
+    Updates are sharded by chat; every worker has an inbox for cache changes
+    published by the others.
+    """
+    capture = settings.capture
+    if capture.enabled and capture.anonymize and not capture.anonymize_key:
+        # Workers load their settings from the environment; one shared key gives
+        # a user the same pseudonym in every shard's capture
+        os.environ["CAPTURE_ANONYMIZE_KEY"] = secrets.token_hex(32)
+    context = multiprocessing.get_context("spawn")
+    update_queues = [context.Queue() for _ in range(workers)]
+    inboxes = [context.Queue() for _ in range(workers)]
+    processes = [
+        context.Process(
+            target=run_worker,
+            args=(Shard(index, workers), update_queues[index], inboxes[index], inboxes[:index] + inboxes[index + 1 :]),
+            name=f"bot-worker-{index}",
+        )
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    update_router = UpdateRouter(update_queues)
+    try:
+        asyncio.run(run_ingress(update_router))
+    finally:
+        update_router.close()
+        for process in processes:
+            process.join(WORKER_SHUTDOWN_TIMEOUT)
+            if process.is_alive():
+                logger.warning("Worker did not stop in time", worker=process.name)
+                process.terminate()
+
+
 def run_bot() -> None:
     """Run the bot."""
     try:
-        asyncio.run(main())
+        if settings.telegram.workers > 1:
+            run_sharded(settings.telegram.workers)
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
     except Exception as e:
@@ -1,6 +1,8 @@
 from aiogram import Router, types
 from aiogram.filters import Command
 
+from app.application.services.admin_roles import admin_roles
+from app.application.services.cache_invalidation import ADMIN_ROLES, invalidation_bus
 from app.infrastructure.db.repositories import AdminRepository
 from app.presentation.telegram.utils import other
 
@@ -15,6 +17,8 @@ async def new_admin(message: types.Message, admin_repo: AdminRepository) -> None
     target_user = message.reply_to_message.from_user
     if not await admin_repo.is_admin(target_user.id):
         await admin_repo.insert_admin(target_user.id)
+        await admin_roles.reconcile(admin_repo)
+        invalidation_bus.publish(ADMIN_ROLES)
         await message.answer(f"Админ {await other.get_user_mention(target_user)} добавлен ✅")
     else:
         await message.answer(f"Админ {await other.get_user_mention(target_user)} уже есть в базе.")
@@ -29,6 +33,8 @@ async def delete_admin(message: types.Message, admin_repo: AdminRepository) -> N
     target_user = message.reply_to_message.from_user
     if await admin_repo.is_admin(target_user.id):
         await admin_repo.delete_admin(target_user.id)
+        await admin_roles.reconcile(admin_repo)
+        invalidation_bus.publish(ADMIN_ROLES)
         await message.answer(f"Админ {await other.get_user_mention(target_user)} удален ❌")
     else:
         await message.answer(f"Админ {await other.get_user_mention(target_user)} не является админом.")
@@ -1,3 +1,5 @@
+import html
+
 from aiogram import Bot, Router, types
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.filters import Command
@@ -7,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.application.services import moderation as moderation_services
 from app.application.services import spam as spam_service
 from app.application.services.user_service import UserService
+from app.core.query_budget import query_budget
 from app.infrastructure.db.repositories import (
     ChatRepository,
     MessageRepository,
@@ -18,10 +21,14 @@ from app.presentation.telegram.utils.blacklist import (
     build_blacklist_text,
     build_user_details_keyboard,
     build_user_details_text,
+    clip_search_query,
+    decode_cursor,
 )
 
 moderation_router = Router()
 
+BLACKLIST_PAGE_SIZE = 10
+
 
 def reply_required_error(action: str) -> str:
     """Standard error when a command should be a reply."""
@@ -63,7 +70,7 @@ async def mute_user(message: types.Message, bot: Bot) -> None:
     except Exception:
         answer = await message.answer(f"Мне не удалось распознать время мута!\n\n{mute_guide}")
         await message.delete()
-        await other.sleep_and_delete(answer, 10)
+        other.delete_later(answer, 10)
         return
 
     # Set permissions to mute the user
@@ -139,7 +146,7 @@ async def ban_user(message: types.Message, bot: Bot) -> None:
         await message.answer(f"Пользователь {mention} забанен")
     except Exception as err:
         error_msg = await message.answer(f"Что-то пошло не так:\n\n{err}")
-        await other.sleep_and_delete(error_msg, 10)
+        other.delete_later(error_msg, 10)
 
     await message.delete()
 
@@ -160,12 +167,13 @@ async def unban_user(message: types.Message, bot: Bot) -> None:
         await message.answer(f"Пользователь {mention} разбанен")
     except Exception as err:
         error_msg = await message.answer(f"Что-то пошло не так:\n\n{err}")
-        await other.sleep_and_delete(error_msg, 10)
+        other.delete_later(error_msg, 10)
 
     await message.delete()
 
 
 @moderation_router.message(Command("black", prefix="!/"))
+@query_budget(statements=4)
 async def full_ban(message: types.Message, message_repo: MessageRepository, db: AsyncSession) -> None:
     if not message.reply_to_message:
         await message.answer(reply_required_error("добавить в черный список"))
@@ -208,11 +216,12 @@ async def full_ban(message: types.Message, message_repo: MessageRepository, db:
 
 
 @moderation_router.message(Command("spam", prefix="!/"))
+@query_budget(statements=4)
 async def label_spam(message: types.Message, message_repo: MessageRepository, db: AsyncSession) -> None:
     if not message.reply_to_message:
         answer = await message.answer(reply_required_error("пометить как спам"))
         await message.delete()
-        await other.sleep_and_delete(answer, 10)
+        other.delete_later(answer, 10)
         return
 
     target = message.reply_to_message
@@ -289,8 +298,11 @@ async def process_blacklist_confirm(
         await bot.ban_chat_member(callback.message.chat.id, user_id)
         member = await bot.get_chat_member(callback.message.chat.id, user_id)
         mention = await other.get_user_mention(member.user)
-        await moderation_services.add_to_blacklist(db, bot, user_id, revoke_messages=revoke)
-        await callback.message.edit_text(f"{mention} добавлен в черный список.")
+        deleted = await moderation_services.add_to_blacklist(db, bot, user_id, revoke_messages=revoke)
+        text = f"{mention} добавлен в черный список."
+        if revoke:
+            text += f"\nУдалено сообщений: {sum(deleted.values())} (чатов: {len(deleted)})"
+        await callback.message.edit_text(text)
     except Exception as err:
         if callback.message and isinstance(callback.message, types.Message):
             await callback.message.edit_text(f"Произошла ошибка:\n\n{err}")
@@ -307,6 +319,7 @@ async def process_blacklist_cancel(callback: types.CallbackQuery) -> None:
 
 
 @moderation_router.message(Command("blacklist", prefix="!/"))
+@query_budget(statements=3)
 async def show_blacklist(message: types.Message, user_service: UserService) -> None:
     """Show blacklist with pagination or search for specific user."""
     command_args = message.text.split()[1:] if message.text else []
@@ -316,15 +329,24 @@ async def show_blacklist(message: types.Message, user_service: UserService) -> N
         identifier = command_args[0]
         user = await user_service.find_blocked_user(identifier)
 
-        if not user:
-            await message.answer(f"User <code>{identifier}</code> not found in blacklist")
+        if user:
+            # Show individual user details
+            text = build_user_details_text(user)
+            keyboard = build_user_details_keyboard(user)
+
+            await message.answer(text, reply_markup=keyboard.as_markup())
             await message.delete()
             return
 
-        # Show individual user details
-        text = build_user_details_text(user)
-        keyboard = build_user_details_keyboard(user)
+        # No exact match: search names and usernames
+        query = clip_search_query(" ".join(command_args).lstrip("@"))
+        rendered = await _render_blacklist_page(user_service, page=0, query=query) if query else None
+        if not rendered:
+            await message.answer(f"User <code>{html.escape(identifier)}</code> not found in blacklist")
+            await message.delete()
+            return
 
+        text, keyboard = rendered
         await message.answer(text, reply_markup=keyboard.as_markup())
         await message.delete()
         return
@@ -337,27 +359,45 @@ async def _show_blacklist_page(
     message: types.Message, user_service: UserService, page: int = 0, query: str = ""
 ) -> None:
     """Display blacklist page with pagination."""
-    blocked_users = await user_service.get_blocked_users()
+    rendered = await _render_blacklist_page(user_service, page, query=query)
 
-    if not blocked_users:
+    if not rendered:
         await message.answer("Blacklist is empty")
         await message.delete()
         return
 
-    page_size = 10
-    total_pages = (len(blocked_users) + page_size - 1) // page_size
+    text, keyboard = rendered
+    await message.answer(text, reply_markup=keyboard.as_markup())
+    await message.delete()
+
+
+async def _render_blacklist_page(
+    user_service: UserService, page: int, cursor: str = "", backward: bool = False, query: str = ""
+) -> tuple[str, InlineKeyboardBuilder] | None:
+    """Build text and keyboard for one blacklist page, ``None`` if nothing is blacklisted or matches ``query``."""
+    total_count = await user_service.count_blocked_users(query)
+    if not total_count:
+        return None
+
+    total_pages = (total_count + BLACKLIST_PAGE_SIZE - 1) // BLACKLIST_PAGE_SIZE
+    key = decode_cursor(cursor)
+    users = await user_service.get_blocked_users_page(BLACKLIST_PAGE_SIZE, key, backward, query=query)
+    if key is None or not users or (backward and len(users) < BLACKLIST_PAGE_SIZE):
+        # No cursor, or the list changed under it: start from the first page
+        if key is not None:
+            users = await user_service.get_blocked_users_page(BLACKLIST_PAGE_SIZE, query=query)
+        page = 0
 
     # Ensure page is within bounds
     page = max(0, min(page, total_pages - 1))
 
-    text = build_blacklist_text(len(blocked_users), page, total_pages, page_size, query)
-    keyboard = build_blacklist_keyboard(blocked_users, page, total_pages, page_size, query)
-
-    await message.answer(text, reply_markup=keyboard.as_markup())
-    await message.delete()
+    text = build_blacklist_text(total_count, page, total_pages, BLACKLIST_PAGE_SIZE, query)
+    keyboard = build_blacklist_keyboard(users, page, total_pages, BLACKLIST_PAGE_SIZE, query)
+    return text, keyboard
 
 
 @moderation_router.callback_query(BlacklistPagination.filter())
+@query_budget(statements=3)
 async def handle_blacklist_pagination(
     callback: types.CallbackQuery,
     callback_data: BlacklistPagination,
@@ -369,16 +409,18 @@ async def handle_blacklist_pagination(
     if not callback.message:
         return
 
-    blocked_users = await user_service.get_blocked_users()
-    page_size = 10
-    total_pages = (len(blocked_users) + page_size - 1) // page_size
-
-    # Ensure page is within bounds
-    page = max(0, min(callback_data.page, total_pages - 1))
-
-    text = build_blacklist_text(len(blocked_users), page, total_pages, page_size, callback_data.query)
-    keyboard = build_blacklist_keyboard(blocked_users, page, total_pages, page_size, callback_data.query)
+    rendered = await _render_blacklist_page(
+        user_service,
+        callback_data.page,
+        cursor=callback_data.cursor,
+        backward=bool(callback_data.backward),
+        query=callback_data.query,
+    )
+    if not rendered:
+        await callback.message.answer("Nothing found" if callback_data.query else "Blacklist is empty")
+        return
 
+    text, keyboard = rendered
     try:
         await callback.message.edit_text(text, reply_markup=keyboard.as_markup())
     except TelegramBadRequest:
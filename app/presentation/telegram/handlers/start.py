@@ -3,7 +3,7 @@ from aiogram.filters import Command
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.services import buttons as buttons_service
-from app.core.config import settings
+from app.application.services.admin_roles import admin_roles
 from app.infrastructure.db.repositories import AdminRepository
 from app.presentation.telegram.utils import other
 
@@ -22,8 +22,8 @@ async def start_private(message: types.Message, admin_repo: AdminRepository) ->
         "• /report - пожаловаться (нужно переслать сообщение)\n"
     )
 
-    is_admin = message.from_user.id in settings.admin.super_admins or await admin_repo.is_admin(message.from_user.id)
-    if is_admin:
+    await admin_roles.ensure_loaded(admin_repo)
+    if admin_roles.is_admin(message.from_user.id):
         text += (
             "\n\n<b>👮 Команды для админов:</b>\n"
             "• /mute - замутить пользователя\n"
@@ -46,7 +46,7 @@ async def start_private(message: types.Message, admin_repo: AdminRepository) ->
         reply_markup=builder.as_markup(),
     )
     await message.delete()
-    await other.sleep_and_delete(bot_message)
+    other.delete_later(bot_message)
 
 
 @router.message(Command("chats", prefix="/!"))
@@ -55,7 +55,7 @@ async def get_chats(message: types.Message, db: AsyncSession) -> None:
     builder = await buttons_service.get_chat_buttons(db)
     bot_message = await message.answer(text, reply_markup=builder.as_markup())
     await message.delete()
-    await other.sleep_and_delete(bot_message)
+    other.delete_later(bot_message)
 
 
 @router.message(Command("contacts", prefix="/!"))
@@ -63,4 +63,4 @@ async def get_contacts(message: types.Message) -> None:
     text = "📞 <b>Контакты:</b>\n\n• 📧 <b>Сотрудничество:</b> @czech_media_admin\n• 🧑🏿‍💻 <b>Dev:</b> @vsem_azamat"
     bot_message = await message.answer(text)
     await message.delete()
-    await other.sleep_and_delete(bot_message)
+    other.delete_later(bot_message)
@@ -2,6 +2,9 @@ import logging
 import logging.config
 from pathlib import Path
 
+from app.core.config import settings
+from app.core.logging import enqueue_handlers
+
 log_dir = "logs"
 log_file = Path(log_dir) / "bot.log"
 
@@ -47,5 +50,7 @@ LOGGING_CONFIG = {
 logging.config.dictConfig(LOGGING_CONFIG)
 
 logger = logging.getLogger("bot")
+# Middlewares and services log on the update path; write from a background thread
+enqueue_handlers(logger, settings.logging.queue_size)
 
 __all__ = ["logger"]
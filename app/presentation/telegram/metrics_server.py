@@ -0,0 +1,33 @@
+"""HTTP endpoint exposing metrics for Prometheus to scrape."""
+
+import asyncio
+
+from aiohttp import web
+
+from app.core.logging import get_logger
+from app.core.metrics import MetricsRegistry, metrics
+
+logger = get_logger("metrics_server")
+
+
+def build_metrics_app(registry: MetricsRegistry = metrics) -> web.Application:
+    """Build the aiohttp application serving ``GET /metrics``."""
+
+    async def handle(_request: web.Request) -> web.Response:
+        return web.Response(text=registry.render(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    return app
+
+
+async def serve_metrics(host: str, port: int, registry: MetricsRegistry = metrics) -> None:
+    """Serve the metrics endpoint until cancelled."""
+    runner = web.AppRunner(build_metrics_app(registry))
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host=host, port=port).start()
+        logger.info("Metrics server started", host=host, port=port)
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
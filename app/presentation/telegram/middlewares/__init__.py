@@ -1,11 +1,23 @@
 from .black_list import BlacklistMiddleware
+from .capture import CaptureMiddleware
 from .dependencies import DependenciesMiddleware
 from .history import HistoryMiddleware
 from .managed_chats import ManagedChatsMiddleware
+from .metrics import HandlerMetricsMiddleware, TimedMiddleware, instrument_handlers
+from .query_budget import HandlerQueryBudgetMiddleware, QueryBudgetMiddleware, guard_handler_budgets
+from .tracing import TracingMiddleware
 
 __all__ = [
     "DependenciesMiddleware",
     "BlacklistMiddleware",
     "ManagedChatsMiddleware",
     "HistoryMiddleware",
+    "HandlerMetricsMiddleware",
+    "TimedMiddleware",
+    "instrument_handlers",
+    "TracingMiddleware",
+    "QueryBudgetMiddleware",
+    "HandlerQueryBudgetMiddleware",
+    "guard_handler_budgets",
+    "CaptureMiddleware",
 ]
@@ -1,11 +1,12 @@
-import asyncio
 from collections.abc import Awaitable, Callable
 from typing import TYPE_CHECKING, Any
 
 from aiogram import BaseMiddleware, types
 from aiogram.types import TelegramObject
 
+from app.application.services.admin_roles import AdminRoleCache, admin_roles
 from app.core.config import settings
+from app.presentation.telegram.utils import other
 
 if TYPE_CHECKING:
     from app.infrastructure.db.repositories import AdminRepository
@@ -16,8 +17,7 @@ async def you_are_not_admin(event: TelegramObject, text: str = "🚫 You are not
     if isinstance(event, types.Message):
         answer = await event.answer(text)
         await event.delete()
-        await asyncio.sleep(5)
-        await answer.delete()
+        other.delete_later(answer, 5)
 
 
 class SuperAdminMiddleware(BaseMiddleware):
@@ -34,33 +34,24 @@ class SuperAdminMiddleware(BaseMiddleware):
 
 
 class AdminMiddleware(BaseMiddleware):
+    def __init__(self, roles: AdminRoleCache | None = None) -> None:
+        super().__init__()
+        self.roles = roles if roles is not None else admin_roles
+
     async def __call__(
         self,
         handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
         event: TelegramObject,
         data: dict[str, Any],
     ) -> Any:
-        admin_repo: AdminRepository = data["admin_repo"]
-        admins_id = [admin.id for admin in await admin_repo.get_db_admins()]
-        all_admins_id = admins_id + settings.admin.super_admins
-        if isinstance(event, types.Message) and event.from_user.id in all_admins_id:
+        if not self.roles.is_loaded:
+            admin_repo: AdminRepository = data["admin_repo"]
+            await self.roles.ensure_loaded(admin_repo)
+        if isinstance(event, types.Message) and self.roles.is_admin(event.from_user.id):
             return await handler(event, data)
         await you_are_not_admin(event)
         return None  # Stop further handler processing if not Admin
 
 
-class AnyAdminMiddleware(BaseMiddleware):
-    async def __call__(
-        self,
-        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
-        event: TelegramObject,
-        data: dict[str, Any],
-    ) -> Any:
-        admin_repo: AdminRepository = data["admin_repo"]
-        admins_id = [admin.id for admin in await admin_repo.get_db_admins()]
-        if isinstance(event, types.Message) and (
-            event.from_user.id in admins_id or event.from_user.id in settings.admin.super_admins
-        ):
-            return await handler(event, data)
-        await you_are_not_admin(event)
-        return None  # Stop further handler processing if not AnyAdmin
+class AnyAdminMiddleware(AdminMiddleware):
+    """Same check as ``AdminMiddleware``: any super admin or active database admin."""
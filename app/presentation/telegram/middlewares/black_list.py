@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Any
 from aiogram import BaseMiddleware, Bot, types
 from aiogram.types import TelegramObject
 
+from app.application.services.blacklist_index import BlacklistIndex, blacklist_index
 from app.presentation.telegram.logger import logger
 
 if TYPE_CHECKING:
@@ -11,8 +12,9 @@ if TYPE_CHECKING:
 
 
 class BlacklistMiddleware(BaseMiddleware):
-    def __init__(self) -> None:
+    def __init__(self, index: BlacklistIndex | None = None) -> None:
         super().__init__()
+        self.index = index if index is not None else blacklist_index
 
     async def __call__(
         self,
@@ -21,10 +23,10 @@ class BlacklistMiddleware(BaseMiddleware):
         data: dict[str, Any],
     ) -> Any:
         bot: Bot = data["bot"]
-        user_repo: UserRepository = data["user_repo"]
-        blacklisted_users = await user_repo.get_blocked_users()
-        blacklisted_ids = {user.id for user in blacklisted_users}
-        if isinstance(event, types.Message) and event.from_user.id in blacklisted_ids:
+        if not self.index.is_loaded:
+            user_repo: UserRepository = data["user_repo"]
+            await self.index.ensure_loaded(user_repo)
+        if isinstance(event, types.Message) and event.from_user.id in self.index:
             try:
                 await bot.ban_chat_member(event.chat.id, event.from_user.id)
                 await event.delete()
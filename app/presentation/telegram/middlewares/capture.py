@@ -0,0 +1,34 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware, types
+from aiogram.types import TelegramObject
+
+from app.infrastructure.telegram.capture import CaptureQueue
+from app.presentation.telegram.logger import logger
+
+
+class CaptureMiddleware(BaseMiddleware):
+    """Outer update middleware recording every incoming update for replay.
+
+    Registered before ``DependenciesMiddleware``, so updates are captured
+    whatever the middlewares below make of them. Updates are only queued here;
+    the capture file is written on the queue's thread.
+    """
+
+    def __init__(self, capture: CaptureQueue) -> None:
+        super().__init__()
+        self.capture = capture
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if isinstance(event, types.Update):
+            try:
+                self.capture.put(event.model_dump(mode="json", exclude_none=True, by_alias=True))
+            except Exception as err:
+                logger.error(f"Failed to capture update {event.update_id}: {err}")
+        return await handler(event, data)
@@ -1,5 +1,5 @@
 from collections.abc import Awaitable, Callable
-from typing import Any
+from typing import Any, cast
 
 from aiogram import BaseMiddleware, Bot
 from aiogram.types import TelegramObject
@@ -12,6 +12,7 @@ from app.infrastructure.db.repositories import (
     get_message_repository,
     get_user_repository,
 )
+from app.infrastructure.db.session import LazySession
 
 
 class DependenciesMiddleware(BaseMiddleware):
@@ -27,11 +28,15 @@ class DependenciesMiddleware(BaseMiddleware):
         data: dict[str, Any],
     ) -> Any:
         data["bot"] = self.bot
-        async with self.session_pool() as session:
-            data["db"] = session
-            data["admin_repo"] = get_admin_repository(session)
-            data["user_repo"] = get_user_repository(session)
-            data["chat_repo"] = get_chat_repository(session)
-            data["chat_link_repo"] = get_chat_link_repository(session)
-            data["message_repo"] = get_message_repository(session)
+        # Nothing touches the pool until a handler or repository runs a query
+        session = cast("AsyncSession", LazySession(self.session_pool))
+        data["db"] = session
+        data["admin_repo"] = get_admin_repository(session)
+        data["user_repo"] = get_user_repository(session)
+        data["chat_repo"] = get_chat_repository(session)
+        data["chat_link_repo"] = get_chat_link_repository(session)
+        data["message_repo"] = get_message_repository(session)
+        try:
             return await handler(event, data)
+        finally:
+            await session.close()
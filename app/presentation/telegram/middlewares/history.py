@@ -12,8 +12,14 @@ from app.presentation.telegram.utils import other
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
+    from app.application.services.message_ingestion import MessageIngestor
+
 
 class HistoryMiddleware(BaseMiddleware):
+    def __init__(self, ingestor: "MessageIngestor | None" = None) -> None:
+        super().__init__()
+        self.ingestor = ingestor
+
     async def __call__(
         self,
         handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
@@ -32,12 +38,16 @@ class HistoryMiddleware(BaseMiddleware):
                     logger.error(f"Error while saving user: {err}")
 
             try:
-                await history_service.save_message(db, message)
+                if self.ingestor is not None:
+                    await self.ingestor.submit(history_service.build_message_row(message))
+                else:
+                    await history_service.save_message(db, message)
             except Exception as err:
                 logger.error(f"Error while saving message: {err}")
 
-            if await spam_service.detect_spam(db, message):
+            # The message itself is history, so only the text check of detect_spam applies (the row may be buffered)
+            if await spam_service.is_known_spam(db, message):
                 answer = await event.message.answer("🚧 Is spam message?🤔")
-                await other.sleep_and_delete(answer, 15)
+                other.delete_later(answer, 15)
 
         return await handler(event, data)
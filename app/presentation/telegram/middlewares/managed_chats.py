@@ -5,6 +5,7 @@ from aiogram import BaseMiddleware, Bot, types
 from aiogram.types import TelegramObject
 
 from app.application.services import history as history_service
+from app.application.services.chat_admins import ChatAdminCache, chat_admin_cache
 from app.core.config import settings
 
 if TYPE_CHECKING:
@@ -12,8 +13,9 @@ if TYPE_CHECKING:
 
 
 class ManagedChatsMiddleware(BaseMiddleware):
-    def __init__(self) -> None:
+    def __init__(self, admin_cache: ChatAdminCache | None = None) -> None:
         super().__init__()
+        self.admin_cache = admin_cache if admin_cache is not None else chat_admin_cache
 
     async def __call__(
         self,
@@ -23,14 +25,18 @@ class ManagedChatsMiddleware(BaseMiddleware):
     ) -> Any:
         bot: Bot = data["bot"]
         db: AsyncSession = data["db"]
+        if isinstance(event, types.Update):
+            for member_update in (event.chat_member, event.my_chat_member):
+                if member_update is not None:
+                    self.admin_cache.handle_member_update(member_update)
+
         if (
             isinstance(event, types.Update)
             and isinstance(event.message, types.Message)
             and event.message.chat.type in ["group", "supergroup"]
         ):
             message = event.message
-            chat_admins = await bot.get_chat_administrators(message.chat.id)
-            chat_admins_id = {admin.user.id for admin in chat_admins}
+            chat_admins_id = await self.admin_cache.get_admin_ids(bot, message.chat.id)
             if any(super_admin in chat_admins_id for super_admin in settings.admin.super_admins):
                 await history_service.merge_chat(db, message.chat)
                 return await handler(event, data)
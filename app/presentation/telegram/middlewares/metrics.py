@@ -0,0 +1,69 @@
+import time
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+from aiogram import BaseMiddleware, Dispatcher
+from aiogram.types import TelegramObject
+
+from app.core.metrics import handler_seconds, middleware_seconds
+from app.core.tracing import span
+
+if TYPE_CHECKING:
+    from aiogram.dispatcher.event.handler import HandlerObject
+
+
+class TimedMiddleware(BaseMiddleware):
+    """Wraps a middleware and records its own time, without the handlers below it.
+
+    Inside a traced update the middleware is also a span enclosing the handlers below it.
+    """
+
+    def __init__(self, middleware: BaseMiddleware, name: str | None = None) -> None:
+        super().__init__()
+        self.middleware = middleware
+        self.name = name or type(middleware).__name__
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        downstream = 0.0
+
+        async def timed_handler(event: TelegramObject, data: dict[str, Any]) -> Any:
+            nonlocal downstream
+            start = time.perf_counter()
+            try:
+                return await handler(event, data)
+            finally:
+                downstream += time.perf_counter() - start
+
+        start = time.perf_counter()
+        try:
+            with span(f"middleware:{self.name}"):
+                return await self.middleware(timed_handler, event, data)
+        finally:
+            middleware_seconds.observe(time.perf_counter() - start - downstream, middleware=self.name)
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """Inner middleware recording how long each handler takes, and its trace span."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        handler_object: HandlerObject | None = data.get("handler")
+        name = getattr(handler_object.callback, "__qualname__", "unknown") if handler_object else "unknown"
+        with handler_seconds.time(event=type(event).__name__, handler=name), span(f"handler:{name}"):
+            return await handler(event, data)
+
+
+def instrument_handlers(dp: Dispatcher) -> None:
+    """Time the handlers of every event type; register after the other inner middlewares."""
+    for event_name, observer in dp.observers.items():
+        if event_name != "update":
+            observer.middleware(HandlerMetricsMiddleware())
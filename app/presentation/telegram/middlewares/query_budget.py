@@ -0,0 +1,97 @@
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+from aiogram import BaseMiddleware, Dispatcher, types
+from aiogram.types import TelegramObject
+
+from app.core.logging import get_logger
+from app.core.query_budget import QueryBudget, QueryBudgetExceededError, QueryCount, budget_of, count_queries
+
+if TYPE_CHECKING:
+    from aiogram.dispatcher.event.handler import HandlerObject
+
+logger = get_logger("query_budget")
+
+# What the middlewares may cost per update once caches are warm, e.g. for a plain
+# group message: a new user's profile upsert and commit plus the known-spam lookup
+PIPELINE_BUDGET = QueryBudget(statements=2, commits=1)
+
+
+def check_budget(name: str, count: QueryCount, budget: QueryBudget, enforce: bool, **context: Any) -> None:
+    """Log a warning, or raise if ``enforce``, when ``count`` goes over ``budget``."""
+    if not budget.exceeded_by(count):
+        return
+    if enforce:
+        raise QueryBudgetExceededError(name, count, budget)
+    logger.warning(
+        "Query budget exceeded",
+        name=name,
+        statements=count.statements,
+        commits=count.commits,
+        budget_statements=budget.statements,
+        budget_commits=budget.commits,
+        **context,
+    )
+
+
+class QueryBudgetMiddleware(BaseMiddleware):
+    """Outer update middleware counting the statements and commits of each update.
+
+    The middlewares' share is checked against ``budget``; handlers with a
+    declared budget are checked by :class:`HandlerQueryBudgetMiddleware`.
+    """
+
+    def __init__(self, budget: QueryBudget = PIPELINE_BUDGET, enforce: bool = False) -> None:
+        super().__init__()
+        self.budget = budget
+        self.enforce = enforce
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, types.Update):
+            return await handler(event, data)
+        with count_queries() as count:
+            data["query_count"] = count
+            result = await handler(event, data)
+        pipeline = count - count.handler if count.handler is not None else count
+        check_budget("middlewares", pipeline, self.budget, self.enforce, update_id=event.update_id)
+        return result
+
+
+class HandlerQueryBudgetMiddleware(BaseMiddleware):
+    """Inner middleware checking a handler against the budget declared with ``query_budget``."""
+
+    def __init__(self, enforce: bool = False) -> None:
+        super().__init__()
+        self.enforce = enforce
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        count: QueryCount | None = data.get("query_count")
+        if count is None:
+            return await handler(event, data)
+        before = QueryCount(count.statements, count.commits)
+        result = await handler(event, data)
+        count.handler = count - before
+
+        handler_object: HandlerObject | None = data.get("handler")
+        budget = budget_of(handler_object.callback) if handler_object else None
+        if budget is not None:
+            name = getattr(handler_object.callback, "__qualname__", "unknown")
+            check_budget(name, count.handler, budget, self.enforce)
+        return result
+
+
+def guard_handler_budgets(dp: Dispatcher, enforce: bool = False) -> None:
+    """Check handler budgets for every event type; register after the other inner middlewares."""
+    for event_name, observer in dp.observers.items():
+        if event_name != "update":
+            observer.middleware(HandlerQueryBudgetMiddleware(enforce))
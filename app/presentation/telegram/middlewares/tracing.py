@@ -0,0 +1,52 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware, types
+from aiogram.dispatcher.middlewares.user_context import UserContextMiddleware
+from aiogram.types import TelegramObject
+
+from app.core.logging import get_logger
+from app.core.tracing import Trace, start_trace
+
+logger = get_logger("tracing")
+
+
+class TracingMiddleware(BaseMiddleware):
+    """Outermost update middleware tracing each update as a span tree.
+
+    Middlewares, handlers, SQL statements and Bot API calls add their spans to
+    the tree. Updates slower than ``threshold`` seconds are logged with the whole
+    tree and their update, chat and user IDs.
+    """
+
+    def __init__(self, threshold: float) -> None:
+        super().__init__()
+        self.threshold = threshold
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, types.Update):
+            return await handler(event, data)
+        with start_trace(f"update:{event.event_type}") as trace:
+            try:
+                return await handler(event, data)
+            finally:
+                # The root span ends with the block, so measure here
+                if trace.root.duration >= self.threshold:
+                    self.log_slow_update(event, trace)
+
+    def log_slow_update(self, update: types.Update, trace: Trace) -> None:
+        context = UserContextMiddleware.resolve_event_context(update)
+        logger.warning(
+            "Slow update",
+            update_id=update.update_id,
+            chat_id=context.chat.id if context.chat else None,
+            user_id=context.user.id if context.user else None,
+            duration_ms=round(trace.root.duration * 1000, 1),
+            spans=trace.root.render(),
+            dropped_spans=trace.dropped,
+        )
@@ -0,0 +1,204 @@
+"""Replay captured updates through the dispatcher against a local database.
+
+Bot API calls are answered by a fake session, so nothing reaches Telegram.
+Without ``--database-url`` the replay runs on a temporary SQLite database::
+
+    python -m app.presentation.telegram.replay captures/updates-*.jsonl.gz --speed 10x \\
+        --database-url sqlite+aiosqlite:///replay.db
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from aiogram import Bot, Dispatcher, types
+from aiogram.client.default import DefaultBotProperties
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.container import setup_container
+from app.core.logging import get_logger
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.session import instrument_engine
+from app.infrastructure.telegram.capture import read_capture
+from app.infrastructure.telegram.fake_session import FakeTelegramSession
+from app.infrastructure.telegram.request_metrics import RequestMetricsMiddleware
+from app.presentation.telegram.bot import setup_dispatcher
+
+logger = get_logger("replay")
+
+
+@dataclass
+class ReplayResult:
+    """Throughput and latency of a replay; ``max_lag_ms`` is how far it fell behind the capture's pace."""
+
+    updates: int
+    errors: int
+    duration_s: float
+    updates_per_second: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_lag_ms: float
+
+
+def parse_speed(value: str) -> float | None:
+    """``max`` for no pacing, else a factor such as ``1``, ``10x`` or ``0.5x``."""
+    if value == "max":
+        return None
+    try:
+        speed = float(value.removesuffix("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid speed {value!r}, expected e.g. 1x, 10x or max") from None
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive")
+    return speed
+
+
+async def replay_updates(
+    dp: Dispatcher,
+    bot: Bot,
+    entries: Iterable[tuple[float, dict[str, Any]]],
+    speed: float | None = 1.0,
+    concurrency: int = 100,
+) -> ReplayResult:
+    """Feed captured updates to ``dp``, paced at ``speed`` times the original rate, or as fast as possible.
+
+    Updates are handled as concurrent tasks, like polling does, at most
+    ``concurrency`` at a time.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+    max_lag = 0.0
+    tasks: set[asyncio.Task[None]] = set()
+
+    async def feed(update: types.Update) -> None:
+        nonlocal errors
+        began = time.perf_counter()
+        try:
+            await dp.feed_update(bot, update)
+        except Exception as err:
+            # Polling logs and skips failed updates, so count them and go on
+            errors += 1
+            logger.warning("Replayed update failed", update_id=update.update_id, error=str(err))
+        finally:
+            latencies.append(time.perf_counter() - began)
+            semaphore.release()
+
+    start = time.perf_counter()
+    first_received: float | None = None
+    for received_at, data in entries:
+        if first_received is None:
+            first_received = received_at
+        if speed is not None:
+            due = (received_at - first_received) / speed
+            delay = due - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        await semaphore.acquire()
+        if speed is not None:
+            max_lag = max(max_lag, time.perf_counter() - start - due)
+        task = asyncio.create_task(feed(types.Update.model_validate(data, context={"bot": bot})))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    await asyncio.gather(*tasks)
+    duration = time.perf_counter() - start
+
+    p50, p95, p99 = percentiles(latencies)
+    return ReplayResult(
+        updates=len(latencies),
+        errors=errors,
+        duration_s=round(duration, 3),
+        updates_per_second=round(len(latencies) / duration, 1) if duration else 0.0,
+        p50_ms=p50,
+        p95_ms=p95,
+        p99_ms=p99,
+        max_lag_ms=round(max_lag * 1000, 3),
+    )
+
+
+def percentiles(latencies: list[float]) -> tuple[float, float, float]:
+    """p50, p95 and p99 of ``latencies`` in milliseconds."""
+    if len(latencies) < 2:
+        return (round(latencies[0] * 1000, 3),) * 3 if latencies else (0.0, 0.0, 0.0)
+    quantiles = statistics.quantiles(latencies, n=100)
+    return round(quantiles[49] * 1000, 3), round(quantiles[94] * 1000, 3), round(quantiles[98] * 1000, 3)
+
+
+def is_local_database(database_url: str) -> bool:
+    """Whether ``database_url`` is a SQLite file rather than a server that may hold real data."""
+    return make_url(database_url).get_backend_name() == "sqlite"
+
+
+async def create_replay_engine(database_url: str) -> AsyncEngine:
+    """Engine of the replay database; a SQLite database gets the tables created."""
+    engine = create_async_engine(database_url)
+    instrument_engine(engine)
+    if engine.dialect.name == "sqlite":
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+
+async def run_replay(args: argparse.Namespace) -> ReplayResult:
+    """Replay the capture files of ``args`` through the bot's dispatcher."""
+    # The replay itself must not be captured again
+    settings.capture.enabled = False
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = await create_replay_engine(args.database_url or f"sqlite+aiosqlite:///{Path(directory) / 'replay.db'}")
+        session_maker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        session = FakeTelegramSession(latency=args.api_latency, admin_ids=settings.admin.super_admins)
+        bot = Bot(token=settings.telegram.token, session=session, default=DefaultBotProperties(parse_mode="HTML"))
+        bot.session.middleware(RequestMetricsMiddleware())
+        dp = Dispatcher()
+        setup_container(session_maker, bot)
+        setup_dispatcher(dp, bot, session_maker)
+
+        try:
+            result = await replay_updates(dp, bot, read_capture(args.captures), args.speed, args.concurrency)
+        finally:
+            await dp["message_ingestor"].stop()
+            await engine.dispose()
+    logger.info("Replay finished", **asdict(result), api_requests=dict(session.requests))
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay captured updates against a local database")
+    parser.add_argument("captures", nargs="+", type=Path, help="Capture files, replayed in the given order")
+    parser.add_argument(
+        "--speed", type=parse_speed, default=1.0, help="Pace relative to the capture: 1x, 10x, ... or max"
+    )
+    parser.add_argument("--database-url", help="Database to replay against (default: a temporary SQLite database)")
+    parser.add_argument(
+        "--allow-server-database",
+        action="store_true",
+        help="Allow a non-SQLite --database-url; replayed messages, users and bans are written to it",
+    )
+    parser.add_argument("--api-latency", type=float, default=0.0, help="Seconds each fake Bot API call takes")
+    parser.add_argument("--concurrency", type=int, default=100, help="Most updates handled at once")
+    parser.add_argument("--output", type=Path, help="Write the result as JSON to this file")
+    args = parser.parse_args()
+    if args.database_url and not is_local_database(args.database_url) and not args.allow_server_database:
+        # Replayed /black commands ban users; never write into what may be the production database by accident
+        parser.error("refusing to replay into a non-SQLite database; pass --allow-server-database to confirm")
+
+    result = asyncio.run(run_replay(args))
+    report = json.dumps(asdict(result), indent=2)
+    print(report)
+    if args.output:
+        args.output.write_text(report + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
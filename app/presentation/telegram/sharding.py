@@ -0,0 +1,145 @@
+"""Sharded update processing: one ingress process feeding N worker processes.
+
+The ingress receives updates by polling or webhook and puts each one on the
+queue of the worker owning its chat, so a chat is always served by the same
+worker. Workers run the regular dispatcher and handle updates of one chat in
+arrival order, while different chats proceed concurrently.
+"""
+
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from aiogram import Bot, Dispatcher, types
+from aiogram.dispatcher.middlewares.user_context import UserContextMiddleware
+
+from app.core.logging import get_logger
+
+logger = get_logger("sharding")
+
+
+class UpdateQueue(Protocol):
+    """The part of ``multiprocessing.Queue`` the ingress and workers rely on."""
+
+    def put(self, obj: Any) -> None: ...
+
+    def get(self) -> Any: ...
+
+
+def update_key(update: types.Update) -> int:
+    """Chat ID of the update, or the user ID for updates outside any chat."""
+    context = UserContextMiddleware.resolve_event_context(update)
+    if context.chat is not None:
+        return context.chat.id
+    if context.user is not None:
+        return context.user.id
+    return 0
+
+
+def shard_index(key: int, count: int) -> int:
+    """Worker owning ``key`` out of ``count`` workers."""
+    return key % count
+
+
+@dataclass(frozen=True)
+class Shard:
+    """Position of a worker process among its siblings."""
+
+    index: int
+    count: int
+
+    def owns_chat(self, chat_id: int) -> bool:
+        """Check if updates of the chat are routed to this worker."""
+        return shard_index(chat_id, self.count) == self.index
+
+
+class UpdateRouter:
+    """Ingress side: routes updates to worker queues by chat."""
+
+    def __init__(self, queues: Sequence[UpdateQueue]) -> None:
+        if not queues:
+            raise ValueError("At least one worker queue is required")
+        self.queues = list(queues)
+
+    def route(self, update: types.Update, data: dict[str, Any] | None = None) -> int:
+        """Queue the update for its worker and return the worker index.
+
+        ``data`` is the raw update payload when it is at hand, saving a dump.
+        """
+        index = shard_index(update_key(update), len(self.queues))
+        if data is None:
+            data = update.model_dump(mode="json", by_alias=True, exclude_none=True)
+        self.queues[index].put(data)
+        return index
+
+    def close(self) -> None:
+        """Tell every worker that no more updates follow."""
+        for queue in self.queues:
+            queue.put(None)
+
+
+async def poll_updates(bot: Bot, router: UpdateRouter, allowed_updates: list[str], timeout: int = 30) -> None:
+    """Long-poll Telegram and route every update until cancelled."""
+    offset: int | None = None
+    while True:
+        try:
+            updates = await bot.get_updates(offset=offset, timeout=timeout, allowed_updates=allowed_updates)
+        except Exception as e:
+            logger.error("Polling failed", error=str(e))
+            await asyncio.sleep(1)
+            continue
+        for update in updates:
+            router.route(update)
+            offset = update.update_id + 1
+
+
+class ShardWorker:
+    """Worker side: feeds queued updates into the dispatcher, in order per chat."""
+
+    def __init__(self, dp: Dispatcher, bot: Bot) -> None:
+        self.dp = dp
+        self.bot = bot
+        # Last update task of every chat with updates in flight
+        self._tails: dict[int, asyncio.Task[None]] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of chats with updates still being handled."""
+        return len(self._tails)
+
+    async def run(self, updates: UpdateQueue) -> None:
+        """Handle updates from the queue until a ``None`` sentinel, then drain."""
+        loop = asyncio.get_running_loop()
+        while (data := await loop.run_in_executor(None, updates.get)) is not None:
+            try:
+                update = types.Update.model_validate(data, context={"bot": self.bot})
+            except Exception as e:
+                logger.error("Invalid update payload", error=str(e))
+                continue
+            self.submit(update)
+        await self.drain()
+
+    def submit(self, update: types.Update) -> None:
+        """Handle the update after the previous update of the same chat."""
+        key = update_key(update)
+        task = asyncio.create_task(self._feed(update, self._tails.get(key)))
+        self._tails[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+
+    async def drain(self) -> None:
+        """Wait for all submitted updates to be handled."""
+        while self._tails:
+            await asyncio.wait(list(self._tails.values()))
+
+    async def _feed(self, update: types.Update, previous: asyncio.Task[None] | None) -> None:
+        if previous is not None:
+            await asyncio.wait([previous])
+        try:
+            await self.dp.feed_update(self.bot, update)
+        except Exception as e:
+            logger.error("Update handling failed", update_id=update.update_id, error=str(e), exc_info=True)
+
+    def _forget(self, key: int, task: asyncio.Task[None]) -> None:
+        if self._tails.get(key) is task:
+            del self._tails[key]
@@ -1,21 +1,53 @@
 """Blacklist management utilities."""
 
+import datetime
+import html
+
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from app.domain.entities import UserEntity
 from app.presentation.telegram.utils import BlacklistPagination, UnblockUser
 
+CURSOR_TIME_FORMAT = "%Y%m%d%H%M%S%f"
+# Room left for the search query in BlacklistPagination (callback data is capped at 64 bytes)
+MAX_QUERY_BYTES = 16
+
+
+def clip_search_query(query: str) -> str:
+    """Make a search query fit into pagination callback data."""
+    # ":" is the callback data separator
+    query = query.replace(":", " ").strip()
+    return query.encode()[:MAX_QUERY_BYTES].decode(errors="ignore").strip()
+
+
+def encode_cursor(user: UserEntity) -> str:
+    """Pack the ``(created_at, id)`` keyset of a user into callback data."""
+    if user.created_at is None:
+        return ""
+    return f"{user.created_at.strftime(CURSOR_TIME_FORMAT)}_{user.id}"
+
+
+def decode_cursor(cursor: str) -> tuple[datetime.datetime, int] | None:
+    """Unpack a cursor made by :func:`encode_cursor`; ``None`` for a missing or malformed one."""
+    created_at, _, user_id = cursor.partition("_")
+    try:
+        return datetime.datetime.strptime(created_at, CURSOR_TIME_FORMAT), int(user_id)
+    except ValueError:
+        return None
+
 
 def build_blacklist_keyboard(
     users: list[UserEntity], current_page: int, total_pages: int, page_size: int = 10, query: str = ""
 ) -> InlineKeyboardBuilder:
-    """Build keyboard for blacklist display with pagination."""
+    """Build keyboard for one blacklist page with keyset pagination controls.
+
+    ``users`` are the rows of ``current_page``; Prev/Next carry the keyset of
+    the first/last of them.
+    """
     builder = InlineKeyboardBuilder()
 
     # Add user buttons
-    start_idx = current_page * page_size
-    end_idx = min(start_idx + page_size, len(users))
-    page_users = users[start_idx:end_idx]
+    page_users = users[:page_size]
 
     for user in page_users:
         display_name = user.display_name
@@ -32,14 +64,18 @@ def build_blacklist_keyboard(
 
         # Previous page button
         if current_page > 0:
-            pagination_row.append(("◀️ Prev", BlacklistPagination(page=current_page - 1, query=query).pack()))
+            cursor = encode_cursor(page_users[0]) if page_users else ""
+            prev_page = BlacklistPagination(page=current_page - 1, query=query, cursor=cursor, backward=1)
+            pagination_row.append(("◀️ Prev", prev_page.pack()))
 
         # Page indicator
         pagination_row.append((f"{current_page + 1}/{total_pages}", "noop"))
 
         # Next page button
         if current_page < total_pages - 1:
-            pagination_row.append(("Next ▶️", BlacklistPagination(page=current_page + 1, query=query).pack()))
+            cursor = encode_cursor(page_users[-1]) if page_users else ""
+            next_page = BlacklistPagination(page=current_page + 1, query=query, cursor=cursor)
+            pagination_row.append(("Next ▶️", next_page.pack()))
 
         # Add pagination buttons
         for text, callback_data in pagination_row:
@@ -55,7 +91,7 @@ def build_blacklist_text(
 ) -> str:
     """Build text message for blacklist display."""
     if query:
-        text = f"<b>Search results for '{query}':</b>\n"
+        text = f"<b>Search results for '{html.escape(query)}':</b>\n"
         text += f"Found {total_count} users"
     else:
         text = f"<b>Blacklist ({total_count} users):</b>"
@@ -16,6 +16,9 @@ class UnblockUser(CallbackData, prefix="unblock"):
 class BlacklistPagination(CallbackData, prefix="blpage"):
     page: int
     query: str = ""
+    # Keyset of the row to page from, see utils.blacklist.encode_cursor
+    cursor: str = ""
+    backward: int = 0
 
 
 class BlacklistSearch(CallbackData, prefix="blsearch"):
@@ -2,6 +2,7 @@ from aiogram import types
 from aiogram.filters import BaseFilter
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.application.services.admin_roles import AdminRoleCache, admin_roles
 from app.core.config import settings
 from app.infrastructure.db.repositories import get_admin_repository
 
@@ -12,10 +13,13 @@ class SuperAdminFilter(BaseFilter):
 
 
 class AdminFilter(BaseFilter):
+    def __init__(self, roles: AdminRoleCache | None = None):
+        self.roles = roles if roles is not None else admin_roles
+
     async def __call__(self, msg: types.Message, db: AsyncSession) -> bool:
-        admin_repo = get_admin_repository(db)
-        admins_id = [admin.id for admin in await admin_repo.get_db_admins()]
-        return msg.from_user.id in admins_id
+        if not self.roles.is_loaded:
+            await self.roles.ensure_loaded(get_admin_repository(db))
+        return self.roles.is_db_admin(msg.from_user.id)
 
 
 class ChatTypeFilter(BaseFilter):
@@ -1,15 +1,15 @@
-import asyncio
 import datetime
 import re
 
 from aiogram import types
 from pytz import timezone
 
+from app.application.services.deletion_scheduler import deletion_scheduler
 
-async def sleep_and_delete(message: types.Message, seconds: int = 60) -> None:
-    """Delete a message after a short delay."""
-    await asyncio.sleep(seconds)
-    await message.delete()
+
+def delete_later(message: types.Message, seconds: int = 60) -> None:
+    """Schedule a message for deletion after a short delay."""
+    deletion_scheduler.schedule(message.chat.id, message.message_id, seconds)
 
 
 async def get_user_mention(user: types.User) -> str:
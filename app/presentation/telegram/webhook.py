@@ -0,0 +1,113 @@
+"""Webhook transport: an aiohttp server feeding Telegram updates into the dispatcher."""
+
+import asyncio
+import hmac
+
+from aiogram import Bot, Dispatcher, types
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.presentation.telegram.sharding import UpdateRouter
+
+logger = get_logger("webhook")
+
+
+class WebhookRequestHandler(SimpleRequestHandler):
+    """Request handler that lets in-flight background updates finish on shutdown."""
+
+    async def close(self) -> None:
+        pending = self._background_feed_update_tasks
+        if pending:
+            logger.info("Waiting for in-flight updates", count=len(pending))
+            await asyncio.gather(*pending, return_exceptions=True)
+        await super().close()
+
+
+def build_webhook_app(
+    dp: Dispatcher,
+    bot: Bot,
+    path: str,
+    secret_token: str | None,
+    handle_in_background: bool = True,
+) -> web.Application:
+    """Build the aiohttp application serving the webhook endpoint.
+
+    Requests without the matching ``X-Telegram-Bot-Api-Secret-Token`` header are
+    rejected with 401. Dispatcher startup/shutdown handlers run with the app.
+    """
+    app = web.Application()
+    WebhookRequestHandler(
+        dp,
+        bot,
+        handle_in_background=handle_in_background,
+        secret_token=secret_token,
+    ).register(app, path=path)
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+def build_ingress_app(router: UpdateRouter, path: str, secret_token: str) -> web.Application:
+    """Build the aiohttp application routing webhook updates to sharded workers.
+
+    Updates are only queued here, so requests are answered right away. Requests
+    without the matching secret token are rejected with 401.
+    """
+
+    async def handle(request: web.Request) -> web.Response:
+        received = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+        if not hmac.compare_digest(received, secret_token):
+            return web.Response(status=401, text="Unauthorized")
+        data = await request.json()
+        router.route(types.Update.model_validate(data), data)
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_post(path, handle)
+    return app
+
+
+def require_webhook_settings() -> str:
+    """Return the webhook secret, failing if webhook mode is misconfigured."""
+    telegram = settings.telegram
+    if not telegram.webhook_url or not telegram.webhook_secret:
+        raise ValueError("BOT_WEBHOOK_URL and BOT_WEBHOOK_SECRET are required when BOT_USE_WEBHOOK is enabled")
+    return telegram.webhook_secret
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot) -> None:
+    """Serve the webhook until cancelled."""
+    telegram = settings.telegram
+    app = build_webhook_app(
+        dp,
+        bot,
+        path=telegram.webhook_path,
+        secret_token=require_webhook_settings(),
+        handle_in_background=telegram.webhook_handle_in_background,
+    )
+    await serve(app)
+
+
+async def run_webhook_ingress(router: UpdateRouter) -> None:
+    """Serve the webhook, routing updates to sharded workers, until cancelled."""
+    await serve(build_ingress_app(router, settings.telegram.webhook_path, require_webhook_settings()))
+
+
+async def serve(app: web.Application) -> None:
+    """Run the application on the configured webhook host and port until cancelled."""
+    telegram = settings.telegram
+    runner = web.AppRunner(app)
+    await runner.setup()
+    try:
+        site = web.TCPSite(runner, host=telegram.webhook_host, port=telegram.webhook_port)
+        await site.start()
+        logger.info(
+            "Webhook server started",
+            host=telegram.webhook_host,
+            port=telegram.webhook_port,
+            path=telegram.webhook_path,
+        )
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
@@ -25,11 +25,13 @@ import pytest_asyncio
 from aiogram import Bot
 from app.application.services.moderation_service import ModerationService
 from app.application.services.user_service import UserService
-from app.domain.repositories import IAdminRepository, IChatRepository, IUserRepository
+from app.domain.repositories import IAdminRepository, IChatRepository, IMessageRepository, IUserRepository
 from app.infrastructure.db.base import Base
 from app.infrastructure.db.repositories.admin import AdminRepository
 from app.infrastructure.db.repositories.chat import ChatRepository
+from app.infrastructure.db.repositories.message import MessageRepository
 from app.infrastructure.db.repositories.user import UserRepository
+from app.infrastructure.db.session import instrument_engine
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 
@@ -41,6 +43,9 @@ async def engine() -> AsyncGenerator[AsyncEngine, None]:
         echo=False,
     )
 
+    # Report statements to query counts, so tests can assert query budgets
+    instrument_engine(test_engine)
+
     # Create all tables
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -90,6 +95,12 @@ async def admin_repository(session: AsyncSession) -> IAdminRepository:
     return AdminRepository(session)
 
 
+@pytest_asyncio.fixture()
+async def message_repository(session: AsyncSession) -> IMessageRepository:
+    """Create message repository for tests."""
+    return MessageRepository(session)
+
+
 @pytest.fixture
 def mock_user_service() -> AsyncMock:
     """Mock user service."""
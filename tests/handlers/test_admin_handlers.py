@@ -3,6 +3,7 @@
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from app.application.services.admin_roles import AdminRoleCache
 from app.infrastructure.db.repositories.admin import AdminRepository
 from app.presentation.telegram.handlers.admin import delete_admin, new_admin
 
@@ -26,6 +27,12 @@ class TestAdminHandlers:
     def mock_admin_repository(self):
         return AsyncMock(spec=AdminRepository)
 
+    @pytest.fixture(autouse=True)
+    def admin_roles(self):
+        roles = AdminRoleCache(super_admins=[])
+        with patch("app.presentation.telegram.handlers.admin.admin_roles", roles):
+            yield roles
+
     async def test_new_admin_success(self, telegram_factory: TelegramObjectFactory, mock_admin_repository: AsyncMock):
         """Test successfully adding a new admin."""
         # Arrange
@@ -53,6 +60,7 @@ class TestAdminHandlers:
         # Assert
         mock_admin_repository.is_admin.assert_called_once_with(target_user.id)
         mock_admin_repository.insert_admin.assert_called_once_with(target_user.id)
+        mock_admin_repository.get_all_active.assert_called_once()  # admin roles refreshed
         command_message.answer.assert_called_once()
         command_message.delete.assert_called_once()
 
@@ -146,6 +154,7 @@ class TestAdminHandlers:
         # Assert
         mock_admin_repository.is_admin.assert_called_once_with(target_user.id)
         mock_admin_repository.delete_admin.assert_called_once_with(target_user.id)
+        mock_admin_repository.get_all_active.assert_called_once()  # admin roles refreshed
 
         # Verify success message
         call_args = command_message.answer.call_args[0][0]
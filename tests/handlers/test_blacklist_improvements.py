@@ -1,11 +1,13 @@
 """Tests for blacklist command improvements."""
 
-from unittest.mock import AsyncMock
+import datetime
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from app.application.services.user_service import UserService
 from app.domain.entities import UserEntity
-from app.presentation.telegram.handlers.moderation import show_blacklist
+from app.presentation.telegram.handlers.moderation import handle_blacklist_pagination, show_blacklist
+from app.presentation.telegram.utils import BlacklistPagination
 
 from tests.telegram_helpers import TelegramObjectFactory
 
@@ -34,14 +36,15 @@ class TestBlacklistImprovements:
     async def test_blacklist_empty(self, telegram_factory: TelegramObjectFactory, mock_user_service: AsyncMock):
         """Test blacklist command when no blocked users exist."""
         # Arrange
-        mock_user_service.get_blocked_users.return_value = []
+        mock_user_service.count_blocked_users.return_value = 0
         message = telegram_factory.create_message(text="/blacklist")
 
         # Act
         await show_blacklist(message, mock_user_service)
 
         # Assert
-        mock_user_service.get_blocked_users.assert_called_once()
+        mock_user_service.count_blocked_users.assert_called_once()
+        mock_user_service.get_blocked_users_page.assert_not_called()
         message.answer.assert_called_once_with("Blacklist is empty")
         message.delete.assert_called_once()
 
@@ -50,14 +53,15 @@ class TestBlacklistImprovements:
     ):
         """Test blacklist command with blocked users and pagination."""
         # Arrange
-        mock_user_service.get_blocked_users.return_value = sample_users
+        mock_user_service.count_blocked_users.return_value = len(sample_users)
+        mock_user_service.get_blocked_users_page.return_value = sample_users
         message = telegram_factory.create_message(text="/blacklist")
 
         # Act
         await show_blacklist(message, mock_user_service)
 
         # Assert
-        mock_user_service.get_blocked_users.assert_called_once()
+        mock_user_service.get_blocked_users_page.assert_called_once_with(10, None, False, query="")
         message.answer.assert_called_once()
 
         # Check that the message contains user count
@@ -115,6 +119,7 @@ class TestBlacklistImprovements:
         """Test blacklist command when searched user is not found."""
         # Arrange
         mock_user_service.find_blocked_user.return_value = None
+        mock_user_service.count_blocked_users.return_value = 0
         message = telegram_factory.create_message(text="/blacklist @notfound")
 
         # Act
@@ -122,6 +127,7 @@ class TestBlacklistImprovements:
 
         # Assert
         mock_user_service.find_blocked_user.assert_called_once_with("@notfound")
+        mock_user_service.count_blocked_users.assert_called_once_with("notfound")
         message.answer.assert_called_once()
 
         # Check that the message indicates user not found
@@ -129,13 +135,37 @@ class TestBlacklistImprovements:
         assert "not found in blacklist" in call_args
         assert "@notfound" in call_args
 
+    async def test_blacklist_search_lists_matches(
+        self, telegram_factory: TelegramObjectFactory, mock_user_service: AsyncMock, sample_users: list[UserEntity]
+    ):
+        """Test a query without an exact match shows paginated search results."""
+        # Arrange
+        mock_user_service.find_blocked_user.return_value = None
+        mock_user_service.count_blocked_users.return_value = 12
+        mock_user_service.get_blocked_users_page.return_value = sample_users
+        message = telegram_factory.create_message(text="/blacklist spam")
+
+        # Act
+        await show_blacklist(message, mock_user_service)
+
+        # Assert
+        mock_user_service.count_blocked_users.assert_called_once_with("spam")
+        mock_user_service.get_blocked_users_page.assert_called_once_with(10, None, False, query="spam")
+        text = message.answer.call_args[0][0]
+        keyboard = message.answer.call_args.kwargs["reply_markup"]
+        assert "Search results for 'spam'" in text
+        assert "Found 12 users" in text
+        next_page = BlacklistPagination.unpack(keyboard.inline_keyboard[-1][-1].callback_data)
+        assert next_page.query == "spam"
+
     async def test_blacklist_pagination_large_list(
         self, telegram_factory: TelegramObjectFactory, mock_user_service: AsyncMock
     ):
         """Test blacklist command shows pagination info for large lists."""
         # Arrange - Create more than 10 users
         many_users = [UserEntity(id=i, username=f"user{i}", is_blocked=True) for i in range(15)]
-        mock_user_service.get_blocked_users.return_value = many_users
+        mock_user_service.count_blocked_users.return_value = len(many_users)
+        mock_user_service.get_blocked_users_page.return_value = many_users[:10]
         message = telegram_factory.create_message(text="/blacklist")
 
         # Act
@@ -149,3 +179,28 @@ class TestBlacklistImprovements:
         assert "Showing 1-10 of 15" in call_args
         assert "Page 1 of 2" in call_args
         assert "15 users" in call_args
+
+    async def test_pagination_callback_queries_by_cursor(
+        self, telegram_factory: TelegramObjectFactory, mock_user_service: AsyncMock
+    ):
+        """Test a page flip fetches only the next page after the cursor."""
+        # Arrange
+        created_at = datetime.datetime(2026, 1, 1, 12, 0)
+        page_users = [UserEntity(id=i, is_blocked=True, created_at=created_at) for i in range(20, 30)]
+        mock_user_service.count_blocked_users.return_value = 25
+        mock_user_service.get_blocked_users_page.return_value = page_users
+        callback_data = BlacklistPagination(page=1, cursor="20260101120000000000_19")
+        callback = telegram_factory.create_callback_query(
+            message=telegram_factory.create_message(), data=callback_data.pack()
+        )
+
+        # Act
+        with patch.object(callback, "answer", AsyncMock()):
+            await handle_blacklist_pagination(callback, callback_data, mock_user_service)
+
+        # Assert
+        mock_user_service.get_blocked_users_page.assert_called_once_with(10, (created_at, 19), False, query="")
+        mock_user_service.get_blocked_users.assert_not_called()
+        text = callback.message.edit_text.call_args[0][0]
+        assert "Showing 11-20 of 25" in text
+        assert "Page 2 of 3" in text
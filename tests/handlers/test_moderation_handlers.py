@@ -129,10 +129,10 @@ class TestModerationHandlers:
         # Mock utility functions to raise exception
         with (
             patch("app.presentation.telegram.handlers.moderation.other.calculate_mute_duration") as mock_calc,
-            patch("app.presentation.telegram.handlers.moderation.other.sleep_and_delete") as mock_sleep,
+            patch("app.presentation.telegram.handlers.moderation.other.delete_later") as mock_delete_later,
         ):
             mock_calc.side_effect = ValueError("Invalid duration")
-            mock_sleep.return_value = None
+            mock_delete_later.return_value = None
 
             # Act
             await mute_user(command_message, mock_bot.mock)
@@ -140,7 +140,7 @@ class TestModerationHandlers:
         # Assert - should handle error gracefully
         command_message.answer.assert_called_once()
         command_message.delete.assert_called_once()
-        mock_sleep.assert_called_once()
+        mock_delete_later.assert_called_once()
 
     async def test_mute_user_telegram_error(self, telegram_factory: TelegramObjectFactory, mock_bot: MockBot):
         """Test mute command when Telegram API fails."""
@@ -420,8 +420,8 @@ class TestModerationHandlerEdgeCases:
         mock_bot.mock.ban_chat_member = AsyncMock(side_effect=Exception("Not enough rights"))
 
         # Mock utility functions
-        with patch("app.presentation.telegram.handlers.moderation.other.sleep_and_delete") as mock_sleep:
-            mock_sleep.return_value = None
+        with patch("app.presentation.telegram.handlers.moderation.other.delete_later") as mock_delete_later:
+            mock_delete_later.return_value = None
 
             # Act
             await ban_user(command_message, mock_bot.mock)
@@ -429,4 +429,4 @@ class TestModerationHandlerEdgeCases:
         # Assert
         command_message.answer.assert_called_once()
         command_message.delete.assert_called_once()
-        mock_sleep.assert_called_once()
+        mock_delete_later.assert_called_once()
@@ -0,0 +1,74 @@
+"""Tests keeping handlers within their declared query budgets."""
+
+from collections.abc import AsyncGenerator, Callable
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from aiogram import types
+from app.application.services.blacklist_index import BlacklistIndex
+from app.application.services.user_service import UserService
+from app.core.query_budget import QueryBudget, assert_query_budget, budget_of
+from app.infrastructure.db.repositories.message import MessageRepository
+from app.infrastructure.db.repositories.user import UserRepository
+from app.presentation.telegram.handlers.moderation import full_ban, label_spam, show_blacklist
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from tests.telegram_helpers import TelegramObjectFactory, create_admin_user, create_normal_user, create_test_chat
+
+SPAMMER_ID = 31337
+
+
+def declared_budget(handler: Callable[..., Any]) -> QueryBudget:
+    budget = budget_of(handler)
+    assert budget is not None, f"{handler} declares no query budget"
+    return budget
+
+
+@pytest_asyncio.fixture()
+async def db(engine: AsyncEngine) -> AsyncGenerator[AsyncSession, None]:
+    """Session with the target's history in place, so handlers take their costliest path."""
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        repo = MessageRepository(session)
+        await repo.add_message(create_test_chat().id, SPAMMER_ID, 1, "buy now", {})
+        await repo.add_message(-1009, SPAMMER_ID, 2, "buy now", {})
+        await UserRepository(session).upsert_profile(SPAMMER_ID, "spammer", "Spam", None)
+        await UserService(UserRepository(session), BlacklistIndex()).block_user(SPAMMER_ID)
+        yield session
+
+
+def make_reply_command(command: str) -> types.Message:
+    chat = create_test_chat()
+    target = TelegramObjectFactory.create_message(
+        user=create_normal_user(id=SPAMMER_ID, username="spammer"), chat=chat, text="buy now"
+    )
+    return TelegramObjectFactory.create_command_message(
+        command=command, user=create_admin_user(), chat=chat, reply_to_message=target
+    )
+
+
+@pytest.mark.handlers
+class TestHandlerQueryBudgets:
+    """Test handlers run no more queries than they declare."""
+
+    @pytest.mark.parametrize(("command", "handler"), [("black", full_ban), ("spam", label_spam)])
+    async def test_confirmation_commands(self, command: str, handler: Callable[..., Any], db: AsyncSession):
+        """Test /black and /spam gather the target's history within budget."""
+        message = make_reply_command(command)
+
+        with assert_query_budget(declared_budget(handler), name=command) as count:
+            await handler(message, MessageRepository(db), db)
+
+        assert count.commits == 0
+        message.answer.assert_called_once()
+
+    @pytest.mark.parametrize("command", ["/blacklist", "/blacklist spam", "/blacklist 31337"])
+    async def test_blacklist_listing_and_search(self, command: str, db: AsyncSession):
+        """Test listing and searching the blacklist stay within budget."""
+        message = TelegramObjectFactory.create_message(text=command)
+        user_service = UserService(UserRepository(db), BlacklistIndex())
+
+        with assert_query_budget(declared_budget(show_blacklist), name=command):
+            await show_blacklist(message, user_service)
+
+        message.answer.assert_called_once()
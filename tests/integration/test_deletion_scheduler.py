@@ -0,0 +1,118 @@
+"""Integration tests for the persistent deletion scheduler."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from app.application.services import deletion_scheduler as deletion_scheduler_module
+from app.application.services.deletion_scheduler import DeletionScheduler
+from app.domain.models import ScheduledDeletion
+from app.infrastructure.telegram.api_scheduler import ApiScheduler
+from app.presentation.telegram.sharding import Shard
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from tests.telegram_helpers import MockBot
+
+
+@pytest.fixture
+def session_pool(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=engine, expire_on_commit=False)
+
+
+@pytest.fixture(autouse=True)
+def fast_api_scheduler():
+    with patch.object(deletion_scheduler_module, "api_scheduler", ApiScheduler(group_per_minute=6000)):
+        yield
+
+
+async def stored_count(session_pool: async_sessionmaker[AsyncSession]) -> int:
+    async with session_pool() as session:
+        return (await session.execute(select(func.count()).select_from(ScheduledDeletion))).scalar_one()
+
+
+async def wait_until_idle(scheduler: DeletionScheduler) -> None:
+    for _ in range(100):
+        if scheduler.pending == 0:
+            # Let the worker finish removing the rows it just handled
+            await asyncio.sleep(0.05)
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("scheduled deletions were not carried out")
+
+
+@pytest.mark.integration
+class TestDeletionScheduler:
+    """Test delayed deletion is batched and survives restarts."""
+
+    async def test_due_messages_are_deleted_in_batches_per_chat(self, session_pool):
+        """Test due messages are grouped by chat and sent in chunks of 100."""
+        bot = MockBot()
+        scheduler = DeletionScheduler()
+        await scheduler.start(bot.mock, session_pool)
+        try:
+            for message_id in range(1, 151):
+                scheduler.schedule(-100, message_id, 0)
+            scheduler.schedule(-200, 7, 0)
+            await wait_until_idle(scheduler)
+        finally:
+            await scheduler.stop()
+
+        calls = sorted((call.args[0], call.args[1]) for call in bot.mock.delete_messages.call_args_list)
+        assert calls == [(-200, [7]), (-100, list(range(1, 101))), (-100, list(range(101, 151)))]
+        assert await stored_count(session_pool) == 0
+
+    async def test_pending_deletions_survive_restart(self, session_pool):
+        """Test deletions scheduled before a restart are loaded and carried out afterwards."""
+        bot = MockBot()
+        first = DeletionScheduler()
+        await first.start(bot.mock, session_pool)
+        first.schedule(-100, 1, 3600)
+        first.schedule(-100, 2, 0.05)
+        await first.stop()
+
+        assert await stored_count(session_pool) == 2
+        bot.mock.delete_messages.assert_not_called()
+
+        second = DeletionScheduler()
+        await second.start(bot.mock, session_pool)
+        try:
+            assert second.pending == 2
+            await asyncio.sleep(0.15)
+        finally:
+            await second.stop()
+
+        bot.mock.delete_messages.assert_called_once_with(-100, [2])
+        assert second.pending == 1
+        assert await stored_count(session_pool) == 1
+
+    async def test_failed_delete_is_not_retried(self, session_pool):
+        """Test a message that can no longer be deleted is dropped from the schedule."""
+        bot = MockBot()
+        bot.mock.delete_messages.side_effect = Exception("message to delete not found")
+        scheduler = DeletionScheduler()
+        await scheduler.start(bot.mock, session_pool)
+        try:
+            scheduler.schedule(-100, 1, 0)
+            await wait_until_idle(scheduler)
+        finally:
+            await scheduler.stop()
+
+        assert await stored_count(session_pool) == 0
+
+    async def test_sharded_worker_restores_only_its_chats(self, session_pool):
+        """Test a worker process restores only deletions of the chats routed to it."""
+        bot = MockBot()
+        first = DeletionScheduler()
+        await first.start(bot.mock, session_pool)
+        first.schedule(-100, 1, 3600)
+        first.schedule(-101, 2, 3600)
+        await first.stop()
+
+        shard = Shard(index=0, count=2)
+        second = DeletionScheduler()
+        await second.start(bot.mock, session_pool, shard.owns_chat)
+        try:
+            assert second.pending == 1
+        finally:
+            await second.stop()
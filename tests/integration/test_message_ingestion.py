@@ -0,0 +1,86 @@
+"""Integration tests for the write-behind message ingestion buffer."""
+
+import asyncio
+import datetime
+from typing import Any
+
+import pytest
+from app.application.services.message_ingestion import MessageIngestor
+from app.domain.models import Message
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+
+def make_row(message_id: int, chat_id: int = -100, user_id: int = 1) -> dict[str, Any]:
+    return {
+        "chat_id": chat_id,
+        "user_id": user_id,
+        "message_id": message_id,
+        "message": f"message {message_id}",
+        "message_info": {"message_id": message_id},
+        "timestamp": datetime.datetime.now(),
+    }
+
+
+async def count_messages(session_pool: async_sessionmaker[AsyncSession]) -> int:
+    async with session_pool() as session:
+        return (await session.execute(select(func.count()).select_from(Message))).scalar_one()
+
+
+@pytest.mark.integration
+class TestMessageIngestor:
+    """Test MessageIngestor against a real database."""
+
+    @pytest.fixture
+    def session_pool(self, engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def test_flushes_full_batches(self, session_pool: async_sessionmaker[AsyncSession]):
+        """Test rows are written in batches of batch_size."""
+        ingestor = MessageIngestor(session_pool, batch_size=10, flush_interval=60)
+        ingestor.start()
+
+        for message_id in range(25):
+            await ingestor.submit(make_row(message_id))
+        await ingestor.stop()
+
+        assert await count_messages(session_pool) == 25
+        assert ingestor.stats.enqueued == 25
+        assert ingestor.stats.written == 25
+        assert ingestor.stats.largest_batch == 10
+        assert ingestor.stats.batches == 3
+
+    async def test_flushes_partial_batch_after_interval(self, session_pool: async_sessionmaker[AsyncSession]):
+        """Test a partial batch is written once the flush interval passes."""
+        ingestor = MessageIngestor(session_pool, batch_size=100, flush_interval=0.05)
+        ingestor.start()
+
+        await ingestor.submit(make_row(1))
+        await ingestor.submit(make_row(2))
+        await asyncio.sleep(0.2)
+
+        assert await count_messages(session_pool) == 2
+        await ingestor.stop()
+
+    async def test_stop_without_start_flushes_queue(self, session_pool: async_sessionmaker[AsyncSession]):
+        """Test stop writes queued rows even if the writer never ran."""
+        ingestor = MessageIngestor(session_pool, batch_size=2)
+
+        for message_id in range(5):
+            await ingestor.submit(make_row(message_id))
+        await ingestor.stop()
+
+        assert await count_messages(session_pool) == 5
+        assert ingestor.pending == 0
+
+    async def test_failed_batch_is_counted(self, session_pool: async_sessionmaker[AsyncSession]):
+        """Test a batch that cannot be written is counted as failed."""
+        ingestor = MessageIngestor(session_pool, batch_size=10)
+        bad_row = make_row(1)
+        bad_row["chat_id"] = None  # violates NOT NULL
+
+        await ingestor.submit(bad_row)
+        await ingestor.stop()
+
+        assert ingestor.stats.failed == 1
+        assert ingestor.stats.written == 0
@@ -0,0 +1,135 @@
+"""Integration tests for MessageRepository."""
+
+from collections.abc import Awaitable, Callable, Iterator
+from typing import Any
+
+import pytest
+from app.domain.models import Message, text_hash
+from app.domain.repositories import IMessageRepository
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+
+def make_row(message_id: int, message: str | None) -> dict:
+    return {"chat_id": -100, "user_id": 1, "message_id": message_id, "message": message, "message_info": {}}
+
+
+@pytest.mark.integration
+class TestSpamTextHash:
+    """Test hash-based spam text matching."""
+
+    def test_text_hash_normalizes_case_and_whitespace(self):
+        """Test texts differing only in case and spacing share a hash."""
+        assert text_hash("Buy  CHEAP\ncoins ") == text_hash("buy cheap coins")
+        assert text_hash("buy cheap coins") != text_hash("buy cheap coin")
+        assert text_hash(None) is None
+        assert text_hash("") is None
+
+    async def test_hash_is_computed_on_batch_insert(
+        self, message_repository: IMessageRepository, session: AsyncSession
+    ):
+        """Test add_messages fills text_hash for every row."""
+        await message_repository.add_messages([make_row(1, "Hello"), make_row(2, None)])
+
+        hashes = (await session.execute(select(Message.text_hash).order_by(Message.message_id))).scalars().all()
+        assert hashes == [text_hash("Hello"), None]
+
+    async def test_serialized_message_info_is_stored_as_document(
+        self, message_repository: IMessageRepository, session: AsyncSession
+    ):
+        """Test pre-serialized message_info is written as JSON, not as a quoted string."""
+        row = make_row(1, "Hello") | {"message_info": '{"entities":[{"type":"url","offset":0,"length":5}]}'}
+        await message_repository.add_messages([row, make_row(2, "Hi")])
+
+        infos = (await session.execute(select(Message.message_info).order_by(Message.message_id))).scalars().all()
+        assert infos == [{"entities": [{"type": "url", "offset": 0, "length": 5}]}, {}]
+
+    async def test_spam_lookup_by_hash(self, message_repository: IMessageRepository):
+        """Test labelled spam is found by normalized text only."""
+        await message_repository.add_message(-100, 1, 1, "Join my CRYPTO channel", {})
+        await message_repository.add_message(-100, 1, 2, "hello everyone", {})
+        await message_repository.label_spam(-100, 1)
+
+        assert await message_repository.is_similar_spam_message("join my crypto   channel")
+        assert await message_repository.has_spam_with_hash(text_hash("Join my CRYPTO channel"))
+        assert not await message_repository.is_similar_spam_message("hello everyone")
+        assert not await message_repository.has_spam_with_hash(None)
+
+    def test_partial_spam_index_is_declared(self):
+        """Test the text_hash index only covers spam rows."""
+        index = next(index for index in Message.__table__.indexes if index.name == "ix_messages_text_hash_spam")
+
+        assert [column.name for column in index.columns] == ["text_hash"]
+        assert str(index.dialect_options["postgresql"]["where"]) == "spam"
+
+
+@pytest.mark.integration
+class TestUserMessageIds:
+    """Test loading a user's message IDs for revocation."""
+
+    async def test_ids_are_grouped_by_chat(self, message_repository: IMessageRepository):
+        """Test IDs come back once per chat message, grouped by chat."""
+        await message_repository.add_message(-100, 1, 2, "b", {})
+        await message_repository.add_message(-100, 1, 1, "a", {})
+        await message_repository.add_message(-200, 1, 1, "c", {})
+        await message_repository.add_message(-200, 2, 3, "other user", {})
+
+        assert await message_repository.get_user_message_ids(1) == {-200: [1], -100: [1, 2]}
+        assert await message_repository.get_user_message_ids(3) == {}
+
+
+@pytest.mark.integration
+class TestMessageIndexUsage:
+    """Test the hot message queries are served by indexes, not table scans."""
+
+    @pytest.fixture
+    def captured(self, engine: AsyncEngine) -> Iterator[list[tuple[str, Any]]]:
+        statements: list[tuple[str, Any]] = []
+
+        def capture(_conn, _cursor, statement, parameters, _context, executemany):
+            if not executemany and "messages" in statement and not statement.startswith("EXPLAIN"):
+                statements.append((statement, parameters))
+
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        yield statements
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    async def explain(self, session: AsyncSession, statement: str, parameters: Any) -> str:
+        connection = await session.connection()
+        rows = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return " | ".join(row[-1] for row in rows)
+
+    @pytest.mark.parametrize(
+        ("call", "index"),
+        [
+            (lambda repo: repo.count_user_chats(1), "ix_messages_user_id_chat_id"),
+            (lambda repo: repo.count_user_messages(1), "ix_messages_user_id_chat_id"),
+            (lambda repo: repo.is_first_message(chat_id=-100, user_id=1), "ix_messages_user_id_chat_id"),
+            (lambda repo: repo.get_user_messages(1), "ix_messages_user_id_chat_id"),
+            (lambda repo: repo.get_user_messages(1, chat_id=-100), "ix_messages_user_id_chat_id"),
+            (lambda repo: repo.get_user_message_ids(1), "ix_messages_user_id_chat_id"),
+            (lambda repo: repo.delete_user_messages(1), "ix_messages_user_id_chat_id"),
+            (lambda repo: repo.label_spam(-100, 1), "ix_messages_chat_id_message_id"),
+        ],
+    )
+    async def test_query_uses_index(
+        self,
+        message_repository: IMessageRepository,
+        session: AsyncSession,
+        captured: list[tuple[str, Any]],
+        call: Callable[[IMessageRepository], Awaitable[Any]],
+        index: str,
+    ):
+        """Test the repository query is planned as an index search."""
+        await message_repository.add_messages(
+            [make_row(message_id, f"message {message_id}") for message_id in range(50)]
+        )
+        captured.clear()
+
+        await call(message_repository)
+
+        assert captured, "repository method did not query messages"
+        for statement, parameters in captured:
+            plan = await self.explain(session, statement, parameters)
+            assert index in plan, plan
+            assert "SCAN messages" not in plan, plan
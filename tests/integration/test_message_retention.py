@@ -0,0 +1,45 @@
+"""Integration tests for message retention without partitioning."""
+
+import datetime
+
+import pytest
+from app.application.services.message_retention import apply_retention
+from app.domain.models import Message
+from app.infrastructure.db.partitions import MessagePartitions
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@pytest.mark.integration
+class TestRetentionFallback:
+    """Test retention deletes old rows where the table is not partitioned."""
+
+    async def test_old_messages_are_deleted(self, session: AsyncSession):
+        """Test rows older than the retention period are removed and newer ones kept."""
+        now = datetime.datetime(2026, 10, 17)
+        session.add_all([Message(chat_id=-100, user_id=1, message_id=n) for n in range(3)])
+        await session.commit()
+        for message_id, age_days in enumerate((400, 31, 1)):
+            await session.execute(
+                update(Message)
+                .where(Message.message_id == message_id)
+                .values(timestamp=now - datetime.timedelta(days=age_days))
+            )
+        await session.commit()
+
+        expired = await apply_retention(MessagePartitions(session), now, retention_days=30, months_ahead=2)
+
+        remaining = (await session.execute(select(Message.message_id))).scalars().all()
+        assert expired == []
+        assert remaining == [2]
+
+    async def test_zero_retention_keeps_everything(self, session: AsyncSession):
+        """Test the default retention of 0 days never deletes."""
+        session.add(Message(chat_id=-100, user_id=1, message_id=1))
+        await session.commit()
+
+        await apply_retention(
+            MessagePartitions(session), datetime.datetime(2100, 1, 1), retention_days=0, months_ahead=2
+        )
+
+        assert (await session.execute(select(Message.id))).scalars().all() != []
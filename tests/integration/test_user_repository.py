@@ -1,11 +1,41 @@
 """Integration tests for UserRepository."""
 
+import datetime
+import importlib.util
+from pathlib import Path
+from types import ModuleType
+
 import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
 from app.domain.entities import UserEntity
+from app.domain.models import User
 from app.domain.repositories import IUserRepository
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.repositories.user import UserRepository
+from sqlalchemy import Connection, MetaData
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 from tests.factories import UserFactory
 
+MIGRATIONS = Path(__file__).parents[2] / "alembic" / "versions"
+
+
+def keyset(user: UserEntity) -> tuple[datetime.datetime, int]:
+    """Blacklist pagination key of a user read back from the database."""
+    assert user.created_at is not None
+    return user.created_at, user.id
+
+
+def load_migration(revision: str) -> ModuleType:
+    path = next(MIGRATIONS.glob(f"{revision}_*.py"))
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
 
 @pytest.mark.integration
 class TestUserRepositoryIntegration:
@@ -270,3 +300,179 @@ class TestUserRepositoryEdgeCases:
         assert retrieved_user.username == "用户名_123"
         assert retrieved_user.first_name == "José"
         assert retrieved_user.last_name == "O'Connor"
+
+
+@pytest.mark.integration
+class TestUserProfileUpsert:
+    """Integration tests for UserRepository.upsert_profile."""
+
+    async def test_upsert_inserts_new_user(self, user_repository: IUserRepository):
+        """Test upsert creates a missing user."""
+        await user_repository.upsert_profile(555, "newbie", "New", None)
+
+        user = await user_repository.get_by_id(555)
+        assert user is not None
+        assert user.username == "newbie"
+        assert user.first_name == "New"
+        assert user.is_blocked is False
+
+    async def test_upsert_keeps_moderation_flags(self, user_repository: IUserRepository):
+        """Test profile updates do not reset the blocked/verified flags."""
+        await user_repository.save(UserFactory.create(id=556, username="old", is_blocked=True, is_verified=True))
+
+        await user_repository.upsert_profile(556, "renamed", "First", "Last")
+
+        user = await user_repository.get_by_id(556)
+        assert user.username == "renamed"
+        assert user.last_name == "Last"
+        assert user.is_blocked is True
+        assert user.is_verified is True
+
+    async def test_upsert_without_changes_keeps_row(self, user_repository: IUserRepository):
+        """Test an unchanged profile leaves modified_at untouched."""
+        await user_repository.upsert_profile(557, "same", "Same", None)
+        before = await user_repository.get_by_id(557)
+
+        await user_repository.upsert_profile(557, "same", "Same", None)
+
+        after = await user_repository.get_by_id(557)
+        assert after.modified_at == before.modified_at
+
+
+@pytest.mark.integration
+class TestBlacklistKeysetPagination:
+    """Test counting and keyset paging of blocked users."""
+
+    @pytest.fixture
+    async def blocked_ids(self, session: AsyncSession) -> list[int]:
+        """25 blocked users in (created_at, id) order, with created_at ties, plus unblocked ones."""
+        start = datetime.datetime(2026, 1, 1)
+        ids = []
+        for n in range(25):
+            user = User(id=1000 - n, blocked=True)
+            # Pairs share a timestamp, so ordering falls back to id
+            user.created_at = start + datetime.timedelta(minutes=n // 2)
+            session.add(user)
+            ids.append(user.id)
+        session.add_all([User(id=5000 + n, blocked=False) for n in range(5)])
+        await session.commit()
+        return sorted(ids, key=lambda user_id: ((1000 - user_id) // 2, user_id))
+
+    async def test_count_blocked_users(self, user_repository: IUserRepository, blocked_ids: list[int]):
+        """Test only blocked users are counted."""
+        assert await user_repository.count_blocked_users() == 25
+
+    async def test_forward_pages_cover_blacklist_in_order(
+        self, user_repository: IUserRepository, blocked_ids: list[int]
+    ):
+        """Test paging forward from each page's last row visits every user once."""
+        seen: list[int] = []
+        cursor = None
+        while True:
+            page = await user_repository.get_blocked_users_page(10, cursor)
+            if not page:
+                break
+            seen.extend(user.id for user in page)
+            cursor = keyset(page[-1])
+
+        assert seen == blocked_ids
+
+    async def test_backward_page_returns_previous_rows(self, user_repository: IUserRepository, blocked_ids: list[int]):
+        """Test paging backward from a page's first row returns the page before it in order."""
+        first = await user_repository.get_blocked_users_page(10)
+        second = await user_repository.get_blocked_users_page(10, keyset(first[-1]))
+
+        previous = await user_repository.get_blocked_users_page(10, keyset(second[0]), backward=True)
+
+        assert [user.id for user in previous] == blocked_ids[:10]
+
+    async def test_legacy_users_without_created_at_are_paged(self, tmp_path: Path):
+        """Test the pagination migration backfills created_at, so legacy users are reachable past page one."""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'legacy.db'}")
+        metadata = MetaData()
+        legacy_users = Base.metadata.tables["users"].to_metadata(metadata)
+        # As left by 97c024e13e5c, which added the columns without a backfill
+        legacy_users.c.created_at.nullable = True
+        legacy_users.c.modified_at.nullable = True
+        migration = load_migration("e5c9a3b7d2f0")
+
+        def upgrade(connection: Connection) -> None:
+            metadata.create_all(connection)
+            connection.execute(
+                legacy_users.insert(),
+                [
+                    {"id": 1, "blocked": True, "created_at": datetime.datetime(2026, 1, 1), "modified_at": None},
+                    {"id": 2, "blocked": True, "created_at": None, "modified_at": datetime.datetime(2025, 6, 1)},
+                    {"id": 3, "blocked": True, "created_at": None, "modified_at": None},
+                    {"id": 4, "blocked": False, "created_at": None, "modified_at": None},
+                ],
+            )
+            connection.commit()
+            context = MigrationContext.configure(connection, opts={"transactional_ddl": True})
+            with Operations.context(context), context.begin_transaction():
+                migration.upgrade()
+
+        try:
+            async with engine.connect() as connection:
+                await connection.run_sync(upgrade)
+
+            async with AsyncSession(engine) as session:
+                repository = UserRepository(session)
+                seen: list[int] = []
+                cursor = None
+                while page := await repository.get_blocked_users_page(2, cursor):
+                    seen.extend(user.id for user in page)
+                    cursor = keyset(page[-1])
+                count = await repository.count_blocked_users()
+        finally:
+            await engine.dispose()
+
+        assert seen == [2, 1, 3]
+        assert count == 3
+
+
+@pytest.mark.integration
+class TestBlacklistSearch:
+    """Test substring search over blocked users' names."""
+
+    @pytest.fixture
+    async def users(self, session: AsyncSession) -> None:
+        session.add_all(
+            [
+                User(id=1, username="crypto_king", first_name="Ivan", blocked=True),
+                User(id=2, username="spam100", first_name="Pavel", last_name="Ivanov", blocked=True),
+                User(id=3, username="kingfisher", first_name="Anna", blocked=True),
+                User(id=4, username="ivan_clean", first_name="Ivan", blocked=False),
+                User(id=5, username="percent", first_name="100% real", blocked=True),
+            ]
+        )
+        await session.commit()
+
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            ("ivan", [1, 2]),
+            ("KING", [1, 3]),
+            ("crypto", [1]),
+            ("100%", [5]),
+            ("o_k", [1]),
+            ("nobody", []),
+        ],
+    )
+    async def test_search_matches_names_and_usernames(
+        self, user_repository: IUserRepository, users: None, query: str, expected: list[int]
+    ):
+        """Test case-insensitive substring matching on username, first and last name of blocked users."""
+        page = await user_repository.get_blocked_users_page(10, query=query)
+
+        assert sorted(user.id for user in page) == expected
+        assert await user_repository.count_blocked_users(query) == len(expected)
+
+    async def test_search_results_are_paginated(self, user_repository: IUserRepository, users: None):
+        """Test keyset pages stay within the search results."""
+        first = await user_repository.get_blocked_users_page(1, query="king")
+        second = await user_repository.get_blocked_users_page(1, keyset(first[0]), query="king")
+        third = await user_repository.get_blocked_users_page(1, keyset(second[0]), query="king")
+
+        assert sorted([first[0].id, second[0].id]) == [1, 3]
+        assert third == []
@@ -5,7 +5,11 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 from aiogram.types import TelegramObject
+from app.application.services.blacklist_index import BlacklistIndex
+from app.core.query_budget import QueryBudget, assert_query_budget
+from app.infrastructure.db.repositories.user import UserRepository
 from app.presentation.telegram.middlewares.black_list import BlacklistMiddleware
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
 
 from tests.telegram_helpers import MockBot, TelegramObjectFactory, create_normal_user, create_test_chat
 
@@ -40,7 +44,7 @@ class TestBlacklistMiddleware:
 
     @pytest.fixture
     def blacklist_middleware(self):
-        return BlacklistMiddleware()
+        return BlacklistMiddleware(BlacklistIndex())
 
     @pytest.fixture
     def mock_handler(self):
@@ -64,14 +68,14 @@ class TestBlacklistMiddleware:
         data = {"user_repo": mock_user_repo, "bot": mock_bot.mock}
 
         # Mock no blocked users
-        mock_user_repo.get_blocked_users.return_value = []
+        mock_user_repo.get_blocked_user_ids.return_value = set()
 
         # Act
         await blacklist_middleware(mock_handler, message, data)
 
         # Assert
         assert mock_handler.called is True
-        mock_user_repo.get_blocked_users.assert_called_once()
+        mock_user_repo.get_blocked_user_ids.assert_called_once()
 
     async def test_blacklist_middleware_blocks_blacklisted_user(
         self,
@@ -93,9 +97,7 @@ class TestBlacklistMiddleware:
         data = {"user_repo": mock_user_repo, "bot": mock_bot.mock}
 
         # Mock user is blocked
-        mock_blocked_user = AsyncMock()
-        mock_blocked_user.id = blocked_user.id
-        mock_user_repo.get_blocked_users.return_value = [mock_blocked_user]
+        mock_user_repo.get_blocked_user_ids.return_value = {blocked_user.id}
 
         # Mock bot methods
         mock_bot.mock.ban_chat_member = AsyncMock()
@@ -129,7 +131,7 @@ class TestBlacklistMiddleware:
         data = {"user_repo": mock_user_repo, "bot": mock_bot.mock}
 
         # Mock repository error
-        mock_user_repo.get_blocked_users.side_effect = Exception("Database error")
+        mock_user_repo.get_blocked_user_ids.side_effect = Exception("Database error")
 
         # Act - Should not raise exception
         with pytest.raises(Exception, match="Database error"):
@@ -172,9 +174,7 @@ class TestBlacklistMiddleware:
         data = {"user_repo": mock_user_repo, "bot": mock_bot.mock}
 
         # Mock bot is in blocked list
-        mock_blocked_user = AsyncMock()
-        mock_blocked_user.id = bot_user.id
-        mock_user_repo.get_blocked_users.return_value = [mock_blocked_user]
+        mock_user_repo.get_blocked_user_ids.return_value = {bot_user.id}
 
         # Mock bot methods
         mock_bot.mock.ban_chat_member = AsyncMock()
@@ -206,7 +206,7 @@ class TestBlacklistMiddleware:
         mock_handlers = [MockHandler() for _ in messages]
 
         # Mock no blocked users
-        mock_user_repo.get_blocked_users.return_value = []
+        mock_user_repo.get_blocked_user_ids.return_value = set()
 
         data = {"user_repo": mock_user_repo, "bot": mock_bot.mock}
 
@@ -223,8 +223,8 @@ class TestBlacklistMiddleware:
         for handler in mock_handlers:
             assert handler.called is True
 
-        # Should call get_blocked_users once per message
-        assert mock_user_repo.get_blocked_users.call_count == len(messages)
+        # Index is loaded once and then answers from memory
+        assert mock_user_repo.get_blocked_user_ids.call_count == 1
 
 
 @pytest.mark.middleware
@@ -245,7 +245,7 @@ class TestBlacklistMiddlewareEdgeCases:
 
     @pytest.fixture
     def blacklist_middleware(self):
-        return BlacklistMiddleware()
+        return BlacklistMiddleware(BlacklistIndex())
 
     async def test_blacklist_middleware_with_callback_query(
         self,
@@ -263,7 +263,7 @@ class TestBlacklistMiddlewareEdgeCases:
         mock_handler = MockHandler()
         data = {"user_repo": mock_user_repo, "bot": mock_bot.mock}
 
-        mock_user_repo.get_blocked_users.return_value = []
+        mock_user_repo.get_blocked_user_ids.return_value = set()
 
         # Act
         await blacklist_middleware(mock_handler, callback_query, data)
@@ -289,9 +289,7 @@ class TestBlacklistMiddlewareEdgeCases:
         data = {"user_repo": mock_user_repo, "bot": mock_bot.mock}
 
         # Mock user is blocked
-        mock_blocked_user = AsyncMock()
-        mock_blocked_user.id = user.id
-        mock_user_repo.get_blocked_users.return_value = [mock_blocked_user]
+        mock_user_repo.get_blocked_user_ids.return_value = {user.id}
 
         # Act
         await blacklist_middleware(mock_handler, chat_member_update, data)
@@ -316,7 +314,7 @@ class TestBlacklistMiddlewareEdgeCases:
 
         mock_handlers = [MockHandler() for _ in messages]
 
-        mock_user_repo.get_blocked_users.return_value = []
+        mock_user_repo.get_blocked_user_ids.return_value = set()
 
         data = {"user_repo": mock_user_repo, "bot": mock_bot.mock}
 
@@ -333,8 +331,8 @@ class TestBlacklistMiddlewareEdgeCases:
         for handler in mock_handlers:
             assert handler.called is True
 
-        # Should fetch blocked users for each message
-        assert mock_user_repo.get_blocked_users.call_count == 5
+        # Blocked users are fetched only once
+        assert mock_user_repo.get_blocked_user_ids.call_count == 1
 
     async def test_blacklist_middleware_exception_handling(
         self,
@@ -355,8 +353,62 @@ class TestBlacklistMiddlewareEdgeCases:
 
         data = {"user_repo": mock_user_repo, "bot": mock_bot.mock}
 
-        mock_user_repo.get_blocked_users.return_value = []
+        mock_user_repo.get_blocked_user_ids.return_value = set()
 
         # Act & Assert
         with pytest.raises(ValueError, match="Handler failed"):
             await blacklist_middleware(failing_handler, message, data)
+
+
+@pytest.mark.middleware
+class TestBlacklistMiddlewareIndex:
+    """Test BlacklistMiddleware reads from the in-memory blacklist index."""
+
+    async def test_loaded_index_skips_database(self):
+        """Test a loaded index answers without touching the repository."""
+        index = BlacklistIndex()
+        mock_user_repo = AsyncMock()
+        mock_user_repo.get_blocked_user_ids.return_value = set()
+        await index.reconcile(mock_user_repo)
+        mock_user_repo.reset_mock()
+
+        middleware = BlacklistMiddleware(index)
+        message = TelegramObjectFactory.create_message(user=create_normal_user(), chat=create_test_chat())
+        handler = MockHandler()
+
+        await middleware(handler, message, {"user_repo": mock_user_repo, "bot": MockBot().mock})
+
+        assert handler.called is True
+        mock_user_repo.get_blocked_user_ids.assert_not_called()
+
+    async def test_index_updates_apply_immediately(self):
+        """Test users added to or removed from the index are picked up on the next message."""
+        index = BlacklistIndex()
+        mock_user_repo = AsyncMock()
+        mock_user_repo.get_blocked_user_ids.return_value = set()
+        mock_bot = MockBot()
+        middleware = BlacklistMiddleware(index)
+        user = create_normal_user(id=555)
+        data = {"user_repo": mock_user_repo, "bot": mock_bot.mock}
+        await index.reconcile(mock_user_repo)
+
+        index.add(user.id)
+        handler = MockHandler()
+        await middleware(handler, TelegramObjectFactory.create_message(user=user, chat=create_test_chat()), data)
+        assert handler.called is False
+
+        index.discard(user.id)
+        handler = MockHandler()
+        await middleware(handler, TelegramObjectFactory.create_message(user=user, chat=create_test_chat()), data)
+        assert handler.called is True
+
+    async def test_blacklist_is_queried_once_not_per_message(self, engine: AsyncEngine):
+        """Test only the first message loads the blacklist from the database."""
+        middleware = BlacklistMiddleware(BlacklistIndex())
+
+        async with async_sessionmaker(engine)() as session:
+            data = {"user_repo": UserRepository(session), "bot": MockBot().mock}
+            with assert_query_budget(QueryBudget(statements=1), name="first message"):
+                await middleware(MockHandler(), TelegramObjectFactory.create_message(chat=create_test_chat()), data)
+            with assert_query_budget(QueryBudget(statements=0), name="later message"):
+                await middleware(MockHandler(), TelegramObjectFactory.create_message(chat=create_test_chat()), data)
@@ -0,0 +1,60 @@
+"""Tests for DependenciesMiddleware."""
+
+from typing import TYPE_CHECKING, Any
+from unittest.mock import MagicMock
+
+import pytest
+from app.domain.entities import UserEntity
+from app.presentation.telegram.middlewares.dependencies import DependenciesMiddleware
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from tests.telegram_helpers import MockBot, TelegramObjectFactory
+
+if TYPE_CHECKING:
+    from app.infrastructure.db.session import LazySession
+
+
+@pytest.mark.middleware
+class TestDependenciesMiddleware:
+    """Test lazy session acquisition in DependenciesMiddleware."""
+
+    @pytest.fixture
+    def session_pool(self, engine: AsyncEngine) -> MagicMock:
+        pool = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        return MagicMock(side_effect=pool)
+
+    @pytest.fixture
+    def middleware(self, session_pool: MagicMock) -> DependenciesMiddleware:
+        return DependenciesMiddleware(session_pool=session_pool, bot=MockBot().mock)
+
+    async def test_no_session_without_queries(self, middleware: DependenciesMiddleware, session_pool: MagicMock):
+        """Test updates whose handler never queries the database do not open a session."""
+        seen: dict[str, Any] = {}
+
+        async def handler(_event: Any, data: dict[str, Any]) -> str:
+            seen.update(data)
+            return "ok"
+
+        result = await middleware(handler, TelegramObjectFactory.create_message(), {})
+
+        assert result == "ok"
+        assert {"db", "admin_repo", "user_repo", "chat_repo", "chat_link_repo", "message_repo"} <= seen.keys()
+        session_pool.assert_not_called()
+
+    async def test_session_opened_on_first_query_and_closed(
+        self, middleware: DependenciesMiddleware, session_pool: MagicMock
+    ):
+        """Test the session is created once on first use and closed after the handler."""
+        sessions: list[LazySession] = []
+
+        async def handler(_event: Any, data: dict[str, Any]) -> UserEntity | None:
+            sessions.append(data["db"])
+            await data["user_repo"].save(UserEntity(id=1, username="lazy"))
+            return await data["user_repo"].get_by_id(1)
+
+        user = await middleware(handler, TelegramObjectFactory.create_message(), {})
+
+        assert user is not None
+        assert user.username == "lazy"
+        session_pool.assert_called_once()
+        assert not sessions[0].is_opened
@@ -0,0 +1,129 @@
+"""Tests for query budgets of the middleware chain and handlers."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from aiogram import Bot, Dispatcher, types
+from app.application.services.blacklist_index import BlacklistIndex
+from app.core.config import settings
+from app.core.query_budget import QueryBudgetExceededError, query_budget
+from app.infrastructure.db.repositories.user import UserRepository
+from app.presentation.telegram.middlewares import (
+    BlacklistMiddleware,
+    DependenciesMiddleware,
+    HistoryMiddleware,
+    QueryBudgetMiddleware,
+    guard_handler_budgets,
+)
+from app.presentation.telegram.middlewares import query_budget as query_budget_middleware
+from app.presentation.telegram.middlewares.query_budget import PIPELINE_BUDGET
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.sql import text
+
+
+def make_update(update_id: int, user_id: int = 42, message_text: str = "hello") -> types.Update:
+    return types.Update.model_validate(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": 0,
+                "chat": {"id": -500, "type": "supergroup", "title": "Test"},
+                "from": {"id": user_id, "is_bot": False, "first_name": "Test"},
+                "text": message_text,
+            },
+        }
+    )
+
+
+def make_dispatcher(engine: AsyncEngine, blacklist: BlacklistIndex, enforce: bool = True) -> Dispatcher:
+    """Dispatcher with the production middleware chain around the database."""
+    session_pool = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    bot = Bot(token=settings.telegram.token)
+    dp = Dispatcher()
+    dp.update.middleware(QueryBudgetMiddleware(enforce=enforce))
+    dp.update.middleware(DependenciesMiddleware(session_pool=session_pool, bot=bot))
+    dp.update.middleware(HistoryMiddleware(AsyncMock()))
+    dp.message.middleware(BlacklistMiddleware(blacklist))
+    guard_handler_budgets(dp, enforce=enforce)
+    return dp
+
+
+@pytest.mark.middleware
+class TestQueryBudgetMiddleware:
+    """Test updates are checked against the middleware and handler budgets."""
+
+    async def test_plain_group_message_stays_within_pipeline_budget(self, engine: AsyncEngine):
+        """Test a group message costs at most the pipeline budget, and less once the user is known."""
+        blacklist = BlacklistIndex()
+        async with async_sessionmaker(engine)() as session:
+            await blacklist.ensure_loaded(UserRepository(session))
+        dp = make_dispatcher(engine, blacklist)
+
+        @dp.message()
+        async def chatter(message: types.Message) -> None:
+            pass
+
+        bot = Bot(token=settings.telegram.token)
+        # Raises QueryBudgetExceededError if the middlewares go over PIPELINE_BUDGET
+        await dp.feed_update(bot, make_update(1, user_id=4201))
+        await dp.feed_update(bot, make_update(2, user_id=4201))
+
+    async def test_loading_blacklist_per_message_exceeds_budget(self, engine: AsyncEngine):
+        """Test a middleware querying on every message is caught."""
+
+        class ReloadingBlacklist(BlacklistIndex):
+            @property
+            def is_loaded(self) -> bool:
+                return False
+
+        dp = make_dispatcher(engine, ReloadingBlacklist())
+
+        @dp.message()
+        async def chatter(message: types.Message) -> None:
+            pass
+
+        # A new user's upsert and spam lookup already fill the budget
+        with pytest.raises(QueryBudgetExceededError, match="middlewares ran 3 statements"):
+            await dp.feed_update(Bot(token=settings.telegram.token), make_update(1, user_id=4202))
+
+    async def test_handler_is_checked_against_declared_budget(self, engine: AsyncEngine):
+        """Test a handler's queries count against its own budget, not the pipeline's."""
+        blacklist = BlacklistIndex()
+        await blacklist.reconcile(AsyncMock(get_blocked_user_ids=AsyncMock(return_value=set())))
+        dp = make_dispatcher(engine, blacklist)
+        statements = 3
+
+        @dp.message()
+        @query_budget(statements=3)
+        async def budgeted(message: types.Message, db: AsyncSession) -> None:
+            for _ in range(statements):
+                await db.execute(text("SELECT 1"))
+
+        bot = Bot(token=settings.telegram.token)
+        await dp.feed_update(bot, make_update(1, user_id=4203))
+
+        statements = 4
+        with pytest.raises(QueryBudgetExceededError, match="budgeted ran 4 statements"):
+            await dp.feed_update(bot, make_update(2, user_id=4203))
+
+    async def test_over_budget_update_is_logged_when_not_enforced(self, engine: AsyncEngine):
+        """Test the runtime guard only warns unless enforcing."""
+        blacklist = BlacklistIndex()
+        dp = make_dispatcher(engine, blacklist, enforce=False)
+
+        @dp.message()
+        async def chatter(message: types.Message) -> None:
+            pass
+
+        with patch.object(query_budget_middleware, "logger") as logger:
+            await dp.feed_update(
+                Bot(token=settings.telegram.token),
+                make_update(1, user_id=4204),
+            )
+
+        logger.warning.assert_called_once()
+        fields = logger.warning.call_args.kwargs
+        assert fields["name"] == "middlewares"
+        assert fields["statements"] > PIPELINE_BUDGET.statements
+        assert fields["update_id"] == 1
@@ -0,0 +1,308 @@
+"""Replay benchmark of the full dispatcher stack.
+
+Builds the dispatcher exactly as ``bot.main()`` does, on a SQLite database and
+a ``MockBot`` with injected API latency, then feeds it a mix of synthetic
+group traffic and reports throughput and latency percentiles as JSON::
+
+    python -m tests.performance.dispatcher_benchmark --updates 5000 --latency 0.005 --output run.json
+"""
+
+import os
+
+# Settings are validated on import; the benchmark needs none of these to be real
+for name, value in {
+    "DB_USER": "bench",
+    "DB_PASSWORD": "bench",
+    "DB_NAME": "bench",
+    "BOT_TOKEN": "123456:ABC-DEF1234567890",
+    "ADMIN_SUPER_ADMINS": "[123456789]",
+    "LOGGING_LEVEL": "ERROR",
+}.items():
+    os.environ.setdefault(name, value)
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+from aiogram import Dispatcher, types
+from app.core.config import settings
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.session import instrument_engine
+from app.presentation.telegram.bot import setup_dispatcher
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from tests.telegram_helpers import MockBot
+
+# Chat IDs well away from the ones other tests put in the process-wide caches
+FIRST_CHAT_ID = -1009000000000
+FIRST_USER_ID = 7000000
+
+# Relative frequency of each kind of update, roughly that of a busy group
+UPDATE_MIX = {
+    "text": 70,
+    "reply": 10,
+    "photo": 8,
+    "join": 6,
+    "report": 4,
+    "admin_command": 2,
+}
+
+SPAM_TEXTS = ("Earn $500 a day from home, DM me", "Free crypto airdrop, click the link in bio")
+
+
+@dataclass
+class BenchmarkResult:
+    """Outcome of one run, written as JSON to compare runs across commits."""
+
+    updates: int
+    concurrency: int
+    api_latency_ms: float
+    duration_s: float
+    updates_per_second: float
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mix: dict[str, int]
+    commit: str | None = None
+    python: str = field(default_factory=platform.python_version)
+    timestamp: float = field(default_factory=time.time)
+
+    def write(self, path: Path) -> None:
+        path.write_text(json.dumps(asdict(self), indent=2) + "\n", encoding="utf-8")
+
+
+class UpdateGenerator:
+    """Deterministic stream of realistic group updates."""
+
+    def __init__(self, chats: int = 20, users: int = 500, seed: int = 0) -> None:
+        self.random = random.Random(seed)
+        self.chat_ids = [FIRST_CHAT_ID - n for n in range(chats)]
+        self.user_ids = [FIRST_USER_ID + n for n in range(users)]
+        self.admin_id = settings.admin.super_admins[0]
+        self.update_id = 0
+        self.message_ids: dict[int, int] = {}
+
+    def __iter__(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        kinds, weights = zip(*UPDATE_MIX.items(), strict=True)
+        while True:
+            kind = self.random.choices(kinds, weights)[0]
+            yield kind, getattr(self, kind)()
+
+    def chat(self, chat_id: int) -> dict[str, Any]:
+        return {"id": chat_id, "type": "supergroup", "title": f"Chat {chat_id}"}
+
+    def user(self, user_id: int) -> dict[str, Any]:
+        return {"id": user_id, "is_bot": False, "first_name": f"User{user_id}", "username": f"user{user_id}"}
+
+    def wrap(self, **payload: Any) -> dict[str, Any]:
+        self.update_id += 1
+        return {"update_id": self.update_id, **payload}
+
+    def message(self, user_id: int | None = None, chat_id: int | None = None, **fields: Any) -> dict[str, Any]:
+        chat_id = chat_id if chat_id is not None else self.random.choice(self.chat_ids)
+        user_id = user_id if user_id is not None else self.random.choice(self.user_ids)
+        self.message_ids[chat_id] = self.message_ids.get(chat_id, 0) + 1
+        return {
+            "message_id": self.message_ids[chat_id],
+            "date": int(time.time()),
+            "chat": self.chat(chat_id),
+            "from": self.user(user_id),
+            **fields,
+        }
+
+    def text(self) -> dict[str, Any]:
+        words = self.random.randint(1, 40)
+        text = self.random.choice(SPAM_TEXTS) if self.random.random() < 0.02 else " ".join(["lorem"] * words)
+        return self.wrap(message=self.message(text=text))
+
+    def reply(self) -> dict[str, Any]:
+        original = self.message(text="question?")
+        return self.wrap(message=self.message(chat_id=original["chat"]["id"], text="answer", reply_to_message=original))
+
+    def photo(self) -> dict[str, Any]:
+        sizes = [
+            {"file_id": f"photo-{size}", "file_unique_id": f"unique-{size}", "width": size, "height": size}
+            for size in (90, 320, 800)
+        ]
+        return self.wrap(message=self.message(photo=sizes, caption="look at this"))
+
+    def join(self) -> dict[str, Any]:
+        user = self.user(self.random.choice(self.user_ids))
+        return self.wrap(
+            chat_member={
+                "chat": self.chat(self.random.choice(self.chat_ids)),
+                "from": user,
+                "date": int(time.time()),
+                "old_chat_member": {"status": "left", "user": user},
+                "new_chat_member": {"status": "member", "user": user},
+            }
+        )
+
+    def report(self) -> dict[str, Any]:
+        reported = self.message(text=self.random.choice(SPAM_TEXTS))
+        return self.wrap(
+            message=self.message(
+                chat_id=reported["chat"]["id"],
+                text="/report",
+                entities=[{"type": "bot_command", "offset": 0, "length": 7}],
+                reply_to_message=reported,
+            )
+        )
+
+    def admin_command(self) -> dict[str, Any]:
+        target = self.message(text=self.random.choice(SPAM_TEXTS))
+        return self.wrap(
+            message=self.message(
+                user_id=self.admin_id,
+                chat_id=target["chat"]["id"],
+                text="/black",
+                entities=[{"type": "bot_command", "offset": 0, "length": 6}],
+                reply_to_message=target,
+            )
+        )
+
+
+def make_bot(latency: float) -> MockBot:
+    """Stand-in Bot answering every call after ``latency`` seconds."""
+    bot = MockBot(latency=latency)
+    bot.mock.id = int(settings.telegram.token.split(":", 1)[0])
+    admin = MagicMock()
+    admin.user.id = settings.admin.super_admins[0]
+    bot.mock.get_chat_administrators = AsyncMock(side_effect=bot.respond, return_value=[admin])
+    return bot
+
+
+def percentile(quantiles: list[float], p: int) -> float:
+    return round(quantiles[p - 1] * 1000, 3)
+
+
+def current_commit() -> str | None:
+    git = shutil.which("git")
+    if git is None:
+        return None
+    try:
+        result = subprocess.run([git, "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)  # noqa: S603
+    except subprocess.CalledProcessError:
+        return None
+    return result.stdout.strip()
+
+
+async def create_database(path: Path) -> AsyncEngine:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    instrument_engine(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+
+async def run_benchmark(
+    engine: AsyncEngine,
+    updates: int = 5000,
+    latency: float = 0.005,
+    concurrency: int = 50,
+    seed: int = 0,
+) -> BenchmarkResult:
+    """Feed ``updates`` synthetic updates through the bot's dispatcher.
+
+    Up to ``concurrency`` updates are handled at once, like polling with
+    ``handle_as_tasks``. The router of the bot can only be attached once, so
+    run one benchmark per process.
+    """
+    bot = make_bot(latency)
+    session_maker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    dp = Dispatcher()
+    setup_dispatcher(dp, bot.mock, session_maker)
+
+    generator = UpdateGenerator(seed=seed)
+    # Known chats are the steady state; new chats also take the registry insert
+    for chat_id in generator.chat_ids:
+        warmup = generator.wrap(message=generator.message(chat_id=chat_id, text="hello"))
+        await dp.feed_update(bot.mock, types.Update.model_validate(warmup, context={"bot": bot.mock}))
+
+    mix: Counter[str] = Counter()
+    batch: list[types.Update] = []
+    for kind, data in generator:
+        if len(batch) == updates:
+            break
+        mix[kind] += 1
+        # Mounted up front, as polling does, so the benchmark leaves out the re-validation
+        batch.append(types.Update.model_validate(data, context={"bot": bot.mock}))
+
+    latencies: list[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def feed(update: types.Update) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await dp.feed_update(bot.mock, update)
+            except Exception:
+                # Polling logs and skips failed updates, so count them and go on
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(feed(update) for update in batch))
+        duration = time.perf_counter() - start
+    finally:
+        await dp["message_ingestor"].stop()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return BenchmarkResult(
+        updates=len(batch),
+        concurrency=concurrency,
+        api_latency_ms=latency * 1000,
+        duration_s=round(duration, 3),
+        updates_per_second=round(len(batch) / duration, 1),
+        errors=errors,
+        p50_ms=percentile(quantiles, 50),
+        p95_ms=percentile(quantiles, 95),
+        p99_ms=percentile(quantiles, 99),
+        mix=dict(sorted(mix.items())),
+        commit=current_commit(),
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the dispatcher stack with synthetic updates")
+    parser.add_argument("--updates", type=int, default=5000, help="Number of updates to feed")
+    parser.add_argument("--latency", type=float, default=0.005, help="Seconds each Bot API call takes")
+    parser.add_argument("--concurrency", type=int, default=50, help="Updates handled at once")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the update mix")
+    parser.add_argument("--output", type=Path, help="Write the result as JSON to this file")
+    args = parser.parse_args()
+    # aiogram logs every update at INFO
+    logging.getLogger("aiogram.event").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = await create_database(Path(directory) / "benchmark.db")
+        try:
+            result = await run_benchmark(engine, args.updates, args.latency, args.concurrency, args.seed)
+        finally:
+            await engine.dispose()
+
+    print(json.dumps(asdict(result), indent=2))
+    if args.output:
+        result.write(args.output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
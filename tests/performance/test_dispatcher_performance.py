@@ -0,0 +1,27 @@
+"""Benchmark of the full dispatcher stack."""
+
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from tests.performance.dispatcher_benchmark import UPDATE_MIX, run_benchmark
+
+
+@pytest.mark.performance
+class TestDispatcherPerformance:
+    """Replay synthetic traffic through the bot's dispatcher."""
+
+    async def test_replay_reports_throughput_and_latency(self, engine: AsyncEngine, tmp_path: Path):
+        """Test every update is handled and the run is written as JSON."""
+        result = await run_benchmark(engine, updates=500, latency=0.001, concurrency=20)
+        output = tmp_path / "benchmark.json"
+        result.write(output)
+
+        print(output.read_text())
+        report = json.loads(output.read_text())
+        assert report["updates"] == 500
+        assert report["errors"] == 0
+        assert set(report["mix"]) == set(UPDATE_MIX)
+        assert 0 < report["p50_ms"] <= report["p95_ms"] <= report["p99_ms"]
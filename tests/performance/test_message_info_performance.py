@@ -0,0 +1,62 @@
+"""Benchmark of message_info serialization."""
+
+import json
+import time
+
+import pytest
+from aiogram import types
+from app.application.services import history
+
+ROUNDS = 2000
+
+
+def make_message() -> types.Message:
+    user = {"id": 1, "is_bot": False, "first_name": "Sender", "username": "sender", "language_code": "en"}
+    chat = {"id": -100, "type": "supergroup", "title": "Chat", "username": "chat"}
+    return types.Message.model_validate(
+        {
+            "message_id": 5,
+            "date": 0,
+            "chat": chat,
+            "from": user,
+            "text": "see https://example.com and @someone",
+            "entities": [{"type": "url", "offset": 4, "length": 19}, {"type": "mention", "offset": 28, "length": 8}],
+            "photo": [
+                {"file_id": f"file-{size}", "file_unique_id": f"unique-{size}", "width": size, "height": size}
+                for size in (90, 320, 800)
+            ],
+            "forward_origin": {"type": "user", "date": 0, "sender_user": user},
+            "reply_to_message": {"message_id": 3, "date": 0, "chat": chat, "from": user, "text": "original"},
+        }
+    )
+
+
+def measure(dump) -> tuple[int, float]:
+    """Bytes per row and microseconds per message for ``dump``."""
+    message = make_message()
+    size = len(dump(message).encode())
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        dump(message)
+    return size, (time.perf_counter() - start) / ROUNDS * 1_000_000
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestMessageInfoPerformance:
+    """Compare the stored message_info projections."""
+
+    def test_compact_projection_is_smaller(self):
+        """Test compact message_info takes fewer bytes than the full dump."""
+        results = {
+            "model_dump + json.dumps": measure(
+                lambda message: json.dumps(message.model_dump(mode="json", exclude_none=True))
+            ),
+            "full": measure(lambda message: history.dump_message_info(message, "full")),
+            "compact": measure(lambda message: history.dump_message_info(message, "compact")),
+        }
+
+        for name, (size, micros) in results.items():
+            print(f"{name}: {size} bytes/row, {micros:.1f} µs/message")
+
+        assert results["compact"][0] < results["full"][0] / 2
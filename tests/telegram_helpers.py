@@ -1,8 +1,9 @@
 """Telegram testing helpers for simulating bot events and messages."""
 
+import asyncio
 from datetime import datetime
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import DEFAULT, AsyncMock, MagicMock
 
 from aiogram import Bot
 from aiogram.types import (
@@ -231,23 +232,40 @@ class TelegramObjectFactory:
 
 
 class MockBot:
-    """Mock Bot for testing handlers."""
+    """Mock Bot for testing handlers.
 
-    def __init__(self):
+    ``latency`` seconds are awaited on every API call, standing in for the
+    round trip to Telegram; it may be changed between calls.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
         self.mock = AsyncMock(spec=Bot)
+        # Methods awaited directly, e.g. by message.answer(), go through bot(method)
+        self.mock.side_effect = self.respond
         self._setup_methods()
 
-    def _setup_methods(self):
+    async def respond(self, *args: Any, **kwargs: Any) -> Any:
+        """Default result of every call, after the injected latency."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return DEFAULT
+
+    def _setup_methods(self) -> None:
         """Setup common bot methods."""
-        self.mock.send_message = AsyncMock()
-        self.mock.edit_message_text = AsyncMock()
-        self.mock.delete_message = AsyncMock()
-        self.mock.restrict_chat_member = AsyncMock()
-        self.mock.ban_chat_member = AsyncMock()
-        self.mock.unban_chat_member = AsyncMock()
-        self.mock.get_chat_member = AsyncMock()
-        self.mock.get_chat = AsyncMock()
-        self.mock.answer_callback_query = AsyncMock()
+        for name in (
+            "send_message",
+            "edit_message_text",
+            "delete_message",
+            "delete_messages",
+            "restrict_chat_member",
+            "ban_chat_member",
+            "unban_chat_member",
+            "get_chat_member",
+            "get_chat",
+            "answer_callback_query",
+        ):
+            setattr(self.mock, name, AsyncMock(side_effect=self.respond))
 
     def __getattr__(self, name):
         return getattr(self.mock, name)
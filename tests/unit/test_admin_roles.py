@@ -0,0 +1,89 @@
+"""Tests for the bot admin role cache."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from app.application.services.admin_roles import AdminRoleCache
+from app.domain.entities import AdminEntity
+from app.presentation.telegram.middlewares.admin import AdminMiddleware
+
+from tests.telegram_helpers import TelegramObjectFactory, create_normal_user
+
+SUPER_ADMIN_ID = 123456789
+
+
+@pytest.mark.unit
+class TestAdminRoleCache:
+    """Test AdminRoleCache."""
+
+    @pytest.fixture
+    def admin_repo(self) -> AsyncMock:
+        repo = AsyncMock()
+        repo.get_all_active.return_value = [AdminEntity(id=1), AdminEntity(id=2)]
+        return repo
+
+    async def test_union_of_super_and_db_admins(self, admin_repo: AsyncMock):
+        """Test super admins and active database admins are both admins."""
+        roles = AdminRoleCache(super_admins=[SUPER_ADMIN_ID])
+
+        await roles.ensure_loaded(admin_repo)
+
+        assert roles.admin_ids == {SUPER_ADMIN_ID, 1, 2}
+        assert roles.is_admin(SUPER_ADMIN_ID)
+        assert roles.is_admin(1)
+        assert not roles.is_admin(3)
+        assert roles.is_super_admin(SUPER_ADMIN_ID)
+        assert not roles.is_db_admin(SUPER_ADMIN_ID)
+
+    async def test_ensure_loaded_queries_once(self, admin_repo: AsyncMock):
+        """Test repeated checks reuse the loaded admins."""
+        roles = AdminRoleCache(super_admins=[])
+
+        for _ in range(3):
+            await roles.ensure_loaded(admin_repo)
+
+        admin_repo.get_all_active.assert_called_once()
+
+    async def test_reconcile_picks_up_changes(self, admin_repo: AsyncMock):
+        """Test reconcile replaces the cached database admins."""
+        roles = AdminRoleCache(super_admins=[])
+        await roles.ensure_loaded(admin_repo)
+
+        admin_repo.get_all_active.return_value = [AdminEntity(id=2), AdminEntity(id=5)]
+        await roles.reconcile(admin_repo)
+
+        assert roles.admin_ids == {2, 5}
+
+
+@pytest.mark.unit
+class TestAdminMiddlewareRoles:
+    """Test AdminMiddleware checks roles in memory."""
+
+    async def test_inactive_admin_is_rejected(self):
+        """Test admins with state=False are not let through."""
+        admin_repo = AsyncMock()
+        # get_all_active only returns admins whose state flag is set
+        admin_repo.get_all_active.return_value = []
+        middleware = AdminMiddleware(AdminRoleCache(super_admins=[]))
+        handler = AsyncMock()
+        message = TelegramObjectFactory.create_message(user=create_normal_user(id=1))
+
+        with patch("app.presentation.telegram.middlewares.admin.you_are_not_admin", new=AsyncMock()) as not_admin:
+            await middleware(handler, message, {"admin_repo": admin_repo})
+
+        handler.assert_not_called()
+        not_admin.assert_called_once()
+
+    async def test_admin_checks_do_not_query_database(self):
+        """Test consecutive commands need a single admins query."""
+        admin_repo = AsyncMock()
+        admin_repo.get_all_active.return_value = [AdminEntity(id=1)]
+        middleware = AdminMiddleware(AdminRoleCache(super_admins=[]))
+        handler = AsyncMock()
+        message = TelegramObjectFactory.create_message(user=create_normal_user(id=1))
+
+        for _ in range(3):
+            await middleware(handler, message, {"admin_repo": admin_repo})
+
+        assert handler.call_count == 3
+        admin_repo.get_all_active.assert_called_once()
@@ -0,0 +1,160 @@
+"""Tests for the rate-limited Telegram API scheduler."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import BanChatMember
+from app.application.services import moderation
+from app.application.services.chat_registry import ChatRegistry
+from app.domain.entities import ChatEntity
+from app.infrastructure.telegram.api_scheduler import ApiScheduler
+
+from tests.telegram_helpers import MockBot
+
+
+def retry_after(chat_id: int, seconds: int = 0) -> TelegramRetryAfter:
+    return TelegramRetryAfter(
+        method=BanChatMember(chat_id=chat_id, user_id=1), message="Too Many Requests", retry_after=seconds
+    )
+
+
+@pytest.mark.unit
+class TestApiScheduler:
+    """Test ApiScheduler pacing and retries."""
+
+    async def test_call_returns_result(self):
+        """Test callers get the API result back."""
+        scheduler = ApiScheduler()
+
+        result = await scheduler.call(-100, AsyncMock(return_value=True))
+
+        assert result is True
+
+    async def test_private_chat_calls_are_spaced(self):
+        """Test calls to one private chat are spaced by the per-chat rate."""
+        scheduler = ApiScheduler(private_per_second=20)
+        request = AsyncMock()
+
+        started = time.monotonic()
+        await asyncio.gather(*(scheduler.call(1, request) for _ in range(3)))
+
+        assert time.monotonic() - started >= 0.09
+        assert request.call_count == 3
+
+    async def test_group_burst_is_not_delayed(self):
+        """Test a burst within a group's capacity goes out immediately."""
+        scheduler = ApiScheduler(group_per_minute=20)
+
+        with (
+            patch("app.infrastructure.telegram.api_scheduler.time") as clock,
+            patch("app.infrastructure.telegram.api_scheduler.asyncio.sleep", new_callable=AsyncMock) as sleep,
+        ):
+            clock.monotonic.return_value = 1000.0
+            await asyncio.gather(*(scheduler.call(-100, AsyncMock()) for _ in range(20)))
+
+        sleep.assert_not_awaited()
+
+    async def test_global_rate_applies_across_chats(self):
+        """Test calls to different chats share the global bucket."""
+        scheduler = ApiScheduler(global_per_second=20)
+
+        started = time.monotonic()
+        await asyncio.gather(*(scheduler.call(-chat_id, AsyncMock()) for chat_id in range(1, 26)))
+
+        # 20 go out as a burst, the remaining 5 at 20 per second
+        assert time.monotonic() - started >= 0.24
+
+    async def test_retry_after_requeues_call(self):
+        """Test a call rejected with retry_after is sent again."""
+        scheduler = ApiScheduler()
+        request = AsyncMock(side_effect=[retry_after(-100), "ok"])
+
+        result = await scheduler.call(-100, request)
+
+        assert result == "ok"
+        assert request.call_count == 2
+        assert scheduler.retries == 1
+
+    async def test_retry_after_gives_up_after_max_retries(self):
+        """Test persistent flood control is raised after max_retries re-queues."""
+        # After a 429 the chat bucket restarts empty, so keep its rate high
+        scheduler = ApiScheduler(group_per_minute=6000, max_retries=2)
+        request = AsyncMock(side_effect=retry_after(-100))
+
+        with pytest.raises(TelegramRetryAfter):
+            await scheduler.call(-100, request)
+
+        assert request.call_count == 3
+
+    async def test_delete_messages_uses_chunks_of_100(self):
+        """Test bulk deletion splits IDs into deleteMessages calls of at most 100."""
+        scheduler = ApiScheduler()
+        mock_bot = MockBot()
+        mock_bot.mock.delete_messages.side_effect = [True, Exception("message can't be deleted"), True]
+
+        deleted = await scheduler.delete_messages(mock_bot.mock, -100, list(range(250)))
+
+        sizes = [len(call.args[1]) for call in mock_bot.mock.delete_messages.call_args_list]
+        assert sizes == [100, 100, 50]
+        assert deleted == 150
+
+
+@pytest.mark.unit
+class TestGlobalBanUsesScheduler:
+    """Test the global ban fan-out survives flood control."""
+
+    async def test_flood_controlled_chat_is_still_banned(self):
+        """Test a chat answering 429 is retried instead of skipped."""
+        registry = ChatRegistry()
+        chat_repo = AsyncMock()
+        chat_repo.get_all.return_value = [ChatEntity(id=-100), ChatEntity(id=-200)]
+        await registry.load(chat_repo)
+        mock_bot = MockBot()
+        mock_bot.mock.ban_chat_member.side_effect = [retry_after(-100), None, None]
+
+        with (
+            patch.object(moderation, "chat_registry", registry),
+            patch.object(moderation, "api_scheduler", ApiScheduler()),
+            patch.object(moderation, "UserRepository") as user_repo_cls,
+            patch.object(moderation, "ChatRepository"),
+        ):
+            user_repo_cls.return_value.add_to_blacklist = AsyncMock()
+            await moderation.add_to_blacklist(AsyncMock(), mock_bot.mock, id_tg=42)
+
+        banned_chats = [call.args[0] for call in mock_bot.mock.ban_chat_member.call_args_list]
+        assert sorted(banned_chats) == [-200, -100, -100]
+
+
+@pytest.mark.unit
+class TestBlacklistRevocation:
+    """Test revocation in the global blacklist flow."""
+
+    async def test_messages_are_loaded_once_and_deleted_per_chat(self):
+        """Test each managed chat gets bulk deletes for its own messages only."""
+        registry = ChatRegistry()
+        chat_repo = AsyncMock()
+        chat_repo.get_all.return_value = [ChatEntity(id=-100), ChatEntity(id=-200), ChatEntity(id=-300)]
+        await registry.load(chat_repo)
+        mock_bot = MockBot()
+
+        with (
+            patch.object(moderation, "chat_registry", registry),
+            patch.object(moderation, "api_scheduler", ApiScheduler(group_per_minute=6000)),
+            patch.object(moderation, "UserRepository") as user_repo_cls,
+            patch.object(moderation, "ChatRepository"),
+            patch.object(moderation, "MessageRepository") as message_repo_cls,
+        ):
+            user_repo_cls.return_value.add_to_blacklist = AsyncMock()
+            get_ids = message_repo_cls.return_value.get_user_message_ids = AsyncMock(
+                return_value={-100: list(range(1, 251)), -200: [1, 2, 3], -999: [5]}
+            )
+            deleted = await moderation.add_to_blacklist(AsyncMock(), mock_bot.mock, id_tg=42, revoke_messages=True)
+
+        get_ids.assert_awaited_once_with(42)
+        calls = sorted((call.args[0], len(call.args[1])) for call in mock_bot.mock.delete_messages.call_args_list)
+        assert calls == [(-200, 3), (-100, 50), (-100, 100), (-100, 100)]
+        mock_bot.mock.delete_message.assert_not_called()
+        assert deleted == {-100: 250, -200: 3}
@@ -1,9 +1,13 @@
 """Tests for application services."""
 
+import json
 from unittest.mock import AsyncMock, patch
 
 import pytest
-from app.application.services import buttons, report
+from aiogram import types
+from app.application.services import buttons, history, report
+
+from tests.telegram_helpers import create_normal_user
 
 
 @pytest.mark.unit
@@ -208,3 +212,109 @@ class TestApplicationServiceIntegration:
         # Both services should work without interference
         contacts_builder2 = await buttons.get_contacts_buttons()
         assert contacts_builder2 is not None
+
+
+@pytest.mark.unit
+class TestHistoryMergeUser:
+    """Test history.merge_user profile change detection."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_profile_cache(self):
+        with patch.object(history, "recent_profiles", history.ProfileCache(maxsize=2)) as cache:
+            yield cache
+
+    @pytest.fixture
+    def mock_user_repo(self):
+        repo = AsyncMock()
+        with patch.object(history, "get_user_repository", return_value=repo):
+            yield repo
+
+    async def test_repeat_sender_skips_database(self, mock_user_repo):
+        """Test an unchanged profile is written only once."""
+        user = create_normal_user(id=1)
+
+        await history.merge_user(AsyncMock(), user)
+        await history.merge_user(AsyncMock(), user)
+
+        mock_user_repo.upsert_profile.assert_called_once_with(1, user.username, user.first_name, user.last_name)
+
+    async def test_changed_profile_is_written(self, mock_user_repo):
+        """Test a profile change triggers a new upsert."""
+        await history.merge_user(AsyncMock(), create_normal_user(id=1, username="before"))
+        await history.merge_user(AsyncMock(), create_normal_user(id=1, username="after"))
+
+        assert mock_user_repo.upsert_profile.call_count == 2
+
+    async def test_least_recent_profile_is_evicted(self, mock_user_repo):
+        """Test the cache evicts the least recently seen user."""
+        users = [create_normal_user(id=user_id) for user_id in (1, 2, 3)]
+        for user in users:
+            await history.merge_user(AsyncMock(), user)
+
+        await history.merge_user(AsyncMock(), users[0])
+
+        assert mock_user_repo.upsert_profile.call_count == 4
+
+    async def test_failed_write_is_retried(self, mock_user_repo):
+        """Test a profile is not cached when the upsert fails."""
+        user = create_normal_user(id=1)
+        mock_user_repo.upsert_profile.side_effect = [Exception("db down"), None]
+
+        with pytest.raises(Exception, match="db down"):
+            await history.merge_user(AsyncMock(), user)
+        await history.merge_user(AsyncMock(), user)
+
+        assert mock_user_repo.upsert_profile.call_count == 2
+
+
+def make_media_message() -> types.Message:
+    return types.Message.model_validate(
+        {
+            "message_id": 5,
+            "date": 0,
+            "chat": {"id": -100, "type": "supergroup", "title": "Chat"},
+            "from": {"id": 1, "is_bot": False, "first_name": "Sender"},
+            "caption": "look",
+            "caption_entities": [{"type": "url", "offset": 0, "length": 4}],
+            "photo": [{"file_id": "big-id", "file_unique_id": "photo-1", "width": 90, "height": 90}],
+            "forward_origin": {"type": "user", "date": 0, "sender_user": {"id": 7, "is_bot": False, "first_name": "F"}},
+            "reply_to_message": {
+                "message_id": 3,
+                "date": 0,
+                "chat": {"id": -100, "type": "supergroup"},
+                "from": {"id": 9, "is_bot": False, "first_name": "Replied"},
+                "text": "original",
+            },
+        }
+    )
+
+
+@pytest.mark.unit
+class TestHistoryMessageInfo:
+    """Test the stored message_info projection."""
+
+    def test_compact_keeps_only_used_fields(self):
+        """Test compact message_info holds entities, media ids, forward origin and reply ids."""
+        info = json.loads(history.dump_message_info(make_media_message(), "compact"))
+
+        assert info == {
+            "caption_entities": [{"type": "url", "offset": 0, "length": 4}],
+            "photo": [{"file_unique_id": "photo-1"}],
+            "forward_origin": {"type": "user", "date": 0, "sender_user": {"id": 7}},
+            "reply_to_message": {"message_id": 3, "from_user": {"id": 9}},
+        }
+
+    def test_full_keeps_whole_message(self):
+        """Test the full projection matches the previous model dump."""
+        message = make_media_message()
+
+        info = json.loads(history.dump_message_info(message, "full"))
+
+        assert info == message.model_dump(mode="json", exclude_none=True)
+
+    def test_row_uses_configured_projection(self):
+        """Test message rows carry serialized compact message_info by default."""
+        row = history.build_message_row(make_media_message())
+
+        assert isinstance(row["message_info"], str)
+        assert "chat" not in json.loads(row["message_info"])
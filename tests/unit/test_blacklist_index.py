@@ -0,0 +1,75 @@
+"""Tests for the in-memory blacklist index."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from app.application.services.blacklist_index import BlacklistIndex
+from app.application.services.user_service import UserService
+from app.domain.repositories import IUserRepository
+
+from tests.factories import UserFactory
+
+
+@pytest.mark.unit
+class TestBlacklistIndex:
+    """Test BlacklistIndex."""
+
+    @pytest.fixture
+    def mock_user_repository(self) -> AsyncMock:
+        return AsyncMock(spec=IUserRepository)
+
+    async def test_reconcile_replaces_ids(self, mock_user_repository: AsyncMock):
+        """Test reconcile loads blocked IDs from the repository."""
+        index = BlacklistIndex()
+        index.add(1)
+        mock_user_repository.get_blocked_user_ids.return_value = {2, 3}
+
+        await index.reconcile(mock_user_repository)
+
+        assert index.is_loaded is True
+        assert 1 not in index
+        assert 2 in index
+        assert 3 in index
+        assert len(index) == 2
+
+    async def test_ensure_loaded_queries_once(self, mock_user_repository: AsyncMock):
+        """Test concurrent first loads share a single query."""
+        index = BlacklistIndex()
+        mock_user_repository.get_blocked_user_ids.return_value = {1}
+
+        await asyncio.gather(*(index.ensure_loaded(mock_user_repository) for _ in range(5)))
+
+        mock_user_repository.get_blocked_user_ids.assert_called_once()
+        assert 1 in index
+
+    async def test_changes_during_reconcile_are_kept(self, mock_user_repository: AsyncMock):
+        """Test add/discard racing with a reconcile are applied over the snapshot."""
+        index = BlacklistIndex()
+
+        async def snapshot() -> set[int]:
+            index.add(10)
+            index.discard(20)
+            return {20, 30}
+
+        mock_user_repository.get_blocked_user_ids.side_effect = snapshot
+
+        await index.reconcile(mock_user_repository)
+
+        assert 10 in index
+        assert 20 not in index
+        assert 30 in index
+
+    async def test_user_service_updates_index(self, mock_user_repository: AsyncMock):
+        """Test blocking and unblocking through UserService keeps the index current."""
+        index = BlacklistIndex()
+        service = UserService(mock_user_repository, blacklist=index)
+        user = UserFactory.create(id=42)
+        mock_user_repository.get_by_id.return_value = user
+        mock_user_repository.save.side_effect = lambda entity: entity
+
+        await service.block_user(42)
+        assert 42 in index
+
+        await service.unblock_user(42)
+        assert 42 not in index
@@ -0,0 +1,234 @@
+"""Tests for the shared cache backends."""
+
+import asyncio
+import time
+from collections.abc import Mapping
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.application.services.chat_admins import ChatAdminCache
+from app.core.config import CacheSettings
+from app.infrastructure.cache import (
+    Cache,
+    CacheBackend,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    create_cache_backend,
+)
+
+from tests.telegram_helpers import MockBot
+
+
+class FakeRedisPipeline:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.commands: list[tuple[str, str, int | None]] = []
+
+    async def __aenter__(self) -> "FakeRedisPipeline":
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        self.commands.clear()
+
+    def set(self, name: str, value: str, px: int | None = None) -> "FakeRedisPipeline":
+        self.commands.append((name, value, px))
+        return self
+
+    async def execute(self) -> list[bool]:
+        self.redis.round_trips += 1
+        for name, value, px in self.commands:
+            self.redis.store(name, value, px)
+        return [True] * len(self.commands)
+
+
+class FakeRedis:
+    """In-memory stand-in for the commands RedisCacheBackend sends."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, tuple[float | None, bytes]] = {}
+        self.round_trips = 0
+        self.closed = False
+
+    def store(self, name: str, value: str, px: int | None) -> None:
+        self.data[name] = (time.monotonic() + px / 1000 if px is not None else None, value.encode())
+
+    async def mget(self, keys: list[str]) -> list[bytes | str | None]:
+        self.round_trips += 1
+        now = time.monotonic()
+        values: list[bytes | str | None] = []
+        for key in keys:
+            expires_at, value = self.data.get(key, (None, None))
+            values.append(value if expires_at is None or expires_at > now else None)
+        return values
+
+    def pipeline(self, transaction: bool = True) -> FakeRedisPipeline:
+        return FakeRedisPipeline(self)
+
+    async def delete(self, *names: str) -> int:
+        self.round_trips += 1
+        return sum(self.data.pop(name, None) is not None for name in names)
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request: pytest.FixtureRequest) -> CacheBackend:
+    if request.param == "memory":
+        return MemoryCacheBackend()
+    return RedisCacheBackend(FakeRedis())
+
+
+@pytest.mark.unit
+class TestCacheBackends:
+    """Test both backends behave the same behind a namespaced cache."""
+
+    async def test_bulk_get_and_set(self, backend: CacheBackend):
+        """Test values set in bulk come back in bulk and misses are counted."""
+        cache = Cache(backend, "admins", prefix="bot")
+
+        await cache.set_many({1: [10, 11], 2: [20]})
+        found = await cache.get_many([1, 2, 3])
+
+        assert found == {1: [10, 11], 2: [20]}
+        assert (cache.stats.hits, cache.stats.misses) == (2, 1)
+        assert cache.stats.hit_ratio == pytest.approx(2 / 3)
+
+    async def test_namespaces_do_not_collide(self, backend: CacheBackend):
+        """Test equal keys in different namespaces hold different values."""
+        admins = Cache(backend, "admins")
+        settings = Cache(backend, "chat_settings")
+
+        await admins.set(1, [10])
+        await settings.set(1, {"welcome": True})
+
+        assert await admins.get(1) == [10]
+        assert await settings.get(1) == {"welcome": True}
+        assert admins.key(1) == "admins:1"
+
+    async def test_values_expire_after_ttl(self, backend: CacheBackend):
+        """Test a value is gone once its TTL passes, and the default TTL applies."""
+        cache = Cache(backend, "short", ttl=0.01)
+
+        await cache.set("default", 1)
+        await cache.set("long", 2, ttl=60)
+        await asyncio.sleep(0.02)
+
+        assert await cache.get_many(["default", "long"]) == {"long": 2}
+
+    async def test_delete(self, backend: CacheBackend):
+        """Test deleted keys miss."""
+        cache = Cache(backend, "admins")
+        await cache.set_many({1: [1], 2: [2]})
+
+        await cache.delete(1)
+
+        assert await cache.get_many([1, 2]) == {2: [2]}
+
+
+@pytest.mark.unit
+class TestMemoryCacheBackend:
+    """Test the in-process LRU backend."""
+
+    async def test_least_recently_used_is_evicted(self):
+        """Test the oldest untouched entry goes first when the cache is full."""
+        backend = MemoryCacheBackend(maxsize=2)
+        await backend.set_many({"a": 1, "b": 2})
+        await backend.get_many(["a"])
+
+        await backend.set_many({"c": 3})
+
+        assert await backend.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+        assert len(backend) == 2
+
+    def test_memory_backend_is_default(self):
+        """Test settings select the in-process backend unless Redis is configured."""
+        backend = create_cache_backend(CacheSettings(memory_size=5))
+
+        assert isinstance(backend, MemoryCacheBackend)
+        assert backend.maxsize == 5
+
+
+@pytest.mark.unit
+class TestRedisCacheBackend:
+    """Test the Redis protocol backend against an in-memory fake."""
+
+    async def test_bulk_operations_take_one_round_trip(self):
+        """Test bulk reads use one MGET and bulk writes one pipeline."""
+        redis = FakeRedis()
+        backend = RedisCacheBackend(redis)
+
+        await backend.set_many({f"k{n}": n for n in range(50)}, ttl=60)
+        found = await backend.get_many([f"k{n}" for n in range(60)])
+
+        assert found == {f"k{n}": n for n in range(50)}
+        assert redis.round_trips == 2
+
+    async def test_close_closes_client(self):
+        """Test closing the backend closes the connection pool."""
+        redis = FakeRedis()
+
+        await RedisCacheBackend(redis).close()
+
+        assert redis.closed
+
+
+def make_admins(*user_ids: int) -> list[MagicMock]:
+    admins = []
+    for user_id in user_ids:
+        admin = MagicMock()
+        admin.user.id = user_id
+        admins.append(admin)
+    return admins
+
+
+class FailingBackend(MemoryCacheBackend):
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        raise ConnectionError("cache is down")
+
+    async def set_many(self, items: Mapping[str, Any], ttl: float | None = None) -> None:
+        raise ConnectionError("cache is down")
+
+
+@pytest.mark.unit
+class TestSharedChatAdminCache:
+    """Test chat admin lists are shared between replicas."""
+
+    async def test_replica_reuses_shared_admins(self):
+        """Test a second replica gets the admin list without calling Telegram."""
+        backend = RedisCacheBackend(FakeRedis())
+        bot = MockBot()
+        bot.mock.get_chat_administrators = AsyncMock(return_value=make_admins(1, 2))
+        first = ChatAdminCache(ttl=60, shared=Cache(backend, "chat_admins"))
+        second = ChatAdminCache(ttl=60, shared=Cache(backend, "chat_admins"))
+
+        assert await first.get_admin_ids(bot.mock, -100) == frozenset({1, 2})
+        assert await second.get_admin_ids(bot.mock, -100) == frozenset({1, 2})
+
+        bot.mock.get_chat_administrators.assert_called_once_with(-100)
+        assert second.shared.stats.hits == 1
+
+    async def test_invalidation_clears_shared_entry(self):
+        """Test an admin change drops the shared entry so every replica refetches."""
+        backend = MemoryCacheBackend()
+        bot = MockBot()
+        bot.mock.get_chat_administrators = AsyncMock(return_value=make_admins(1))
+        cache = ChatAdminCache(ttl=60, shared=Cache(backend, "chat_admins"))
+        await cache.get_admin_ids(bot.mock, -100)
+
+        cache.invalidate(-100)
+        await asyncio.sleep(0)
+        bot.mock.get_chat_administrators.return_value = make_admins(1, 3)
+
+        assert len(backend) == 0
+        assert await cache.get_admin_ids(bot.mock, -100) == frozenset({1, 3})
+        assert bot.mock.get_chat_administrators.call_count == 2
+
+    async def test_unavailable_shared_cache_falls_back_to_telegram(self):
+        """Test lookups still work when the shared cache fails."""
+        bot = MockBot()
+        bot.mock.get_chat_administrators = AsyncMock(return_value=make_admins(1))
+        cache = ChatAdminCache(ttl=60, shared=Cache(FailingBackend(), "chat_admins"))
+
+        assert await cache.get_admin_ids(bot.mock, -100) == frozenset({1})
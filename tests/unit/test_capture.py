@@ -0,0 +1,215 @@
+"""Tests for update capture and replay."""
+
+import argparse
+import gzip
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+from aiogram import Bot, Dispatcher, types
+from app.core.config import settings
+from app.core.metrics import capture_updates_dropped
+from app.infrastructure.telegram.capture import (
+    Anonymizer,
+    CaptureQueue,
+    CaptureWriter,
+    capture_path,
+    read_capture,
+)
+from app.infrastructure.telegram.fake_session import FakeTelegramSession
+from app.presentation.telegram.middlewares import CaptureMiddleware
+from app.presentation.telegram.replay import is_local_database, main, parse_speed, replay_updates
+
+ADMIN_ID = 123456789
+
+
+def make_update(update_id: int, user_id: int = 42, chat_id: int = -1001234567890) -> dict[str, Any]:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": chat_id, "type": "supergroup", "title": "Secret club"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "Alice", "username": "alice"},
+            "text": f"message {update_id}",
+        },
+    }
+
+
+@pytest.mark.unit
+class TestAnonymizer:
+    """Test IDs and names are replaced consistently."""
+
+    def test_ids_and_names_are_pseudonymized(self):
+        """Test user and chat IDs map to stable pseudonyms of the same kind; text is kept."""
+        anonymizer = Anonymizer(b"key")
+
+        first = anonymizer.update(make_update(1))["message"]
+        second = anonymizer.update(make_update(2))["message"]
+
+        assert first["from"]["id"] == second["from"]["id"] != 42
+        assert first["from"]["id"] > 0
+        assert str(first["chat"]["id"]).startswith("-100")
+        assert first["from"]["username"] == f"username{first['from']['id']}"
+        assert first["chat"]["title"] == f"title{first['chat']['id']}"
+        assert first["text"] == "message 1"
+        assert Anonymizer(b"other").update(make_update(1))["message"]["from"]["id"] != first["from"]["id"]
+
+    def test_kept_ids_are_not_changed(self):
+        """Test super admins keep their IDs, so replayed admin commands still work."""
+        anonymizer = Anonymizer(b"key", keep=[ADMIN_ID])
+
+        assert anonymizer.update(make_update(1, user_id=ADMIN_ID))["message"]["from"]["id"] == ADMIN_ID
+
+
+@pytest.mark.unit
+class TestCaptureWriter:
+    """Test captures are rotated, compressed JSONL."""
+
+    def test_rotation_keeps_newest_files(self, tmp_path: Path):
+        """Test full files are rotated, old ones dropped, and the rest read back in order."""
+        path = tmp_path / "updates.jsonl.gz"
+        writer = CaptureWriter(path, max_bytes=600, backup_count=2)
+        for update_id in range(1, 21):
+            writer.write(make_update(update_id), received_at=update_id)
+        writer.close()
+
+        backups = sorted(tmp_path.glob("updates-*.jsonl.gz"))
+        assert len(backups) == 2
+        entries = list(read_capture([*backups, path]))
+        assert [update["update_id"] for _, update in entries] == list(range(21 - len(entries), 21))
+        assert entries[-1][0] == 20
+        with gzip.open(path, "rt") as file:
+            assert json.loads(file.readline())["update"]["message"]["text"].startswith("message")
+
+    def test_previous_capture_is_rotated_on_open(self, tmp_path: Path):
+        """Test a restarted bot does not append to the last run's file."""
+        path = tmp_path / "updates.jsonl.gz"
+        for _ in range(2):
+            writer = CaptureWriter(path)
+            writer.write(make_update(1))
+            writer.close()
+
+        assert len(list(tmp_path.glob("updates-*.jsonl.gz"))) == 1
+        assert len(list(read_capture([path]))) == 1
+
+    def test_shards_write_separate_files(self, tmp_path: Path):
+        """Test every worker gets its own capture file."""
+        assert capture_path(tmp_path / "updates.jsonl.gz", 1) == tmp_path / "updates.shard1.jsonl.gz"
+
+    async def test_middleware_captures_raw_update(self, tmp_path: Path):
+        """Test the middleware records updates in Bot API form and passes them on."""
+        writer = CaptureWriter(tmp_path / "updates.jsonl.gz")
+        capture = CaptureQueue(writer)
+        dp = Dispatcher()
+        dp.update.middleware(CaptureMiddleware(capture))
+        handled = []
+
+        @dp.message()
+        async def handler(message: types.Message) -> None:
+            handled.append(message.text)
+
+        await dp.feed_update(Bot(token=settings.telegram.token), types.Update.model_validate(make_update(7)))
+        capture.close()
+
+        assert handled == ["message 7"]
+        [(_, update)] = read_capture([writer.path])
+        assert update == make_update(7)
+
+    def test_full_queue_drops_and_counts(self):
+        """Test updates over the queue's capacity are dropped rather than blocking the caller."""
+        writing, release = threading.Event(), threading.Event()
+        written = []
+
+        class BlockingWriter(CaptureWriter):
+            def write(self, update: dict[str, Any], received_at: float | None = None) -> None:
+                writing.set()
+                release.wait()
+                written.append(update["update_id"])
+
+        capture = CaptureQueue(BlockingWriter(Path("unused.jsonl.gz")), queue_size=2)
+        dropped = capture_updates_dropped.value()
+
+        capture.put(make_update(1))
+        writing.wait()
+        for update_id in range(2, 6):
+            capture.put(make_update(update_id))
+        release.set()
+        capture.close()
+
+        assert written == [1, 2, 3]
+        assert capture_updates_dropped.value() == dropped + 2
+
+
+@pytest.mark.unit
+class TestReplay:
+    """Test captured updates are replayed through a dispatcher."""
+
+    def make_capture(self, tmp_path: Path) -> Path:
+        writer = CaptureWriter(tmp_path / "updates.jsonl.gz")
+        for update_id in range(1, 4):
+            writer.write(make_update(update_id), received_at=1000 + update_id * 0.1)
+        writer.close()
+        return writer.path
+
+    def make_dispatcher(self) -> tuple[Dispatcher, Bot, FakeTelegramSession]:
+        session = FakeTelegramSession(admin_ids=[ADMIN_ID])
+        bot = Bot(token=settings.telegram.token, session=session)
+        dp = Dispatcher()
+
+        @dp.message()
+        async def echo(message: types.Message) -> None:
+            if message.message_id == 3:
+                raise RuntimeError("handler failed")
+            answer = await message.answer(message.text or "")
+            assert answer.chat.id == message.chat.id
+
+        return dp, bot, session
+
+    @pytest.mark.parametrize(("speed", "min_duration", "max_duration"), [(2.0, 0.1, 0.2), (None, 0, 0.05)])
+    async def test_replay_paces_updates(
+        self, tmp_path: Path, speed: float | None, min_duration: float, max_duration: float
+    ):
+        """Test updates keep the captured pace scaled by the speed, or run unpaced at max."""
+        dp, bot, session = self.make_dispatcher()
+
+        result = await replay_updates(dp, bot, read_capture([self.make_capture(tmp_path)]), speed=speed)
+
+        assert result.updates == 3
+        assert result.errors == 1
+        assert min_duration <= result.duration_s < max_duration
+        assert session.requests["sendMessage"] == 2
+
+    async def test_fake_session_answers_admin_lookups(self):
+        """Test every chat is administered by the configured admins."""
+        bot = Bot(token=settings.telegram.token, session=FakeTelegramSession(admin_ids=[ADMIN_ID]))
+
+        admins = await bot.get_chat_administrators(-100)
+
+        assert [admin.user.id for admin in admins] == [ADMIN_ID]
+        assert await bot.ban_chat_member(-100, 1) is True
+
+    def test_parse_speed(self):
+        """Test speeds are given as factors or max."""
+        assert parse_speed("10x") == 10
+        assert parse_speed("0.5") == 0.5
+        assert parse_speed("max") is None
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_speed("fast")
+
+    def test_server_database_needs_confirmation(
+        self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ):
+        """Test a replay never writes into a database server, which may be production, by accident."""
+        monkeypatch.setattr(
+            "sys.argv", ["replay", "updates.jsonl.gz", "--database-url", "postgresql+asyncpg://bot:secret@db/bot"]
+        )
+
+        with pytest.raises(SystemExit):
+            main()
+
+        assert "--allow-server-database" in capsys.readouterr().err
+        assert is_local_database("sqlite+aiosqlite:///replay.db")
+        assert not is_local_database("postgresql+asyncpg://bot:secret@db/bot")
@@ -0,0 +1,130 @@
+"""Tests for the chat administrator cache."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiogram.enums import ChatMemberStatus
+from aiogram.types import ChatMemberAdministrator, ChatMemberMember, Update
+from app.application.services.chat_admins import ChatAdminCache
+from app.presentation.telegram.middlewares.managed_chats import ManagedChatsMiddleware
+
+from tests.telegram_helpers import MockBot, TelegramObjectFactory, create_normal_user, create_test_chat
+
+SUPER_ADMIN_ID = 123456789
+
+
+def make_admins(*user_ids: int) -> list[MagicMock]:
+    admins = []
+    for user_id in user_ids:
+        admin = MagicMock()
+        admin.user.id = user_id
+        admins.append(admin)
+    return admins
+
+
+def make_administrator(user_id: int) -> ChatMemberAdministrator:
+    # Rights fields differ between Bot API versions; only the status matters here
+    return ChatMemberAdministrator.model_construct(
+        user=create_normal_user(id=user_id), status=ChatMemberStatus.ADMINISTRATOR
+    )
+
+
+@pytest.mark.unit
+class TestChatAdminCache:
+    """Test ChatAdminCache."""
+
+    @pytest.fixture
+    def mock_bot(self) -> MockBot:
+        bot = MockBot()
+        bot.mock.get_chat_administrators = AsyncMock(return_value=make_admins(1, 2))
+        return bot
+
+    async def test_cache_hit_skips_api_call(self, mock_bot: MockBot):
+        """Test repeated lookups within the TTL use the cached admin set."""
+        cache = ChatAdminCache(ttl=60)
+
+        first = await cache.get_admin_ids(mock_bot.mock, -100)
+        second = await cache.get_admin_ids(mock_bot.mock, -100)
+
+        assert first == second == frozenset({1, 2})
+        mock_bot.mock.get_chat_administrators.assert_called_once_with(-100)
+        assert cache.hits == 1
+        assert cache.misses == 1
+        assert cache.hit_ratio == 0.5
+
+    async def test_expired_entry_is_refetched(self, mock_bot: MockBot):
+        """Test entries older than the TTL trigger a new API call."""
+        cache = ChatAdminCache(ttl=0)
+
+        await cache.get_admin_ids(mock_bot.mock, -100)
+        await cache.get_admin_ids(mock_bot.mock, -100)
+
+        assert mock_bot.mock.get_chat_administrators.call_count == 2
+
+    async def test_concurrent_lookups_are_coalesced(self, mock_bot: MockBot):
+        """Test concurrent misses for one chat share a single API call."""
+        cache = ChatAdminCache(ttl=60)
+
+        async def slow_admins(_chat_id: int) -> list[MagicMock]:
+            await asyncio.sleep(0.01)
+            return make_admins(1)
+
+        mock_bot.mock.get_chat_administrators.side_effect = slow_admins
+
+        results = await asyncio.gather(*(cache.get_admin_ids(mock_bot.mock, -100) for _ in range(10)))
+
+        assert all(result == frozenset({1}) for result in results)
+        mock_bot.mock.get_chat_administrators.assert_called_once()
+
+    async def test_admin_status_change_invalidates(self, mock_bot: MockBot):
+        """Test a promotion update drops the cached entry."""
+        cache = ChatAdminCache(ttl=60)
+        chat = create_test_chat()
+        await cache.get_admin_ids(mock_bot.mock, chat.id)
+
+        user = create_normal_user(id=3)
+        update = TelegramObjectFactory.create_chat_member_updated(
+            chat=chat,
+            user=user,
+            old_chat_member=ChatMemberMember(user=user),
+            new_chat_member=make_administrator(user.id),
+        )
+        cache.handle_member_update(update)
+        await cache.get_admin_ids(mock_bot.mock, chat.id)
+
+        assert mock_bot.mock.get_chat_administrators.call_count == 2
+
+    async def test_regular_join_keeps_entry(self, mock_bot: MockBot):
+        """Test member updates unrelated to admin status keep the cache."""
+        cache = ChatAdminCache(ttl=60)
+        chat = create_test_chat()
+        await cache.get_admin_ids(mock_bot.mock, chat.id)
+
+        cache.handle_member_update(TelegramObjectFactory.create_chat_member_updated(chat=chat))
+        await cache.get_admin_ids(mock_bot.mock, chat.id)
+
+        mock_bot.mock.get_chat_administrators.assert_called_once()
+
+
+@pytest.mark.unit
+class TestManagedChatsMiddlewareAdminCache:
+    """Test ManagedChatsMiddleware uses the admin cache."""
+
+    async def test_group_messages_share_admin_lookup(self):
+        """Test consecutive group messages need a single getChatAdministrators call."""
+        mock_bot = MockBot()
+        mock_bot.mock.get_chat_administrators = AsyncMock(return_value=make_admins(SUPER_ADMIN_ID))
+        middleware = ManagedChatsMiddleware(ChatAdminCache(ttl=60))
+        handler = AsyncMock()
+        data = {"bot": mock_bot.mock, "db": AsyncMock()}
+        message = TelegramObjectFactory.create_message(chat=create_test_chat())
+
+        with patch("app.application.services.history.merge_chat", new=AsyncMock()):
+            for _ in range(3):
+                update = MagicMock(spec=Update)
+                update.message, update.chat_member, update.my_chat_member = message, None, None
+                await middleware(handler, update, data)
+
+        assert handler.call_count == 3
+        mock_bot.mock.get_chat_administrators.assert_called_once()
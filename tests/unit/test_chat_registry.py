@@ -0,0 +1,87 @@
+"""Tests for the managed-chat registry."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from app.application.services import moderation
+from app.application.services.chat_registry import ChatRegistry, ManagedChat
+from app.domain.entities import ChatEntity
+
+from tests.telegram_helpers import MockBot
+
+
+@pytest.mark.unit
+class TestChatRegistry:
+    """Test ChatRegistry."""
+
+    @pytest.fixture
+    def chat_repo(self) -> AsyncMock:
+        repo = AsyncMock()
+        repo.get_all.return_value = [ChatEntity(id=-100, title="Group", is_forum=False)]
+        return repo
+
+    async def test_load_populates_registry(self, chat_repo: AsyncMock):
+        """Test loading mirrors the chats stored in the database."""
+        registry = ChatRegistry()
+
+        await registry.load(chat_repo)
+
+        assert registry.is_loaded
+        assert -100 in registry
+        assert registry.get(-100) == ManagedChat(id=-100, title="Group", is_forum=False)
+
+    async def test_unchanged_chat_skips_write(self, chat_repo: AsyncMock):
+        """Test merging a known chat with the same metadata does not touch the database."""
+        registry = ChatRegistry()
+
+        await registry.merge(chat_repo, chat_id=-100, title="Group", is_forum=False)
+        await registry.merge(chat_repo, chat_id=-100, title=None, is_forum=None)
+
+        chat_repo.merge_chat.assert_not_called()
+        chat_repo.get_all.assert_called_once()
+
+    async def test_new_chat_is_written_once(self, chat_repo: AsyncMock):
+        """Test a new chat is written on first sight only."""
+        registry = ChatRegistry()
+
+        for _ in range(3):
+            await registry.merge(chat_repo, chat_id=-200, title="New", is_forum=True)
+
+        chat_repo.merge_chat.assert_called_once_with(id_tg_chat=-200, title="New", is_forum=True)
+        assert registry.chat_ids() == [-100, -200]
+
+    async def test_changed_title_is_written(self, chat_repo: AsyncMock):
+        """Test a renamed chat is written and the registry updated."""
+        registry = ChatRegistry()
+
+        await registry.merge(chat_repo, chat_id=-100, title="Renamed", is_forum=False)
+
+        chat_repo.merge_chat.assert_called_once_with(id_tg_chat=-100, title="Renamed", is_forum=False)
+        chat = registry.get(-100)
+        assert chat is not None
+        assert chat.title == "Renamed"
+
+
+@pytest.mark.unit
+class TestModerationUsesChatRegistry:
+    """Test the global ban fan-out reads chats from the registry."""
+
+    async def test_ban_targets_registry_chats(self):
+        """Test add_to_blacklist bans in every registered chat without querying chats."""
+        registry = ChatRegistry()
+        chat_repo = AsyncMock()
+        chat_repo.get_all.return_value = [ChatEntity(id=-100), ChatEntity(id=-200)]
+        await registry.load(chat_repo)
+        mock_bot = MockBot()
+
+        with (
+            patch.object(moderation, "chat_registry", registry),
+            patch.object(moderation, "UserRepository") as user_repo_cls,
+            patch.object(moderation, "ChatRepository") as chat_repo_cls,
+        ):
+            user_repo_cls.return_value.add_to_blacklist = AsyncMock()
+            await moderation.add_to_blacklist(AsyncMock(), mock_bot.mock, id_tg=42)
+
+        chat_repo_cls.return_value.get_chats.assert_not_called()
+        banned_chats = {call.args[0] for call in mock_bot.mock.ban_chat_member.call_args_list}
+        assert banned_chats == {-100, -200}
@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 from aiogram import types
+from app.application.services.admin_roles import AdminRoleCache
 from app.presentation.telegram.utils.filters import AdminFilter, ChatTypeFilter, SuperAdminFilter
 
 
@@ -64,7 +65,7 @@ class TestAdminFilter:
 
     @pytest.fixture
     def filter_instance(self):
-        return AdminFilter()
+        return AdminFilter(AdminRoleCache(super_admins=[]))
 
     @pytest.fixture
     def mock_message(self):
@@ -89,7 +90,7 @@ class TestAdminFilter:
             mock_admin2 = AsyncMock()
             mock_admin2.id = 987654321
 
-            mock_repo.get_db_admins.return_value = [mock_admin1, mock_admin2]
+            mock_repo.get_all_active.return_value = [mock_admin1, mock_admin2]
             mock_get_repo.return_value = mock_repo
 
             # Act
@@ -112,7 +113,7 @@ class TestAdminFilter:
             mock_admin2 = AsyncMock()
             mock_admin2.id = 987654321
 
-            mock_repo.get_db_admins.return_value = [mock_admin1, mock_admin2]
+            mock_repo.get_all_active.return_value = [mock_admin1, mock_admin2]
             mock_get_repo.return_value = mock_repo
 
             # Act
@@ -127,7 +128,7 @@ class TestAdminFilter:
 
         with patch("app.presentation.telegram.utils.filters.get_admin_repository") as mock_get_repo:
             mock_repo = AsyncMock()
-            mock_repo.get_db_admins.return_value = []
+            mock_repo.get_all_active.return_value = []
             mock_get_repo.return_value = mock_repo
 
             # Act
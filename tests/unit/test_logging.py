@@ -0,0 +1,61 @@
+"""Tests for queue-based log output."""
+
+import logging
+import queue
+import threading
+
+import pytest
+from app.core.logging import DroppingQueueHandler, enqueue_handlers
+from app.core.metrics import log_records_dropped
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self, level: int = logging.NOTSET) -> None:
+        super().__init__(level)
+        self.messages: list[str] = []
+        self.threads: set[str] = set()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(self.format(record))
+        self.threads.add(threading.current_thread().name)
+
+
+@pytest.mark.unit
+class TestQueuedLogging:
+    """Test log handlers run behind a bounded queue."""
+
+    def test_handlers_run_on_listener_thread(self):
+        """Test records reach the handlers off the calling thread, at their own levels."""
+        logger = logging.getLogger("tests.queued")
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        everything = RecordingHandler()
+        everything.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        errors = RecordingHandler(logging.ERROR)
+        logger.addHandler(everything)
+        logger.addHandler(errors)
+
+        listener = enqueue_handlers(logger, queue_size=100)
+        logger.info("user %s joined", 42)
+        logger.error("ban failed")
+        listener.stop()
+
+        assert [type(handler) for handler in logger.handlers] == [DroppingQueueHandler]
+        assert everything.messages == ["INFO user 42 joined", "ERROR ban failed"]
+        assert errors.messages == ["ban failed"]
+        assert threading.current_thread().name not in everything.threads
+
+    def test_full_queue_drops_and_counts(self):
+        """Test records over the queue's capacity are dropped rather than blocking the caller."""
+        log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=2)
+        logger = logging.getLogger("tests.dropping")
+        logger.propagate = False
+        logger.addHandler(DroppingQueueHandler(log_queue))
+        dropped = log_records_dropped.value()
+
+        for n in range(5):
+            logger.warning("record %d", n)
+
+        assert log_queue.qsize() == 2
+        assert log_records_dropped.value() == dropped + 3
+        assert log_queue.get_nowait().getMessage() == "record 0"
@@ -0,0 +1,146 @@
+"""Tests for monthly message partitions and the retention job."""
+
+import datetime
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.application.services.message_retention import apply_retention
+from app.infrastructure.db.partitions import MessagePartitions, add_months, create_partition_sql, partition_name
+from sqlalchemy.exc import ProgrammingError
+
+
+def postgres_partitions(
+    months: list[datetime.date],
+    in_default: list[datetime.date] | None = None,
+    failing: str | None = None,
+) -> tuple[MessagePartitions, list[str]]:
+    """MessagePartitions over a fake PostgreSQL session recording the SQL it runs.
+
+    Months in ``in_default`` have rows in the default partition; statements
+    containing ``failing`` raise.
+    """
+    executed: list[str] = []
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "postgresql"
+
+    async def execute(statement: Any, *_args: Any) -> MagicMock:
+        executed.append(str(statement))
+        if failing and failing in str(statement):
+            raise ProgrammingError(str(statement), {}, Exception("updated partition constraint is violated"))
+        result = MagicMock()
+        result.scalars.return_value = [partition_name(month) for month in months] + ["messages_default"]
+        return result
+
+    async def scalar(statement: Any) -> bool:
+        start = statement.compile().params["timestamp_1"]
+        return start.date() in (in_default or [])
+
+    session.execute = AsyncMock(side_effect=execute)
+    session.scalar = AsyncMock(side_effect=scalar)
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    return MessagePartitions(session), executed
+
+
+@pytest.mark.unit
+class TestPartitionNaming:
+    """Test month arithmetic and partition DDL."""
+
+    def test_add_months_crosses_years(self):
+        """Test month arithmetic wraps around the year."""
+        assert add_months(datetime.date(2026, 11, 1), 2) == datetime.date(2027, 1, 1)
+        assert add_months(datetime.date(2026, 1, 1), -1) == datetime.date(2025, 12, 1)
+
+    def test_partition_covers_one_month(self):
+        """Test a partition is bounded by the first days of its month and the next."""
+        sql = create_partition_sql(datetime.date(2026, 12, 17))
+
+        assert "messages_y2026m12 PARTITION OF messages" in sql
+        assert "FROM ('2026-12-01') TO ('2027-01-01')" in sql
+
+
+@pytest.mark.unit
+class TestRetention:
+    """Test the retention job on a partitioned table."""
+
+    async def test_creates_upcoming_partitions(self):
+        """Test the current month and the configured months ahead exist after a run."""
+        partitions, executed = postgres_partitions([])
+
+        await apply_retention(partitions, datetime.datetime(2026, 10, 17), retention_days=0, months_ahead=2)
+
+        created = [sql for sql in executed if sql.startswith("CREATE TABLE")]
+        assert [sql.split()[5] for sql in created] == ["messages_y2026m10", "messages_y2026m11", "messages_y2026m12"]
+
+    async def test_existing_partitions_are_not_recreated(self):
+        """Test only missing months are created."""
+        partitions, executed = postgres_partitions([datetime.date(2026, 10, 1)])
+
+        await apply_retention(partitions, datetime.datetime(2026, 10, 17), retention_days=0, months_ahead=1)
+
+        created = [sql for sql in executed if sql.startswith("CREATE TABLE")]
+        assert [sql.split()[5] for sql in created] == ["messages_y2026m11"]
+
+    async def test_rows_in_default_partition_are_moved(self):
+        """Test a month whose rows landed in the default partition gets them moved into its new partition."""
+        partitions, executed = postgres_partitions(
+            [datetime.date(2026, 10, 1)], in_default=[datetime.date(2026, 11, 1)]
+        )
+
+        await apply_retention(partitions, datetime.datetime(2026, 10, 17), retention_days=0, months_ahead=1)
+
+        steps = [sql.split("(")[0].split(" WHERE")[0].strip() for sql in executed[1:]]
+        assert steps == [
+            "ALTER TABLE messages DETACH PARTITION messages_default",
+            "CREATE TABLE IF NOT EXISTS messages_y2026m11 PARTITION OF messages FOR VALUES FROM",
+            "INSERT INTO messages_y2026m11",
+            "DELETE FROM messages_default",
+            "ALTER TABLE messages ATTACH PARTITION messages_default DEFAULT",
+        ]
+
+    async def test_failed_partition_does_not_stop_expiry(self):
+        """Test a month that cannot be created is skipped and old partitions still expire."""
+        months = [datetime.date(2026, 1, 1), datetime.date(2026, 10, 1)]
+        partitions, executed = postgres_partitions(months, failing="messages_y2026m11")
+
+        expired = await apply_retention(partitions, datetime.datetime(2026, 10, 17), retention_days=30, months_ahead=2)
+
+        assert expired == ["messages_y2026m01"]
+        assert "CREATE TABLE IF NOT EXISTS messages_y2026m12" in " ".join(executed)
+        partitions.db.rollback.assert_awaited_once()  # type: ignore[attr-defined]
+
+    async def test_drops_only_fully_expired_months(self):
+        """Test partitions ending before the cutoff are detached and dropped, newer ones kept."""
+        months = [datetime.date(2026, month, 1) for month in range(6, 11)]
+        partitions, executed = postgres_partitions(months)
+
+        # Cutoff 2026-08-18: June and July are fully expired, August is not
+        expired = await apply_retention(partitions, datetime.datetime(2026, 10, 17), retention_days=60, months_ahead=0)
+
+        assert expired == ["messages_y2026m06", "messages_y2026m07"]
+        assert "ALTER TABLE messages DETACH PARTITION messages_y2026m06" in executed
+        assert "DROP TABLE messages_y2026m07" in executed
+        assert not any("messages_y2026m08" in sql for sql in executed if not sql.startswith("CREATE"))
+
+    async def test_archive_keeps_detached_partition(self):
+        """Test archive mode renames expired partitions instead of dropping them."""
+        partitions, executed = postgres_partitions([datetime.date(2026, 1, 1), datetime.date(2026, 10, 1)])
+
+        await apply_retention(
+            partitions, datetime.datetime(2026, 10, 17), retention_days=30, months_ahead=0, archive=True
+        )
+
+        assert "ALTER TABLE messages_y2026m01 RENAME TO messages_archive_y2026m01" in executed
+        assert not any(sql.startswith("DROP TABLE") for sql in executed)
+
+    async def test_old_rows_in_default_partition_are_deleted(self):
+        """Test expired and timestamp-less rows are deleted from the default partition on every run."""
+        partitions, executed = postgres_partitions([datetime.date(2026, 10, 1)])
+
+        await apply_retention(partitions, datetime.datetime(2026, 10, 17), retention_days=30, months_ahead=0)
+
+        assert executed[-1] == (
+            "DELETE FROM messages_default WHERE messages_default.timestamp < :timestamp_1 "
+            "OR messages_default.timestamp IS NULL"
+        )
@@ -0,0 +1,182 @@
+"""Tests for update pipeline metrics."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from aiogram import BaseMiddleware, Bot, Dispatcher, types
+from aiogram.methods import GetMe
+from aiohttp.test_utils import TestClient, TestServer
+from app.core.config import settings
+from app.core.metrics import (
+    MetricsRegistry,
+    db_pool_wait_seconds,
+    db_queries,
+    handler_seconds,
+    middleware_seconds,
+    telegram_api_errors,
+    telegram_api_seconds,
+)
+from app.infrastructure.db.session import TimedQueuePool, instrument_engine, statement_operation
+from app.infrastructure.telegram.request_metrics import RequestMetricsMiddleware
+from app.presentation.telegram.metrics_server import build_metrics_app
+from app.presentation.telegram.middlewares import TimedMiddleware, instrument_handlers
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.sql import text
+
+
+def make_update(text: str = "hello") -> types.Update:
+    return types.Update.model_validate(
+        {
+            "update_id": 1,
+            "message": {
+                "message_id": 1,
+                "date": 0,
+                "chat": {"id": -1, "type": "supergroup"},
+                "from": {"id": 1, "is_bot": False, "first_name": "Test"},
+                "text": text,
+            },
+        }
+    )
+
+
+class SleepyMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[types.TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: types.TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        await asyncio.sleep(0.01)
+        return await handler(event, data)
+
+
+@pytest.mark.unit
+class TestMetricsRegistry:
+    """Test the Prometheus text rendering."""
+
+    def test_histogram_renders_cumulative_buckets(self):
+        """Test observations land in cumulative buckets with sum and count."""
+        registry = MetricsRegistry()
+        latency = registry.histogram("test_seconds", "Test latency", ["step"], buckets=(0.1, 1.0))
+
+        latency.observe(0.05, step="a")
+        latency.observe(0.1, step="a")
+        latency.observe(3, step="a")
+
+        assert registry.render().splitlines() == [
+            "# HELP test_seconds Test latency",
+            "# TYPE test_seconds histogram",
+            'test_seconds_bucket{step="a",le="0.1"} 2',
+            'test_seconds_bucket{step="a",le="1"} 2',
+            'test_seconds_bucket{step="a",le="+Inf"} 3',
+            'test_seconds_sum{step="a"} 3.15',
+            'test_seconds_count{step="a"} 3',
+        ]
+
+    def test_counter_escapes_label_values(self):
+        """Test label values are escaped for the exposition format."""
+        registry = MetricsRegistry()
+        calls = registry.counter("test_total", "Test calls", ["name"])
+
+        calls.inc(name='say "hi"')
+        calls.inc(2, name='say "hi"')
+
+        assert 'test_total{name="say \\"hi\\""} 3' in registry.render()
+
+    def test_labels_must_match(self):
+        """Test observing with unknown labels fails loudly."""
+        registry = MetricsRegistry()
+        latency = registry.histogram("test_seconds", "Test latency", ["step"])
+
+        with pytest.raises(ValueError, match="expects labels"):
+            latency.observe(1, other="x")
+        with pytest.raises(ValueError, match="already registered"):
+            registry.counter("test_seconds", "Duplicate")
+
+
+@pytest.mark.unit
+class TestPipelineMetrics:
+    """Test middleware, handler and Bot API timings."""
+
+    async def test_middleware_time_excludes_handler(self):
+        """Test a timed middleware reports its own time, not the handler's."""
+        dp = Dispatcher()
+        dp.update.middleware(TimedMiddleware(SleepyMiddleware(), name="SleepyOuter"))
+        instrument_handlers(dp)
+
+        @dp.message()
+        async def slow_test_handler(message: types.Message) -> None:
+            await asyncio.sleep(0.05)
+
+        await dp.feed_update(Bot(token=settings.telegram.token), make_update())
+
+        assert middleware_seconds.count(middleware="SleepyOuter") == 1
+        assert 0.01 <= middleware_seconds.sum(middleware="SleepyOuter") < 0.05
+        name = slow_test_handler.__qualname__
+        assert handler_seconds.count(event="Message", handler=name) == 1
+        assert handler_seconds.sum(event="Message", handler=name) >= 0.05
+
+    async def test_api_latency_and_errors_per_method(self):
+        """Test Bot API calls are timed per method and failures counted."""
+        middleware = RequestMetricsMiddleware()
+        before = telegram_api_seconds.count(method="getMe")
+        errors = telegram_api_errors.value(method="getMe")
+
+        await middleware(AsyncMock(), AsyncMock(), GetMe())
+        with pytest.raises(RuntimeError):
+            await middleware(AsyncMock(side_effect=RuntimeError("down")), AsyncMock(), GetMe())
+
+        assert telegram_api_seconds.count(method="getMe") == before + 2
+        assert telegram_api_errors.value(method="getMe") == errors + 1
+
+
+@pytest.mark.unit
+class TestDatabaseMetrics:
+    """Test statement and pool checkout metrics."""
+
+    def test_statement_operation(self):
+        """Test statements are labelled by their leading keyword."""
+        assert statement_operation("  select 1") == "SELECT"
+        assert statement_operation("INSERT INTO messages ...") == "INSERT"
+        assert statement_operation("PRAGMA foreign_keys=ON") == "OTHER"
+
+    async def test_queries_and_checkouts_are_recorded(self, tmp_path: Path):
+        """Test an instrumented engine counts statements and pool waits."""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'metrics.db'}", poolclass=TimedQueuePool)
+        instrument_engine(engine)
+        selects = db_queries.value(operation="SELECT")
+        checkouts = db_pool_wait_seconds.count()
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await conn.execute(text("SELECT 2"))
+                with pytest.raises(Exception, match="no such table"):
+                    await conn.execute(text("SELECT * FROM missing"))
+                await conn.execute(text("SELECT 3"))
+        finally:
+            await engine.dispose()
+
+        assert db_queries.value(operation="SELECT") == selects + 3
+        assert db_pool_wait_seconds.count() == checkouts + 1
+
+
+@pytest.mark.unit
+class TestMetricsEndpoint:
+    """Test the /metrics HTTP endpoint."""
+
+    async def test_metrics_endpoint_serves_registry(self):
+        """Test GET /metrics returns the rendered registry as text."""
+        registry = MetricsRegistry()
+        registry.counter("test_total", "Test calls").inc()
+
+        async with TestClient(TestServer(build_metrics_app(registry))) as client:
+            response = await client.get("/metrics")
+            body = await response.text()
+
+        assert response.status == 200
+        assert response.content_type == "text/plain"
+        assert "test_total 1" in body
@@ -230,7 +230,7 @@ class TestModerationService:
             await moderation_service.ban_user_globally(admin_id=admin_id, user_id=user_id)
 
         # Assert
-        assert mock_bot.ban_chat_member.call_count == 2  # Should stop at failure
+        assert mock_bot.ban_chat_member.call_count == 3  # Remaining chats are still attempted
         mock_logger.log_telegram_error.assert_called_once()  # Error should be logged
 
     @pytest.mark.asyncio
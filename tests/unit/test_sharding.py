@@ -0,0 +1,212 @@
+"""Tests for sharded update processing."""
+
+import asyncio
+import multiprocessing
+import queue
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from aiogram import Bot, Dispatcher, types
+from aiohttp.test_utils import TestClient, TestServer
+from app.application.services.admin_roles import AdminRoleCache
+from app.application.services.blacklist_index import BlacklistIndex
+from app.application.services.cache_invalidation import ADMIN_ROLES, BLACKLIST, CHATS, InvalidationBus
+from app.application.services.chat_registry import ChatRegistry
+from app.core.config import settings
+from app.presentation.telegram.sharding import Shard, ShardWorker, UpdateRouter, shard_index, update_key
+from app.presentation.telegram.webhook import build_ingress_app
+
+if TYPE_CHECKING:
+    from multiprocessing.queues import Queue
+
+WEBHOOK_KEY = "test-webhook-key"
+
+
+def make_update(update_id: int, chat_id: int, text: str = "hello") -> dict[str, Any]:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": chat_id, "type": "supergroup"},
+            "from": {"id": 1, "is_bot": False, "first_name": "Test"},
+            "text": text,
+        },
+    }
+
+
+def drain(source: "Queue[Any]") -> list[Any]:
+    items = []
+    while True:
+        try:
+            items.append(source.get(timeout=0.5))
+        except queue.Empty:
+            return items
+
+
+@pytest.mark.unit
+class TestUpdateRouting:
+    """Test updates are routed to workers by chat."""
+
+    def test_update_key_prefers_chat_over_user(self):
+        """Test chat updates are keyed by chat and inline queries by user."""
+        message = types.Update.model_validate(make_update(1, -1001))
+        inline = types.Update.model_validate(
+            {
+                "update_id": 2,
+                "inline_query": {
+                    "id": "q",
+                    "from": {"id": 42, "is_bot": False, "first_name": "Test"},
+                    "query": "",
+                    "offset": "",
+                },
+            }
+        )
+
+        assert update_key(message) == -1001
+        assert update_key(inline) == 42
+
+    def test_shard_index_is_stable_for_negative_ids(self):
+        """Test group chat IDs map to a valid worker."""
+        assert all(0 <= shard_index(chat_id, 4) < 4 for chat_id in range(-1010, -1000))
+        assert Shard(index=shard_index(-1001, 3), count=3).owns_chat(-1001)
+
+    def test_router_keeps_each_chat_on_one_queue(self):
+        """Test every update of a chat lands on the same multiprocessing queue."""
+        queues = [multiprocessing.Queue() for _ in range(3)]
+        router = UpdateRouter(queues)
+
+        for update_id in range(30):
+            router.route(types.Update.model_validate(make_update(update_id, -1000 - update_id % 5)))
+        router.close()
+
+        seen: dict[int, int] = {}
+        for index, worker_queue in enumerate(queues):
+            items = drain(worker_queue)
+            assert items[-1] is None
+            for data in items[:-1]:
+                update = types.Update.model_validate(data)
+                assert seen.setdefault(update.message.chat.id, index) == index
+                assert update.message.from_user.first_name == "Test"
+        assert len(seen) == 5
+
+
+@pytest.mark.unit
+class TestShardWorker:
+    """Test the worker feeds updates to the dispatcher in order per chat."""
+
+    async def test_updates_of_one_chat_are_handled_in_order(self):
+        """Test a slow update holds back its chat but not other chats."""
+        handled: list[tuple[int, str]] = []
+        dp = Dispatcher()
+
+        @dp.message()
+        async def record(message: types.Message) -> None:
+            if message.text == "slow":
+                await asyncio.sleep(0.05)
+            assert message.text is not None
+            handled.append((message.chat.id, message.text))
+
+        updates = multiprocessing.Queue()
+        for data in (
+            make_update(1, -1, "slow"),
+            make_update(2, -2, "other chat"),
+            make_update(3, -1, "second"),
+        ):
+            updates.put(data)
+        updates.put(None)
+
+        await asyncio.wait_for(ShardWorker(dp, Bot(token=settings.telegram.token)).run(updates), timeout=5)
+
+        assert handled == [(-2, "other chat"), (-1, "slow"), (-1, "second")]
+
+    async def test_failed_update_does_not_block_chat(self):
+        """Test an exception in one update still lets the chat's next update run."""
+        handled: list[str] = []
+        dp = Dispatcher()
+
+        @dp.message()
+        async def record(message: types.Message) -> None:
+            if message.text == "boom":
+                raise RuntimeError("handler failed")
+            assert message.text is not None
+            handled.append(message.text)
+
+        worker = ShardWorker(dp, Bot(token=settings.telegram.token))
+        worker.submit(types.Update.model_validate(make_update(1, -1, "boom")))
+        worker.submit(types.Update.model_validate(make_update(2, -1, "after")))
+        await worker.drain()
+
+        assert handled == ["after"]
+        assert worker.in_flight == 0
+
+
+@pytest.mark.unit
+class TestIngressApp:
+    """Test the sharded webhook ingress."""
+
+    @pytest.fixture
+    def queues(self) -> "list[Queue[Any]]":
+        return [multiprocessing.Queue() for _ in range(2)]
+
+    async def test_routes_authorized_updates(self, queues: "list[Queue[Any]]"):
+        """Test the ingress queues updates with the right secret and rejects the rest."""
+        app = build_ingress_app(UpdateRouter(queues), "/webhook", WEBHOOK_KEY)
+        async with TestClient(TestServer(app)) as client:
+            headers = {"X-Telegram-Bot-Api-Secret-Token": WEBHOOK_KEY}
+            accepted = await client.post("/webhook", json=make_update(1, -3), headers=headers)
+            rejected = await client.post("/webhook", json=make_update(2, -3))
+
+        assert accepted.status == 200
+        assert rejected.status == 401
+        assert drain(queues[shard_index(-3, 2)]) == [make_update(1, -3)]
+
+
+@pytest.mark.unit
+class TestInvalidationBus:
+    """Test cache changes reach sibling processes through their inbox queues."""
+
+    async def test_blacklist_and_chat_changes_reach_peer(self):
+        """Test a peer applies published blacklist and chat changes from its inbox."""
+        inbox = multiprocessing.Queue()
+        sender, receiver = InvalidationBus(), InvalidationBus()
+        sender.connect([inbox])
+        index, registry = BlacklistIndex(), ChatRegistry()
+        registry._loaded = True
+        receiver.subscribe(BLACKLIST, index.apply_invalidation)
+        receiver.subscribe(CHATS, registry.apply_invalidation)
+
+        sender.publish(BLACKLIST, 7, True)
+        sender.publish(BLACKLIST, 8, True)
+        sender.publish(BLACKLIST, 8, False)
+        sender.publish(CHATS, -100, ("Chat", True))
+        inbox.put(None)
+        await asyncio.wait_for(receiver.listen(inbox), timeout=5)
+
+        assert 7 in index
+        assert 8 not in index
+        assert registry.get(-100).title == "Chat"
+        assert registry.get(-100).is_forum is True
+
+    async def test_admin_change_reloads_peer_roles(self):
+        """Test an admin change elsewhere makes the peer reload admins on the next check."""
+        inbox = multiprocessing.Queue()
+        sender, receiver = InvalidationBus(), InvalidationBus()
+        sender.connect([inbox])
+        roles = AdminRoleCache(super_admins=[1])
+        roles._loaded = True
+        receiver.subscribe(ADMIN_ROLES, lambda _: roles.invalidate())
+
+        sender.publish(ADMIN_ROLES)
+        inbox.put(None)
+        await asyncio.wait_for(receiver.listen(inbox), timeout=5)
+
+        assert not roles.is_loaded
+
+    def test_unconnected_bus_publishes_nowhere(self):
+        """Test a single-process bot does not queue invalidations."""
+        bus = InvalidationBus()
+
+        bus.publish(BLACKLIST, 1, True)
+
+        assert not bus.is_connected
@@ -0,0 +1,137 @@
+"""Tests for per-update tracing."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from aiogram import BaseMiddleware, Bot, Dispatcher, types
+from aiogram.methods import GetMe
+from app.core import tracing
+from app.core.config import settings
+from app.core.tracing import is_tracing, record_span, span, start_trace
+from app.infrastructure.db.session import instrument_engine
+from app.infrastructure.telegram.request_metrics import RequestMetricsMiddleware
+from app.presentation.telegram.middlewares import TimedMiddleware, TracingMiddleware, instrument_handlers
+from app.presentation.telegram.middlewares import tracing as tracing_middleware
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.sql import text
+
+
+def make_update() -> types.Update:
+    return types.Update.model_validate(
+        {
+            "update_id": 77,
+            "message": {
+                "message_id": 1,
+                "date": 0,
+                "chat": {"id": -500, "type": "supergroup"},
+                "from": {"id": 42, "is_bot": False, "first_name": "Test"},
+                "text": "hello",
+            },
+        }
+    )
+
+
+class PassMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[types.TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: types.TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        return await handler(event, data)
+
+
+@pytest.mark.unit
+class TestSpans:
+    """Test span trees built from the context variable."""
+
+    def test_spans_nest_under_current_span(self):
+        """Test child spans and recorded spans attach to the span they run in."""
+        with start_trace("update") as trace:
+            with span("outer"):
+                with span("inner", detail="x"):
+                    pass
+                record_span("sql:SELECT", 1.0, 1.5, "SELECT 1")
+
+        outer = trace.root.children[0]
+        assert [child.name for child in outer.children] == ["inner", "sql:SELECT"]
+        lines = trace.root.render()
+        assert lines[0].startswith("update ")
+        assert lines[1].startswith("  outer ")
+        assert lines[2].startswith("    inner ")
+        assert lines[2].endswith(" x")
+        assert lines[3] == "    sql:SELECT 500.0ms SELECT 1"
+
+    def test_spans_outside_trace_are_ignored(self):
+        """Test code outside an update records nothing."""
+        with span("orphan") as orphan:
+            record_span("sql:SELECT", 0, 1)
+
+        assert orphan is None
+        assert not is_tracing()
+        with start_trace("update"):
+            assert is_tracing()
+
+    def test_trace_keeps_a_bounded_number_of_spans(self):
+        """Test spans past the limit are counted as dropped."""
+        with patch.object(tracing, "MAX_SPANS", 3), start_trace("update") as trace:
+            for _ in range(5):
+                with span("step"):
+                    pass
+
+        assert len(trace.root.children) == 2
+        assert trace.dropped == 3
+
+
+@pytest.mark.unit
+class TestTracingMiddleware:
+    """Test slow updates are logged with their span tree."""
+
+    async def feed(self, threshold: float, tmp_path: Path) -> AsyncMock:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'trace.db'}")
+        instrument_engine(engine)
+        dp = Dispatcher()
+        dp.update.middleware(TracingMiddleware(threshold))
+        dp.update.middleware(TimedMiddleware(PassMiddleware()))
+        instrument_handlers(dp)
+
+        @dp.message()
+        async def traced_handler(message: types.Message) -> None:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            await RequestMetricsMiddleware()(AsyncMock(), AsyncMock(), GetMe())
+            await asyncio.sleep(0.01)
+
+        with patch.object(tracing_middleware, "logger") as logger:
+            try:
+                await dp.feed_update(Bot(token=settings.telegram.token), make_update())
+            finally:
+                await engine.dispose()
+        return logger
+
+    async def test_slow_update_logs_span_tree(self, tmp_path: Path):
+        """Test an update over the threshold is logged with every span and its IDs."""
+        logger = await self.feed(0.005, tmp_path)
+
+        logger.warning.assert_called_once()
+        fields = logger.warning.call_args.kwargs
+        assert (fields["update_id"], fields["chat_id"], fields["user_id"]) == (77, -500, 42)
+        names = [line.split()[0] for line in fields["spans"]]
+        assert names[:3] == [
+            "update:message",
+            "middleware:PassMiddleware",
+            "handler:TestTracingMiddleware.feed.<locals>.traced_handler",
+        ]
+        assert "sql:SELECT" in names
+        assert "api:getMe" in names
+        assert fields["duration_ms"] >= 10
+
+    async def test_fast_update_is_not_logged(self, tmp_path: Path):
+        """Test updates under the threshold leave no log line."""
+        logger = await self.feed(10, tmp_path)
+
+        logger.warning.assert_not_called()
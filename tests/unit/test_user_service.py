@@ -3,6 +3,7 @@
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from app.application.services.blacklist_index import BlacklistIndex
 from app.application.services.user_service import UserService
 from app.domain.entities import UserEntity
 from app.domain.exceptions import UserNotFoundException
@@ -298,6 +299,25 @@ class TestUserService:
         assert result == []
         mock_user_repository.get_blocked_users.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_count_blocked_users_uses_loaded_index(self, mock_user_repository: AsyncMock):
+        """Test the blacklist count comes from the in-memory index once it is loaded."""
+        # Arrange
+        blacklist = BlacklistIndex()
+        user_service = UserService(mock_user_repository, blacklist)
+        mock_user_repository.count_blocked_users.return_value = 2
+        mock_user_repository.get_blocked_user_ids.return_value = {1, 2, 3}
+
+        # Act
+        before_load = await user_service.count_blocked_users()
+        await blacklist.ensure_loaded(mock_user_repository)
+        after_load = await user_service.count_blocked_users()
+
+        # Assert
+        assert before_load == 2
+        assert after_load == 3
+        mock_user_repository.count_blocked_users.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_is_user_blocked_true(self, user_service: UserService, mock_user_repository: AsyncMock):
         """Test checking if user is blocked (user exists and is blocked)."""
@@ -0,0 +1,106 @@
+"""Tests for the webhook transport."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from aiogram import Bot, Dispatcher, types
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+from app.core.config import settings
+from app.presentation.telegram.webhook import build_webhook_app
+
+WEBHOOK_KEY = "test-webhook-key"
+AUTH_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+WebhookClient = TestClient[web.Request, web.Application]
+
+
+def make_update(update_id: int = 1) -> dict[str, Any]:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": 1,
+            "date": 0,
+            "chat": {"id": 1, "type": "private"},
+            "from": {"id": 1, "is_bot": False, "first_name": "Test"},
+            "text": "hello",
+        },
+    }
+
+
+@pytest.mark.unit
+class TestWebhookApp:
+    """Test the aiohttp webhook application."""
+
+    @pytest.fixture
+    def release(self) -> asyncio.Event:
+        return asyncio.Event()
+
+    @pytest.fixture
+    def handled(self) -> list[int]:
+        return []
+
+    @pytest.fixture
+    def dp(self, release: asyncio.Event, handled: list[int]) -> Dispatcher:
+        dp = Dispatcher()
+
+        @dp.message()
+        async def slow_handler(message: types.Message) -> None:
+            await release.wait()
+            handled.append(message.message_id)
+
+        return dp
+
+    @pytest_asyncio.fixture
+    async def client(self, dp: Dispatcher) -> AsyncGenerator[WebhookClient, None]:
+        bot = Bot(token=settings.telegram.token)
+        app = build_webhook_app(dp, bot, path="/webhook", secret_token=WEBHOOK_KEY)
+        async with TestClient(TestServer(app)) as client:
+            yield client
+
+    async def test_wrong_secret_is_rejected(self, client: WebhookClient, release: asyncio.Event, handled: list[int]):
+        """Test requests without the secret token never reach the dispatcher."""
+        release.set()
+
+        response = await client.post("/webhook", json=make_update(), headers={AUTH_HEADER: "wrong"})
+        missing = await client.post("/webhook", json=make_update())
+
+        assert response.status == 401
+        assert missing.status == 401
+        await asyncio.sleep(0)
+        assert handled == []
+
+    async def test_responds_before_handler_finishes(
+        self, client: WebhookClient, release: asyncio.Event, handled: list[int]
+    ):
+        """Test the HTTP response returns while the handler still runs in the background."""
+        response = await asyncio.wait_for(
+            client.post("/webhook", json=make_update(), headers={AUTH_HEADER: WEBHOOK_KEY}), timeout=1
+        )
+
+        assert response.status == 200
+        assert handled == []
+
+        release.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert handled == [1]
+
+    async def test_shutdown_waits_for_in_flight_updates(
+        self, dp: Dispatcher, release: asyncio.Event, handled: list[int]
+    ):
+        """Test closing the server lets background handlers finish."""
+        bot = Bot(token=settings.telegram.token)
+        app = build_webhook_app(dp, bot, path="/webhook", secret_token=WEBHOOK_KEY)
+        client = TestClient(TestServer(app))
+        await client.start_server()
+        response = await client.post("/webhook", json=make_update(), headers={AUTH_HEADER: WEBHOOK_KEY})
+        assert response.status == 200
+
+        asyncio.get_running_loop().call_later(0.05, release.set)
+        await client.close()
+
+        assert handled == [1]
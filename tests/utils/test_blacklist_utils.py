@@ -1,12 +1,18 @@
 """Tests for blacklist utilities."""
 
+import datetime
+
 import pytest
 from app.domain.entities import UserEntity
+from app.presentation.telegram.utils import BlacklistPagination
 from app.presentation.telegram.utils.blacklist import (
     build_blacklist_keyboard,
     build_blacklist_text,
     build_user_details_keyboard,
     build_user_details_text,
+    clip_search_query,
+    decode_cursor,
+    encode_cursor,
 )
 
 
@@ -135,3 +141,46 @@ class TestBlacklistUtils:
         # Should be truncated with ellipsis
         assert len(button_text) <= 33  # "🚫 " + 27 chars + "..."
         assert button_text.endswith("...")
+
+    def test_cursor_round_trip(self):
+        """Test a user's keyset survives packing into callback data."""
+        created_at = datetime.datetime(2026, 10, 17, 12, 30, 45, 123456)
+        user = UserEntity(id=4242, is_blocked=True, created_at=created_at)
+
+        assert decode_cursor(encode_cursor(user)) == (created_at, 4242)
+        assert decode_cursor("") is None
+        assert decode_cursor("garbage_1") is None
+
+    def test_pagination_buttons_carry_keyset(self):
+        """Test Prev/Next point at the first/last user of the page."""
+        users = [
+            UserEntity(id=n, is_blocked=True, created_at=datetime.datetime(2026, 1, 1, 0, n)) for n in range(10, 20)
+        ]
+
+        keyboard = build_blacklist_keyboard(users=users, current_page=1, total_pages=3, page_size=10)
+
+        prev_button, _, next_button = keyboard.as_markup().inline_keyboard[-1]
+        prev_page = BlacklistPagination.unpack(prev_button.callback_data)
+        next_page = BlacklistPagination.unpack(next_button.callback_data)
+        assert (prev_page.page, prev_page.backward, decode_cursor(prev_page.cursor)) == (
+            0,
+            1,
+            (users[0].created_at, 10),
+        )
+        assert (next_page.page, next_page.backward, decode_cursor(next_page.cursor)) == (
+            2,
+            0,
+            (users[-1].created_at, 19),
+        )
+        assert len(next_button.callback_data) <= 64
+
+    def test_clip_search_query_fits_callback_data(self):
+        """Test search queries are trimmed to fit pagination callback data."""
+        assert clip_search_query("spam") == "spam"
+        assert clip_search_query("a:b") == "a b"
+        assert len(clip_search_query("Иван Иванович Петров").encode()) <= 16
+
+        users = [UserEntity(id=10**12, is_blocked=True, created_at=datetime.datetime(2026, 1, 1))]
+        query = clip_search_query("очень длинный запрос")
+        keyboard = build_blacklist_keyboard(users=users, current_page=998, total_pages=1000, query=query)
+        assert all(len(button.callback_data) <= 64 for button in keyboard.as_markup().inline_keyboard[-1])